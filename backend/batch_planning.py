@@ -0,0 +1,243 @@
+"""
+Generate degree plans for many students at once.
+
+Shared inputs (students, minors, completed courses and major/minor
+requirements) are loaded with a fixed number of set-based queries, the pure
+scheduling work is fanned out over a process pool, and the results are
+written back with bulk statements.
+
+Usage: python batch_planning.py [--all | --students 1,2,3] [--start-semester Fall]
+                                [--start-year 2026] [--per-semester 4] [--workers N]
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import defaultdict
+
+from sqlalchemy import delete, insert, select
+
+from catalog_snapshot import get_catalog_snapshot
+from database import SessionLocal
+from models import (
+    DegreePlan, PlannedSemester, StudentProfile, student_minors,
+    student_completed_courses, major_required_courses, minor_required_courses,
+    planned_semester_courses
+)
+from planner import plan_many, semester_names
+from prereq_graph import get_prereq_graph
+
+# Keep IN lists well below SQLite's bound-parameter limit
+IN_CHUNK_SIZE = 500
+
+# Students planned and written per transaction
+WRITE_BATCH_SIZE = 1000
+
+# Below this many plans the process pool costs more than it saves
+PROCESS_POOL_MIN_PLANS = 64
+
+DEFAULT_WORKERS = int(os.getenv("PLANNER_WORKERS", str(os.cpu_count() or 1)))
+
+
+def _chunks(items, size=IN_CHUNK_SIZE):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _select_in(db, stmt, column, values):
+    """Run `stmt` filtered by `column IN values`, chunked, and return all rows"""
+    rows = []
+    for chunk in _chunks(values):
+        rows.extend(db.execute(stmt.where(column.in_(chunk))).all())
+    return rows
+
+
+def load_planning_inputs(db, student_ids, catalog=None):
+    """
+    Load everything needed to plan the given students.
+
+    Returns (inputs, missing_student_ids) where inputs is a list of
+    (student_id, remaining_ids, completed_ids, levels) tuples ready for
+    planner.plan_many. `catalog` defaults to the shared catalog snapshot.
+    """
+    students = dict(_select_in(
+        db, select(StudentProfile.id, StudentProfile.major_id), StudentProfile.id, student_ids
+    ))
+    missing = [student_id for student_id in dict.fromkeys(student_ids) if student_id not in students]
+
+    minors = defaultdict(list)
+    for student_id, minor_id in _select_in(
+        db, select(student_minors.c.student_id, student_minors.c.minor_id),
+        student_minors.c.student_id, students
+    ):
+        minors[student_id].append(minor_id)
+
+    completed = defaultdict(set)
+    for student_id, course_id in _select_in(
+        db, select(student_completed_courses.c.student_id, student_completed_courses.c.course_id),
+        student_completed_courses.c.student_id, students
+    ):
+        completed[student_id].add(course_id)
+
+    # Requirements are loaded once per distinct major/minor, not once per student;
+    # course levels come from the in-memory catalog and unknown courses are skipped
+    catalog = catalog or get_catalog_snapshot(db)
+
+    major_courses = defaultdict(set)
+    for major_id, course_id in _select_in(
+        db, select(major_required_courses.c.major_id, major_required_courses.c.course_id),
+        major_required_courses.c.major_id, set(students.values())
+    ):
+        if course_id in catalog:
+            major_courses[major_id].add(course_id)
+
+    minor_courses = defaultdict(set)
+    for minor_id, course_id in _select_in(
+        db, select(minor_required_courses.c.minor_id, minor_required_courses.c.course_id),
+        minor_required_courses.c.minor_id, {m for ids in minors.values() for m in ids}
+    ):
+        if course_id in catalog:
+            minor_courses[minor_id].add(course_id)
+
+    inputs = []
+    for student_id, major_id in students.items():
+        required = set(major_courses[major_id])
+        for minor_id in minors[student_id]:
+            required |= minor_courses[minor_id]
+
+        remaining = sorted(required - completed[student_id])
+        inputs.append((
+            student_id,
+            remaining,
+            completed[student_id],
+            {course_id: catalog.level_of(course_id) for course_id in remaining}
+        ))
+
+    return inputs, missing
+
+
+def write_degree_plans(db, plans, start_semester, start_year):
+    """
+    Replace the degree plans of the given students with a fixed number of statements.
+
+    `plans` maps student_id to a list of semesters (lists of course IDs).
+    Existing plans are removed with set-based deletes; new plans, semesters
+    and course links are each inserted with a single executemany.
+    """
+    student_ids = list(plans)
+    if not student_ids:
+        return {}
+
+    for chunk in _chunks(student_ids):
+        plan_ids = select(DegreePlan.id).where(DegreePlan.student_id.in_(chunk))
+        semester_ids = select(PlannedSemester.id).where(PlannedSemester.degree_plan_id.in_(plan_ids))
+        db.execute(delete(planned_semester_courses).where(
+            planned_semester_courses.c.planned_semester_id.in_(semester_ids)
+        ))
+        db.execute(delete(PlannedSemester.__table__).where(PlannedSemester.degree_plan_id.in_(plan_ids)))
+        db.execute(delete(DegreePlan.__table__).where(DegreePlan.student_id.in_(chunk)))
+
+    # RETURNING rows are matched back by their natural keys rather than by position,
+    # which keeps SQLite on the multi-row VALUES path
+    plan_table = DegreePlan.__table__
+    plan_id_by_student = {
+        row.student_id: row.id
+        for row in db.execute(
+            insert(plan_table).returning(plan_table.c.id, plan_table.c.student_id),
+            [{"student_id": student_id} for student_id in student_ids]
+        )
+    }
+
+    semester_rows = []
+    semester_courses = {}
+    for student_id, semesters in plans.items():
+        plan_id = plan_id_by_student[student_id]
+        names = semester_names(start_semester, start_year, len(semesters))
+        for order, (name, course_ids) in enumerate(zip(names, semesters), start=1):
+            semester_rows.append({
+                "degree_plan_id": plan_id,
+                "semester_name": name,
+                "semester_order": order
+            })
+            semester_courses[(plan_id, order)] = course_ids
+
+    if semester_rows:
+        semester_table = PlannedSemester.__table__
+        semester_rows_returned = db.execute(
+            insert(semester_table).returning(
+                semester_table.c.id, semester_table.c.degree_plan_id, semester_table.c.semester_order
+            ),
+            semester_rows
+        )
+
+        link_rows = [
+            {"planned_semester_id": row.id, "course_id": course_id}
+            for row in semester_rows_returned
+            for course_id in semester_courses[(row.degree_plan_id, row.semester_order)]
+        ]
+        if link_rows:
+            db.execute(insert(planned_semester_courses), link_rows)
+
+    return plan_id_by_student
+
+
+def generate_degree_plans(db, student_ids, start_semester, start_year, courses_per_semester=4,
+                          max_workers=DEFAULT_WORKERS):
+    """Plan and persist degree plans for many students. Returns a throughput report."""
+    started = time.perf_counter()
+    graph = get_prereq_graph(db)
+    inputs, missing = load_planning_inputs(db, student_ids)
+    workers = max_workers if len(inputs) >= PROCESS_POOL_MIN_PLANS else 1
+
+    generated = 0
+    for start in range(0, len(inputs), WRITE_BATCH_SIZE):
+        batch = inputs[start:start + WRITE_BATCH_SIZE]
+        plans = plan_many(graph, batch, courses_per_semester, max_workers=workers)
+        write_degree_plans(db, plans, start_semester, start_year)
+        db.commit()
+        generated += len(plans)
+
+    elapsed = time.perf_counter() - started
+    return {
+        "plans_generated": generated,
+        "missing_student_ids": missing,
+        "elapsed_seconds": round(elapsed, 4),
+        "plans_per_second": round(generated / elapsed, 2) if elapsed > 0 else 0.0
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate degree plans for many students")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--all", action="store_true", help="plan every student profile")
+    group.add_argument("--students", help="comma-separated student IDs")
+    parser.add_argument("--start-semester", default="Fall", choices=["Fall", "Spring"])
+    parser.add_argument("--start-year", type=int, default=2026)
+    parser.add_argument("--per-semester", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        if args.all:
+            student_ids = db.execute(select(StudentProfile.id)).scalars().all()
+        else:
+            student_ids = [int(s) for s in args.students.split(",") if s.strip()]
+
+        report = generate_degree_plans(
+            db, student_ids, args.start_semester, args.start_year, args.per_semester, args.workers
+        )
+    finally:
+        db.close()
+
+    print(f"Generated {report['plans_generated']} plans in {report['elapsed_seconds']}s "
+          f"({report['plans_per_second']} plans/s)")
+    if report["missing_student_ids"]:
+        print(f"Unknown student IDs: {report['missing_student_ids']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""
+Local load test: async router handlers vs the old sync (threadpool) handlers.
+
+Serves the real routers with uvicorn on a single worker against a temporary
+SQLite file, plus a sync copy of GET /api/semesters/{id} as it was before the
+routers moved to AsyncSession, then drives both with concurrent keep-alive
+clients and reports throughput and latency.
+
+Usage: python benchmarks/async_load.py [--concurrency 16,64,256] [--seconds 5]
+
+Server errors (for example connection-pool timeouts) are counted, not raised.
+"""
+
+import argparse
+import http.client
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import uvicorn
+from fastapi import Depends, FastAPI, HTTPException
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+import database
+from database import bump_catalog_version, configure_sqlite
+from loaders import SEMESTER_OPTIONS
+from models import Base, Course, Semester, SemesterSchema, semester_courses
+from routers import courses, degree_planning, semesters
+
+PORT = 8765
+COURSES_PER_SEMESTER = 8
+
+
+def build_database(path):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    configure_sqlite(engine)
+    Base.metadata.create_all(engine)
+
+    with engine.begin() as conn:
+        conn.execute(insert(Course), [
+            {"course_id": f"CS{100 + i}", "title": f"Course {i}", "credits": 3, "department": "CS",
+             "level": 100 * (1 + i // 100), "description": "Synthetic course " * 10}
+            for i in range(400)
+        ])
+        conn.execute(insert(Semester), [{"name": f"Semester {i}"} for i in range(50)])
+        conn.execute(insert(semester_courses), [
+            {"semester_id": s + 1, "course_id": f"CS{100 + s * COURSES_PER_SEMESTER + i}"}
+            for s in range(50) for i in range(COURSES_PER_SEMESTER)
+        ])
+        bump_catalog_version(conn)
+
+    return engine
+
+
+def build_app(path):
+    engine = build_database(path)
+    SyncSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    configure_sqlite(async_engine.sync_engine)
+    AsyncSession = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    def get_db():
+        db = SyncSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_async_db():
+        async with AsyncSession() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(courses.router, prefix="/api/courses")
+    app.include_router(semesters.router, prefix="/api/semesters")
+    app.include_router(degree_planning.router, prefix="/api/degree-planning")
+    app.dependency_overrides[database.get_db] = get_db
+    app.dependency_overrides[database.get_async_db] = get_async_db
+
+    @app.get("/sync/semesters/{semester_id}", response_model=SemesterSchema)
+    def get_semester_sync(semester_id: int, db: Session = Depends(get_db)):
+        semester = db.query(Semester).options(*SEMESTER_OPTIONS).filter(Semester.id == semester_id).first()
+        if not semester:
+            raise HTTPException(status_code=404, detail="Semester not found")
+        return semester
+
+    return app
+
+
+def run_clients(path_for, concurrency, seconds):
+    """Hit the server from `concurrency` keep-alive clients; returns (sorted latencies, error count)"""
+    deadline = time.perf_counter() + seconds
+    latencies = [[] for _ in range(concurrency)]
+    errors = [0] * concurrency
+
+    def client(n):
+        conn = http.client.HTTPConnection("127.0.0.1", PORT)
+        i = n
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            conn.request("GET", path_for(i))
+            response = conn.getresponse()
+            response.read()
+            if response.status == 200:
+                latencies[n].append(time.perf_counter() - started)
+            else:
+                errors[n] += 1
+            i += concurrency
+        conn.close()
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(client, range(concurrency)))
+
+    return sorted(l for per_client in latencies for l in per_client), sum(errors)
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return float("nan")
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare async and sync handler throughput")
+    parser.add_argument("--concurrency", default="16,64,256")
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = build_app(os.path.join(tmp, "load.db"))
+        server = uvicorn.Server(uvicorn.Config(app, port=PORT, log_level="critical", backlog=4096))
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        while not server.started:
+            time.sleep(0.05)
+
+        targets = [
+            ("sync  /sync/semesters/{id}", lambda i: f"/sync/semesters/{i % 50 + 1}"),
+            ("async /api/semesters/{id}", lambda i: f"/api/semesters/{i % 50 + 1}"),
+        ]
+        print(f"{'endpoint':<30}{'clients':>8}{'req/s':>10}{'p50 ms':>9}{'p99 ms':>9}{'errors':>8}")
+        try:
+            for concurrency in (int(c) for c in args.concurrency.split(",")):
+                for name, path_for in targets:
+                    run_clients(path_for, concurrency, 0.5)  # warm up
+                    latencies, errors = run_clients(path_for, concurrency, args.seconds)
+                    print(f"{name:<30}{concurrency:>8}{len(latencies) / args.seconds:>10.0f}"
+                          f"{percentile(latencies, 0.5) * 1000:>9.1f}{percentile(latencies, 0.99) * 1000:>9.1f}"
+                          f"{errors:>8}")
+        finally:
+            server.should_exit = True
+            thread.join()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+"""
+Load test harness: the real app under uvicorn, driven by a realistic request mix.
+
+Seeds a temporary SQLite database with benchmarks/synthetic.py, starts
+`uvicorn main:app` on it (all middleware, caches and background bootstrap
+included), waits for /readyz and then runs keep-alive clients that each
+replay a weighted mix of:
+
+  browse    catalog pages, course details, search, departments, majors
+  semester  add a course to the client's own semester, or remove one
+  profile   create a student profile
+  plan      generate a degree plan for a seeded student
+
+and reports throughput, p50/p95/p99 latency and error rate per endpoint.
+Run it at several concurrencies and worker counts to size a deployment.
+
+Usage: python benchmarks/load.py [--concurrency 8,32] [--seconds 10] [--workers 1]
+                                 [--courses 2000] [--mix browse=60,semester=20,profile=10,plan=10]
+                                 [--output results.json]
+
+The clients run in this process, so on a small machine they compete with the
+server for CPU; compare runs on the same machine.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+
+from synthetic import department_codes, seed_database
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PORT = 8766
+DEFAULT_MIX = "browse=60,semester=20,profile=10,plan=10"
+
+
+class Recorder:
+    """Latencies and errors per endpoint template, shared by all client threads"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def record(self, endpoint, seconds, ok):
+        with self._lock:
+            self.latencies[endpoint].append(seconds)
+            if not ok:
+                self.errors[endpoint] += 1
+
+
+class Client:
+    """One simulated user on a keep-alive connection, with a semester of their own"""
+
+    def __init__(self, n, catalog, recorder):
+        self.rng = random.Random(n)
+        self.catalog = catalog
+        self.recorder = recorder
+        self.conn = http.client.HTTPConnection("127.0.0.1", PORT, timeout=60)
+        self.semester_id = None
+        self.semester_courses = set()
+
+    def request(self, endpoint, method, path, body=None):
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        started = time.perf_counter()
+        try:
+            self.conn.request(method, path, json.dumps(body) if body is not None else None, headers)
+            response = self.conn.getresponse()
+            payload = response.read()
+            ok = response.status < 400
+        except (OSError, http.client.HTTPException):
+            self.conn.close()  # reconnects on the next request
+            payload, ok = b"", False
+        self.recorder.record(endpoint, time.perf_counter() - started, ok)
+        return json.loads(payload) if ok and payload else None
+
+    def browse(self):
+        rng, catalog = self.rng, self.catalog
+        choice = rng.random()
+        if choice < 0.35:
+            department = rng.choice(catalog["departments"])
+            self.request("GET /api/courses/", "GET", f"/api/courses/?department={department}&limit=50")
+        elif choice < 0.7:
+            course_id = rng.choice(catalog["course_ids"])
+            self.request("GET /api/courses/{course_id}", "GET", f"/api/courses/{course_id}")
+        elif choice < 0.85:
+            self.request("GET /api/courses/search", "GET", f"/api/courses/search?q=synthetic+{rng.randint(0, 999)}")
+        elif choice < 0.95:
+            self.request("GET /api/courses/departments/list", "GET", "/api/courses/departments/list")
+        else:
+            self.request("GET /api/degree-planning/majors", "GET", "/api/degree-planning/majors")
+
+    def semester(self):
+        if self.semester_id is None:
+            created = self.request("POST /api/semesters/", "POST", "/api/semesters/", {"name": f"Load {id(self)}"})
+            if created:
+                self.semester_id = created["id"]
+            return
+
+        if self.semester_courses and (len(self.semester_courses) >= 6 or self.rng.random() < 0.4):
+            course_id = self.rng.choice(sorted(self.semester_courses))
+            self.semester_courses.discard(course_id)
+            self.request("DELETE /api/semesters/{semester_id}/courses/{course_id}", "DELETE",
+                         f"/api/semesters/{self.semester_id}/courses/{course_id}")
+        else:
+            course_id = self.rng.choice(self.catalog["course_ids"])
+            if course_id in self.semester_courses:
+                return
+            self.semester_courses.add(course_id)
+            self.request("POST /api/semesters/{semester_id}/courses", "POST",
+                         f"/api/semesters/{self.semester_id}/courses", {"course_id": course_id})
+
+    def profile(self):
+        rng, catalog = self.rng, self.catalog
+        self.request("POST /api/degree-planning/student-profile", "POST", "/api/degree-planning/student-profile", {
+            "name": f"Load student {rng.randint(0, 10 ** 6)}",
+            "major_id": rng.randint(1, catalog["majors"]),
+            "minor_ids": rng.sample(range(1, catalog["minors"] + 1), min(2, catalog["minors"])),
+            "ap_credits": [{"exam_name": "AP Synthetic", "score": 5,
+                            "course_equivalents": rng.sample(catalog["course_ids"][:50], 2)}],
+            "use_dashboard_semesters": False,
+        })
+
+    def plan(self):
+        self.request("POST /api/degree-planning/generate-degree-plan", "POST",
+                     "/api/degree-planning/generate-degree-plan", {
+                         "student_id": self.rng.randint(1, self.catalog["students"]),
+                         "start_semester": "Fall", "start_year": 2026, "courses_per_semester": 5,
+                     })
+
+    def run(self, mix, deadline):
+        actions = [getattr(self, name) for name in mix]
+        weights = list(mix.values())
+        while time.perf_counter() < deadline:
+            self.rng.choices(actions, weights)[0]()
+        self.conn.close()
+
+
+def run_load(catalog, mix, concurrency, seconds):
+    recorder = Recorder()
+    deadline = time.perf_counter() + seconds
+    clients = [Client(n, catalog, recorder) for n in range(concurrency)]
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(lambda client: client.run(mix, deadline), clients))
+    return recorder
+
+
+def percentile(sorted_values, p):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))]
+
+
+def summarize(recorder, seconds):
+    """{endpoint: stats}, plus an "all" row across endpoints"""
+    summary = {}
+    everything = []
+    for endpoint, latencies in sorted(recorder.latencies.items()):
+        everything.extend(latencies)
+        summary[endpoint] = _stats(sorted(latencies), recorder.errors[endpoint], seconds)
+    if everything:
+        summary["all"] = _stats(sorted(everything), sum(recorder.errors.values()), seconds)
+    return summary
+
+
+def _stats(latencies, errors, seconds):
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / seconds,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "error_rate": errors / len(latencies),
+    }
+
+
+def print_summary(concurrency, summary):
+    print(f"\n{concurrency} clients")
+    print(f"{'endpoint':<60}{'reqs':>7}{'req/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}")
+    for endpoint, stats in summary.items():
+        print(f"{endpoint:<60}{stats['requests']:>7}{stats['rps']:>8.1f}{stats['p50_ms']:>9.1f}"
+              f"{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}{stats['error_rate']:>8.1%}")
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ("browse", "semester", "profile", "plan"):
+            raise SystemExit(f"Unknown mix entry {name!r}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def start_server(database_url, workers):
+    env = dict(os.environ, DATABASE_URL=database_url, CATALOG_SNAPSHOT="", CATALOG_SYNC_ON_STARTUP="0")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(PORT), "--workers", str(workers),
+         "--log-level", "warning", "--backlog", "4096"],
+        cwd=BACKEND_DIR, env=env,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise SystemExit(f"uvicorn exited with status {server.returncode}")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", PORT, timeout=1)
+            conn.request("GET", "/readyz")
+            if conn.getresponse().status == 200:
+                return server
+        except OSError:
+            pass
+        time.sleep(0.2)
+    server.terminate()
+    raise SystemExit("Server did not become ready within 60s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the API with a realistic request mix")
+    parser.add_argument("--concurrency", default="8,32")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--courses", type=int, default=2000)
+    parser.add_argument("--majors", type=int, default=50)
+    parser.add_argument("--minors", type=int, default=50)
+    parser.add_argument("--students", type=int, default=500)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Weights per action, e.g. " + DEFAULT_MIX)
+    parser.add_argument("--output", help="Also write the results as JSON to this file")
+    args = parser.parse_args(argv)
+    mix = parse_mix(args.mix)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "load.db")
+        engine = create_engine(f"sqlite:///{path}")
+        print(f"Seeding {args.courses} courses, {args.majors} majors, {args.minors} minors, "
+              f"{args.students} students...")
+        courses = seed_database(engine, args.courses, args.majors, args.minors, args.students)
+        engine.dispose()
+        catalog = {
+            "course_ids": [course["course_id"] for course in courses],
+            "departments": department_codes(max(8, args.courses // 250)),
+            "majors": args.majors, "minors": args.minors, "students": args.students,
+        }
+
+        server = start_server(f"sqlite:///{path}", args.workers)
+        results = {"workers": args.workers, "mix": mix, "seconds": args.seconds, "runs": {}}
+        try:
+            for concurrency in (int(c) for c in args.concurrency.split(",")):
+                summary = summarize(run_load(catalog, mix, concurrency, args.seconds), args.seconds)
+                results["runs"][concurrency] = summary
+                print_summary(concurrency, summary)
+        finally:
+            server.terminate()
+            server.wait()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nWrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
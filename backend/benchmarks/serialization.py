@@ -0,0 +1,129 @@
+"""
+Compare the default and fast serialization paths for large list responses.
+
+Builds an in-memory catalog of 1k/10k/50k synthetic courses and times what each
+list endpoint serves with FAST_SERIALIZATION off against the fast path (Core
+rows -> orjson). With it off, the course list encodes its Core rows through
+catalog_cache.encode_json (jsonable_encoder -> json) and the semester list goes
+through ORM objects -> Pydantic response model -> json.
+
+Usage: python benchmarks/serialization.py [--sizes 1000,10000,50000] [--repeat 3]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import fastjson
+from catalog_cache import encode_json
+from models import Base, Course, Semester, SemesterSchema, semester_courses
+from loaders import SEMESTER_OPTIONS
+from routers.courses import list_courses
+from routers.semesters import semester_rows
+
+DEPARTMENTS = ["CS", "MATH", "ECE", "STAT", "PHYS", "CHEM", "ENG", "ECON"]
+COURSES_PER_SEMESTER = 25
+
+
+def build_catalog(size):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+
+    courses = []
+    for i in range(size):
+        dept = DEPARTMENTS[i % len(DEPARTMENTS)]
+        number = 100 + i // len(DEPARTMENTS)
+        courses.append({
+            "course_id": f"{dept}{number}", "title": f"{dept} Course {number}", "credits": 3,
+            "department": dept, "level": (number // 100) * 100,
+            "description": "Synthetic course used for serialization benchmarks. " * 4,
+            "prerequisites": None, "is_active": True,
+        })
+
+    with engine.begin() as conn:
+        conn.execute(insert(Course), courses)
+        semester_count = size // COURSES_PER_SEMESTER
+        conn.execute(insert(Semester), [{"name": f"Semester {i}"} for i in range(semester_count)])
+        conn.execute(insert(semester_courses), [
+            {"semester_id": i // COURSES_PER_SEMESTER + 1, "course_id": course["course_id"]}
+            for i, course in enumerate(courses[:semester_count * COURSES_PER_SEMESTER])
+        ])
+
+    return sessionmaker(bind=engine)
+
+
+def encode(payload) -> bytes:
+    return json.dumps(jsonable_encoder(payload), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def courses_default(db):
+    rows, _ = list_courses(db)
+    return encode_json(rows)
+
+
+def courses_fast(db):
+    rows, _ = list_courses(db)
+    return fastjson.dumps(rows)
+
+
+def semesters_default(db):
+    adapter = TypeAdapter(List[SemesterSchema])
+    semesters = db.query(Semester).options(*SEMESTER_OPTIONS).all()
+    return encode(adapter.validate_python(semesters, from_attributes=True))
+
+
+def semesters_fast(db):
+    return fastjson.dumps(semester_rows(db))
+
+
+def best_of(Session, fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        db = Session()
+        try:
+            started = time.perf_counter()
+            body = fn(db)
+            timings.append(time.perf_counter() - started)
+        finally:
+            db.close()
+    return min(timings), len(body)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark list response serialization")
+    parser.add_argument("--sizes", default="1000,10000,50000")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+    # The default columns measure what the endpoints serve with the fast path off
+    fastjson.FAST_SERIALIZATION = False
+
+    print(f"Encoder: {'orjson' if fastjson.orjson else 'json (orjson not installed)'}")
+    print(f"{'endpoint':<12}{'courses':>9}{'default ms':>12}{'fast ms':>10}{'speedup':>9}{'bytes':>12}")
+
+    for size in (int(s) for s in args.sizes.split(",")):
+        Session = build_catalog(size)
+        for name, default, fast in [
+            ("courses", courses_default, courses_fast),
+            ("semesters", semesters_default, semesters_fast),
+        ]:
+            default_seconds, _ = best_of(Session, default, args.repeat)
+            fast_seconds, size_bytes = best_of(Session, fast, args.repeat)
+            print(f"{name:<12}{size:>9}{default_seconds * 1000:>12.1f}{fast_seconds * 1000:>10.1f}"
+                  f"{default_seconds / fast_seconds:>8.1f}x{size_bytes:>12}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+"""
+Benchmark suite over synthetic catalogs.
+
+Seeds a fresh SQLite database for each preset with benchmarks/synthetic.py,
+then times ingestion, the catalog endpoints, student profile creation and
+degree plan generation (single and batch). Results are written as JSON to
+benchmarks/results/<preset>-<commit>.json; pass --compare with an earlier
+result file to print per-benchmark ratios and fail on regressions.
+
+Usage: python benchmarks/suite.py [--preset small,medium] [--repeat 5]
+                                  [--compare benchmarks/results/small-abc1234.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+import database
+from batch_planning import generate_degree_plans
+from catalog_cache import catalog_cache
+from catalog_snapshot import get_catalog_snapshot, invalidate_catalog_snapshot
+from models import APCredit, Base, GenerateDegreePlanRequest, StudentProfile, StudentProfileCreate
+from prereq_graph import get_prereq_graph, invalidate_prereq_graph
+from routers.courses import get_course, list_courses
+from routers.degree_planning import create_student_profile, generate_degree_plan
+from search import search_courses
+from sync_catalog import sync_catalog
+from synthetic import generate_courses, seed_database
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+PRESETS = {
+    "small": dict(num_courses=1000, num_majors=100, num_minors=100, num_students=1000, depth=6, fan_in=2),
+    "medium": dict(num_courses=10000, num_majors=300, num_minors=300, num_students=5000, depth=8, fan_in=3),
+    "large": dict(num_courses=100000, num_majors=500, num_minors=500, num_students=10000, depth=12, fan_in=3),
+}
+
+# A benchmark counts as regressed when its median is this much slower than the baseline
+REGRESSION_THRESHOLD = 1.2
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def reset_caches():
+    """Every preset starts at catalog version 1, so version-keyed caches must be dropped"""
+    invalidate_prereq_graph()
+    invalidate_catalog_snapshot()
+    catalog_cache.clear()
+
+
+async def measure(results, name, fn, repeat, per_call=1):
+    """Time `fn` (sync or async) `repeat` times; records milliseconds per call"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        outcome = fn()
+        if asyncio.iscoroutine(outcome):
+            await outcome
+        timings.append((time.perf_counter() - started) * 1000 / per_call)
+
+    results[name] = {
+        "median_ms": round(statistics.median(timings), 4),
+        "min_ms": round(min(timings), 4),
+        "runs": repeat,
+    }
+    print(f"  {name:<32}{results[name]['median_ms']:>12.3f} ms")
+
+
+def ingestion_benchmarks(params, tmp):
+    """(name, fn, calls per run) for catalog ingestion into an empty and an up-to-date database"""
+    courses = generate_courses(params["num_courses"], params["depth"], params["fan_in"])
+
+    def bulk_insert():
+        path = os.path.join(tmp, f"ingest-{time.perf_counter_ns()}.db")
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            database.bulk_insert_courses(conn, courses)
+        engine.dispose()
+
+    engine = create_engine(f"sqlite:///{os.path.join(tmp, 'sync.db')}")
+    sync_catalog(courses, bind=engine)
+
+    return [
+        ("ingest.bulk_insert", bulk_insert, 1),
+        ("ingest.sync_unchanged", lambda: sync_catalog(courses, bind=engine), 1),
+    ]
+
+
+async def run_preset(name, params, repeat):
+    print(f"\nPreset {name}: {params}")
+    results = {}
+    reset_caches()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine, async_engine = database.create_engines(url)
+
+        started = time.perf_counter()
+        courses = seed_database(engine, **params)
+        print(f"  seeded in {time.perf_counter() - started:.2f}s")
+
+        for bench_name, fn, per_call in ingestion_benchmarks(params, tmp):
+            await measure(results, bench_name, fn, max(1, repeat // 2), per_call)
+
+        course_ids = [c["course_id"] for c in courses]
+        lookups = course_ids[::max(1, len(course_ids) // 1000)]
+
+        with Session(engine) as db:
+            async with AsyncSession(async_engine, expire_on_commit=False) as adb:
+                def build_snapshot():
+                    invalidate_catalog_snapshot()
+                    get_catalog_snapshot(db)
+
+                def build_graph():
+                    invalidate_prereq_graph()
+                    get_prereq_graph(db)
+
+                async def get_courses():
+                    for course_id in lookups:
+                        await get_course(course_id, adb)
+
+                await measure(results, "catalog.snapshot_build", build_snapshot, repeat)
+                await measure(results, "catalog.prereq_graph_build", build_graph, repeat)
+                await measure(results, "catalog.list_all", lambda: list_courses(db), repeat)
+                await measure(results, "catalog.list_page_100", lambda: list_courses(
+                    db, after=course_ids[len(course_ids) // 2], limit=100), repeat)
+                await measure(results, "catalog.get_course", get_courses, repeat, per_call=len(lookups))
+                await measure(results, "catalog.search", lambda: search_courses(db, "synthetic tier 3"), repeat)
+
+                student_ids = db.execute(select(StudentProfile.id).limit(50)).scalars().all()
+                state = {"next": 0, "created": 0}
+
+                async def generate_one():
+                    student_id = student_ids[state["next"] % len(student_ids)]
+                    state["next"] += 1
+                    await generate_degree_plan(GenerateDegreePlanRequest(
+                        student_id=student_id, start_semester="Fall", start_year=2026, courses_per_semester=5
+                    ), adb)
+
+                async def create_one():
+                    state["created"] += 1
+                    await create_student_profile(StudentProfileCreate(
+                        name=f"Bench Student {state['created']}",
+                        major_id=1,
+                        minor_ids=[1, 2],
+                        ap_credits=[APCredit(exam_name="AP Exam", score=5, course_equivalents=course_ids[:3])],
+                        use_dashboard_semesters=False,
+                    ), adb)
+
+                await measure(results, "plans.generate_degree_plan", generate_one, repeat * 4)
+                await measure(results, "profiles.create_student_profile", create_one, repeat * 4)
+
+                all_students = db.execute(select(StudentProfile.id)).scalars().all()
+                await measure(results, "plans.batch_per_student", lambda: generate_degree_plans(
+                    db, all_students, "Fall", 2026, 5), 1, per_call=len(all_students))
+
+        await async_engine.dispose()
+        engine.dispose()
+
+    return results
+
+
+def compare(current, baseline_path):
+    """Print ratios against a baseline result file; returns the names of regressed benchmarks"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    print(f"\nCompared with {baseline['meta']['commit']} ({baseline_path}):")
+    regressions = []
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if not before:
+            print(f"  {name:<32}{'new':>12}")
+            continue
+        ratio = result["median_ms"] / before["median_ms"] if before["median_ms"] else float("inf")
+        flag = ""
+        if ratio > REGRESSION_THRESHOLD:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"  {name:<32}{before['median_ms']:>10.3f} -> {result['median_ms']:>10.3f} ms  x{ratio:.2f}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the synthetic benchmark suite")
+    parser.add_argument("--preset", default="small", help=f"comma-separated: {', '.join(PRESETS)}")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--compare", help="baseline result file (single preset only)")
+    parser.add_argument("--output-dir", default=RESULTS_DIR)
+    args = parser.parse_args(argv)
+
+    commit = git_commit()
+    os.makedirs(args.output_dir, exist_ok=True)
+    regressions = []
+
+    for preset in args.preset.split(","):
+        params = PRESETS[preset]
+        current = {
+            "meta": {
+                "preset": preset,
+                "params": params,
+                "commit": commit,
+                "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+            },
+            "results": asyncio.run(run_preset(preset, params, args.repeat)),
+        }
+
+        path = os.path.join(args.output_dir, f"{preset}-{commit}.json")
+        with open(path, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"Results written to {path}")
+
+        if args.compare:
+            regressions += compare(current, args.compare)
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {REGRESSION_THRESHOLD}x: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
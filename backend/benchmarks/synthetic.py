@@ -0,0 +1,112 @@
+"""
+Synthetic catalog, requirement and student generator for benchmarks.
+
+Courses are split into `depth` tiers; each course below the first tier takes
+up to `fan_in` prerequisites from the tier directly above it, so the
+prerequisite DAG is exactly `depth` levels deep. Majors and minors require
+random course sets drawn across all tiers, and students get a major, up to two
+minors and a handful of completed lower-tier courses. Everything is seeded,
+so the same parameters always produce the same data.
+"""
+
+import json
+import random
+
+from sqlalchemy import insert
+
+from database import bulk_insert_courses, bump_catalog_version
+import migrations
+from models import (
+    Base, Major, Minor, StudentProfile, major_required_courses, minor_required_courses,
+    student_completed_courses, student_minors
+)
+
+
+def department_codes(count):
+    return [f"D{chr(65 + i // 26)}{chr(65 + i % 26)}" for i in range(count)]
+
+
+def generate_courses(num_courses, depth=6, fan_in=2, seed=0):
+    """Course dicts (as from the catalog API) forming a `depth`-tier prerequisite DAG"""
+    rng = random.Random(seed)
+    departments = department_codes(max(8, num_courses // 250))
+    tiers = [[] for _ in range(depth)]
+    courses = []
+
+    for i in range(num_courses):
+        tier = i * depth // num_courses
+        dept = departments[i % len(departments)]
+        course_id = f"{dept}{1000 + i // len(departments)}"
+
+        prereqs = None
+        if tier > 0 and fan_in:
+            above = tiers[tier - 1]
+            prereqs = json.dumps(rng.sample(above, min(len(above), rng.randint(1, fan_in))))
+
+        tiers[tier].append(course_id)
+        courses.append({
+            "course_id": course_id,
+            "title": f"Synthetic Course {i}",
+            "credits": rng.choice([3, 3, 3, 4]),
+            "department": dept,
+            "level": 100 * (1 + tier * 4 // depth),
+            "description": f"Synthetic tier {tier} course used for benchmarking. " * 3,
+            "prerequisites": prereqs,
+        })
+
+    return courses
+
+
+def seed_database(engine, num_courses=1000, num_majors=100, num_minors=100, num_students=1000,
+                  depth=6, fan_in=2, major_size=40, minor_size=8, seed=0):
+    """Create the schema and fill it with a synthetic catalog, requirements and students"""
+    rng = random.Random(seed)
+    Base.metadata.create_all(engine)
+    migrations.upgrade(engine)  # search index and its triggers
+    courses = generate_courses(num_courses, depth, fan_in, seed)
+    course_ids = [c["course_id"] for c in courses]
+    lower_tiers = course_ids[:max(1, num_courses // depth)]
+
+    with engine.begin() as conn:
+        bulk_insert_courses(conn, courses)
+
+        conn.execute(insert(Major), [
+            {"id": i + 1, "name": f"Major {i}", "department": courses[i % num_courses]["department"],
+             "total_credits_required": 120}
+            for i in range(num_majors)
+        ])
+        conn.execute(insert(major_required_courses), [
+            {"major_id": m + 1, "course_id": course_id, "is_core": True}
+            for m in range(num_majors)
+            for course_id in rng.sample(course_ids, min(major_size, num_courses))
+        ])
+        conn.execute(insert(Minor), [
+            {"id": i + 1, "name": f"Minor {i}", "department": courses[i % num_courses]["department"],
+             "total_credits_required": 18}
+            for i in range(num_minors)
+        ])
+        conn.execute(insert(minor_required_courses), [
+            {"minor_id": m + 1, "course_id": course_id, "is_core": True}
+            for m in range(num_minors)
+            for course_id in rng.sample(course_ids, min(minor_size, num_courses))
+        ])
+
+        conn.execute(insert(StudentProfile), [
+            {"id": s + 1, "name": f"Student {s}", "major_id": rng.randint(1, num_majors)}
+            for s in range(num_students)
+        ])
+        if num_minors:
+            conn.execute(insert(student_minors), [
+                {"student_id": s + 1, "minor_id": minor_id}
+                for s in range(num_students)
+                for minor_id in rng.sample(range(1, num_minors + 1), rng.randint(0, min(2, num_minors)))
+            ])
+        conn.execute(insert(student_completed_courses), [
+            {"student_id": s + 1, "course_id": course_id}
+            for s in range(num_students)
+            for course_id in rng.sample(lower_tiers, min(len(lower_tiers), rng.randint(0, 6)))
+        ])
+
+        bump_catalog_version(conn)
+
+    return courses
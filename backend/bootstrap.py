@@ -0,0 +1,88 @@
+"""
+Background catalog bootstrap with progress reporting.
+
+Seeding a fresh database crawls the whole upstream catalog, which can take
+minutes. The schema and migrations are applied at startup, before the first
+request; the server then starts accepting requests and runs the bootstrap
+(catalog seed and cache warm-up) on a background thread. /readyz reports
+when it has finished.
+"""
+
+import threading
+import time
+import traceback
+
+from database import SessionLocal, log_pool_stats, seed_catalog
+from catalog_snapshot import get_catalog_snapshot
+
+
+class BootstrapState:
+    """Thread-safe progress of the catalog bootstrap"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.status = "pending"  # pending -> running -> ready | failed
+        self.phase = None
+        self.courses_loaded = 0
+        self.started_at = None
+        self.finished_at = None
+        self.error = None
+
+    def update(self, **fields):
+        with self._lock:
+            for name, value in fields.items():
+                setattr(self, name, value)
+
+    @property
+    def ready(self) -> bool:
+        return self.status == "ready"
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            finished = self.finished_at or time.time()
+            return {
+                "status": self.status,
+                "phase": self.phase,
+                "courses_loaded": self.courses_loaded,
+                "elapsed_seconds": round(finished - self.started_at, 2) if self.started_at else None,
+                "error": self.error,
+            }
+
+
+bootstrap_state = BootstrapState()
+
+
+def warm_caches():
+    """Build the in-memory catalog before the first request needs it"""
+    db = SessionLocal()
+    try:
+        return len(get_catalog_snapshot(db))
+    finally:
+        db.close()
+
+
+def run_bootstrap(state: BootstrapState = bootstrap_state, init=seed_catalog, warm=warm_caches):
+    """Seed the database and warm caches, recording progress in `state`"""
+    state.update(status="running", phase="seeding catalog", started_at=time.time())
+    try:
+        init(progress=lambda inserted: state.update(courses_loaded=inserted))
+
+        state.update(phase="warming caches")
+        state.update(courses_loaded=warm())
+    except Exception as e:
+        traceback.print_exc()
+        state.update(status="failed", phase=None, error=str(e), finished_at=time.time())
+        return
+
+    state.update(status="ready", phase=None, finished_at=time.time())
+    print(f"Catalog ready: {state.courses_loaded} courses in {state.as_dict()['elapsed_seconds']}s")
+    log_pool_stats()
+
+
+def start_background_bootstrap(state: BootstrapState = bootstrap_state, **kwargs) -> threading.Thread:
+    """Run the bootstrap on a daemon thread and return immediately"""
+    thread = threading.Thread(
+        target=run_bootstrap, args=(state,), kwargs=kwargs, name="catalog-bootstrap", daemon=True
+    )
+    thread.start()
+    return thread
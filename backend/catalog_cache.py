@@ -0,0 +1,103 @@
+"""
+In-process read-through cache for catalog endpoints, with strong ETags.
+
+Catalog data (courses, departments, majors, minors) changes about once a
+term. Responses are cached as ready-to-send JSON bytes, keyed by endpoint and
+query parameters, and tagged with the catalog version that every catalog
+write bumps (see database.bump_catalog_version). The ETag is derived from the
+version, the database's catalog instance id and the key alone, so a
+matching If-None-Match is answered with 304 Not Modified before any query
+runs or any body is built. The instance id keeps tags from repeating when a
+database is recreated or reseeded and its version restarts at 1.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+
+from database import get_catalog_state
+import fastjson
+
+DEFAULT_MAX_ENTRIES = 512
+
+
+class CatalogCache:
+    """Thread-safe LRU of (catalog state, body, headers) entries"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, version, body: bytes, headers: dict):
+        with self._lock:
+            self._entries[key] = (version, body, headers)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+catalog_cache = CatalogCache()
+
+
+def make_etag(state, key) -> str:
+    instance_id, version = state
+    digest = hashlib.sha1(repr(key).encode()).hexdigest()[:16]
+    return f'"{instance_id[:12]}-v{version}-{digest}"'
+
+
+def encode_json(payload) -> bytes:
+    """Encode a payload exactly as FastAPI's JSONResponse would (or with the fast encoder, if enabled)"""
+    if fastjson.FAST_SERIALIZATION:
+        return fastjson.dumps(payload)
+    return json.dumps(
+        jsonable_encoder(payload), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+async def cached_json_response(request, db, key, build, cache: CatalogCache = catalog_cache, warm=None) -> Response:
+    """
+    Serve a catalog read from the cache.
+
+    `db` is an AsyncSession. `build(session)` receives a sync Session,
+    returns (payload, extra_headers) and only runs on a cache miss for the
+    current catalog state. `warm(db)`, if given, is awaited before it, to
+    build shared catalog structures off the event loop.
+    """
+    state = await db.run_sync(get_catalog_state)
+    etag = make_etag(state, key)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")) or if_none_match.strip() == "*":
+        entry = cache.get(key, state)
+        if entry:
+            headers.update(entry[2])
+        return Response(status_code=304, headers=headers)
+
+    entry = cache.get(key, state)
+    if entry is None:
+        if warm:
+            await warm(db)
+        payload, extra_headers = await db.run_sync(build)
+        entry = (state, encode_json(payload), extra_headers)
+        cache.put(key, *entry)
+
+    headers.update(entry[2])
+    return Response(content=entry[1], media_type="application/json", headers=headers)
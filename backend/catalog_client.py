@@ -0,0 +1,254 @@
+"""
+HTTP client for the UIUC Course Explorer API.
+
+All worker threads share a single keep-alive connection pool, and request
+pacing is handled by a token bucket rather than fixed sleeps, so throughput
+scales with the configured request budget. Responses are kept in an on-disk
+cache and revalidated with conditional GETs, so unchanged documents cost a
+304 instead of a full download.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+COURSE_EXPLORER_URL = "https://courses.illinois.edu/cisapp/explorer"
+
+# Tunables for catalog ingestion (overridable from the environment)
+DEFAULT_MAX_WORKERS = int(os.getenv("CATALOG_MAX_WORKERS", "8"))
+DEFAULT_REQUESTS_PER_SECOND = float(os.getenv("CATALOG_REQUESTS_PER_SECOND", "10"))
+DEFAULT_TIMEOUT = float(os.getenv("CATALOG_TIMEOUT", "10"))
+
+# On-disk response cache (set CATALOG_CACHE_DIR to an empty string to disable)
+DEFAULT_CACHE_DIR = os.getenv("CATALOG_CACHE_DIR", os.path.join(os.path.dirname(__file__), ".catalog_cache"))
+DEFAULT_CACHE_MAX_BYTES = int(os.getenv("CATALOG_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+DEFAULT_CACHE_MAX_AGE = float(os.getenv("CATALOG_CACHE_MAX_AGE", str(30 * 24 * 3600)))
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Tokens refill continuously at `rate` per second up to `capacity`.
+    A rate of 0 (or less) disables limiting entirely.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then consume it."""
+        if self.rate <= 0:
+            return
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+
+            # Sleep outside the lock so other threads can refill/check
+            time.sleep(wait)
+
+
+class ResponseCache:
+    """
+    On-disk HTTP response cache keyed by URL.
+
+    Each entry is a body file plus a small JSON sidecar holding the ETag and
+    Last-Modified validators. Entries are evicted once they are older than
+    `max_age` seconds, or least-recently-used first when the cache grows past
+    `max_bytes`.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+                 max_age: float = DEFAULT_CACHE_MAX_AGE):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode()).hexdigest()
+        base = os.path.join(self.directory, key)
+        return base + ".json", base + ".body"
+
+    def get(self, url: str) -> Optional[dict]:
+        """Return {"etag", "last_modified", "body"} for a cached URL, or None."""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+            if time.time() - meta["stored_at"] > self.max_age:
+                return None
+            with open(body_path, "rb") as f:
+                meta["body"] = f.read()
+        except (OSError, ValueError, KeyError):
+            return None
+        return meta
+
+    def put(self, url: str, body: bytes, etag: Optional[str], last_modified: Optional[str]):
+        meta_path, body_path = self._paths(url)
+        meta = {"url": url, "etag": etag, "last_modified": last_modified, "stored_at": time.time()}
+
+        # Write to temp files and rename so concurrent readers never see a partial entry
+        self._write_atomic(body_path, body)
+        self._write_atomic(meta_path, json.dumps(meta).encode())
+
+    def touch(self, url: str):
+        """Mark an entry as revalidated (fresh and recently used)."""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+            meta["stored_at"] = time.time()
+            self._write_atomic(meta_path, json.dumps(meta).encode())
+            os.utime(body_path)
+        except (OSError, ValueError):
+            pass
+
+    def prune(self):
+        """Evict expired entries, then the least recently used ones until under max_bytes."""
+        entries = []
+        now = time.time()
+
+        for name in os.listdir(self.directory):
+            if not name.endswith(".body"):
+                continue
+            body_path = os.path.join(self.directory, name)
+            meta_path = body_path[:-len(".body")] + ".json"
+            try:
+                stat = os.stat(body_path)
+            except OSError:
+                continue
+
+            if now - stat.st_mtime > self.max_age:
+                self._remove(meta_path, body_path)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, meta_path, body_path))
+
+        total = sum(size for _, size, _, _ in entries)
+        for _, size, meta_path, body_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(meta_path, body_path)
+            total -= size
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes):
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _remove(*paths):
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class CatalogClient:
+    """Rate-limited Course Explorer client backed by one shared connection pool."""
+
+    def __init__(
+        self,
+        base_url: str = COURSE_EXPLORER_URL,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+        timeout: float = DEFAULT_TIMEOUT,
+        cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.limiter = TokenBucket(requests_per_second)
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
+
+        # Transfer statistics, reported after a sync
+        self.stats = {"requests": 0, "not_modified": 0, "bytes_downloaded": 0}
+        self._stats_lock = threading.Lock()
+
+        # Size the pool to the worker count so every thread reuses a keep-alive connection
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def url_for(self, path: str) -> str:
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def get(self, path: str) -> Optional[bytes]:
+        """
+        Fetch a document relative to the base URL. Returns None on a non-200 response.
+
+        Cached documents are revalidated with If-None-Match / If-Modified-Since;
+        a 304 answer is served from the cache without downloading the body.
+        """
+        url = self.url_for(path)
+        cached = self.cache.get(url) if self.cache else None
+
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        self.limiter.acquire()
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        self._record(response)
+
+        if response.status_code == 304 and cached:
+            self.cache.touch(url)
+            return cached["body"]
+
+        if response.status_code != 200:
+            print(f"  Failed to fetch {url}: Status {response.status_code}")
+            return None
+
+        if self.cache:
+            self.cache.put(
+                url,
+                response.content,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified")
+            )
+
+        return response.content
+
+    def _record(self, response):
+        with self._stats_lock:
+            self.stats["requests"] += 1
+            self.stats["bytes_downloaded"] += len(response.content)
+            if response.status_code == 304:
+                self.stats["not_modified"] += 1
+
+    def close(self):
+        if self.cache:
+            self.cache.prune()
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,149 @@
+"""
+Export and import the catalog as a single prebuilt SQLite snapshot file.
+
+The snapshot holds courses (with prerequisites), majors, minors and their
+requirement links, plus a `snapshot_meta` table with the format version,
+the catalog version it was taken at and row counts. It is a plain SQLite
+database, so importing is an ATTACH followed by one INSERT ... SELECT per
+table, with no network access and no per-row Python work.
+
+Usage: python catalog_export.py export [path]   (default: CATALOG_SNAPSHOT, data/catalog_snapshot.db)
+       python catalog_export.py import [path]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from contextlib import closing
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine, func, select
+
+from database import engine, bump_catalog_version, get_catalog_version, CATALOG_SNAPSHOT
+from models import Base, Course, Major, Minor, major_required_courses, minor_required_courses
+import migrations
+
+FORMAT_VERSION = 1
+
+# Parents before children, so links always point at existing rows
+SNAPSHOT_TABLES = [
+    Course.__table__, Major.__table__, Minor.__table__, major_required_courses, minor_required_courses,
+]
+
+
+def export_snapshot(path, bind=None):
+    """Write the current catalog to a new snapshot file at `path`. Returns its metadata."""
+    bind = bind or engine
+    if os.path.exists(path):
+        os.remove(path)
+
+    target = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(target, tables=SNAPSHOT_TABLES)
+    target.dispose()
+
+    with bind.connect() as conn:
+        conn.exec_driver_sql("ATTACH DATABASE ? AS snapshot", (path,))
+        conn.commit()
+        try:
+            with conn.begin():
+                counts = {}
+                for table in SNAPSHOT_TABLES:
+                    columns = ", ".join(c.name for c in table.columns)
+                    conn.exec_driver_sql(
+                        f"INSERT INTO snapshot.{table.name} ({columns}) SELECT {columns} FROM main.{table.name}"
+                    )
+                    counts[table.name] = conn.execute(select(func.count()).select_from(table)).scalar()
+
+                meta = {
+                    "format_version": FORMAT_VERSION,
+                    "catalog_version": get_catalog_version(conn),
+                    "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                    **{f"rows.{name}": count for name, count in counts.items()},
+                }
+                conn.exec_driver_sql("CREATE TABLE snapshot.snapshot_meta (key TEXT PRIMARY KEY, value TEXT)")
+                conn.exec_driver_sql(
+                    "INSERT INTO snapshot.snapshot_meta VALUES (?, ?)",
+                    [(key, str(value)) for key, value in meta.items()]
+                )
+        finally:
+            conn.exec_driver_sql("DETACH DATABASE snapshot")
+            conn.commit()
+
+    # Compact the file so it ships (and memory-maps) as small as possible
+    with closing(sqlite3.connect(path)) as raw:
+        raw.execute("VACUUM")
+    return meta
+
+
+def read_snapshot_meta(path):
+    """Metadata of a snapshot file; raises ValueError if it isn't a supported snapshot"""
+    try:
+        with closing(sqlite3.connect(f"file:{path}?mode=ro", uri=True)) as raw:
+            meta = dict(raw.execute("SELECT key, value FROM snapshot_meta"))
+    except sqlite3.Error as e:
+        raise ValueError(f"{path} is not a catalog snapshot: {e}")
+
+    if int(meta.get("format_version", 0)) != FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot format {meta.get('format_version')} (expected {FORMAT_VERSION})")
+    return meta
+
+
+def import_snapshot(path, bind=None):
+    """
+    Seed an empty catalog from a snapshot file. Returns the snapshot metadata.
+
+    Refuses to overwrite a database that already has courses; use
+    sync_catalog.py to update an existing catalog.
+    """
+    bind = bind or engine
+    meta = read_snapshot_meta(path)
+    Base.metadata.create_all(bind=bind)
+    migrations.upgrade(bind)
+
+    with bind.connect() as conn:
+        if conn.execute(select(Course.course_id).limit(1)).first():
+            raise ValueError("Database already contains courses; refusing to import a snapshot over them")
+
+        # ATTACH must run outside a transaction
+        conn.commit()
+        conn.exec_driver_sql("ATTACH DATABASE ? AS snapshot", (path,))
+        conn.commit()
+        try:
+            with conn.begin():
+                for table in SNAPSHOT_TABLES:
+                    columns = ", ".join(c.name for c in table.columns)
+                    conn.exec_driver_sql(
+                        f"INSERT INTO main.{table.name} ({columns}) SELECT {columns} FROM snapshot.{table.name}"
+                    )
+                bump_catalog_version(conn)
+        finally:
+            conn.exec_driver_sql("DETACH DATABASE snapshot")
+            conn.commit()
+
+    return meta
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export or import a prebuilt catalog snapshot")
+    parser.add_argument("command", choices=["export", "import"])
+    parser.add_argument("path", nargs="?", default=CATALOG_SNAPSHOT)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    if args.command == "export":
+        meta = export_snapshot(args.path)
+        verb = "Exported"
+    else:
+        meta = import_snapshot(args.path)
+        verb = "Imported"
+
+    elapsed = time.perf_counter() - started
+    print(f"{verb} catalog snapshot {args.path} (catalog version {meta['catalog_version']}, "
+          f"{meta['rows.courses']} courses, {meta['rows.majors']} majors) in {elapsed:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
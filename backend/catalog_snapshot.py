@@ -0,0 +1,141 @@
+"""
+Compact, read-only in-memory snapshot of the course catalog.
+
+Course rows are loaded once per catalog version into `__slots__` records
+(no per-instance dict or ORM identity state), department strings are
+interned, and every course gets an integer index. Course, department and
+planner lookups are served from the snapshot with O(1) dict lookups. A new
+snapshot is built off to the side and swapped in with a single assignment
+when the catalog version changes, so readers never see a partial catalog.
+"""
+
+import sys
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+
+from database import get_catalog_version
+from models import Course
+
+
+class CourseRecord:
+    """Immutable catalog row; attribute names match CourseSchema"""
+    __slots__ = ("index", "course_id", "title", "credits", "department", "level",
+                 "description", "prerequisites", "is_active")
+
+    def __init__(self, index, course_id, title, credits, department, level,
+                 description, prerequisites, is_active):
+        set_slot = object.__setattr__
+        set_slot(self, "index", index)
+        set_slot(self, "course_id", course_id)
+        set_slot(self, "title", title)
+        set_slot(self, "credits", credits)
+        set_slot(self, "department", department)
+        set_slot(self, "level", level)
+        set_slot(self, "description", description)
+        set_slot(self, "prerequisites", prerequisites)
+        set_slot(self, "is_active", is_active)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CourseRecord is read-only")
+
+    def __repr__(self):
+        return f"CourseRecord({self.course_id!r})"
+
+
+# Columns loaded into CourseRecord, in constructor order (after index)
+SNAPSHOT_COLUMNS = (
+    Course.course_id, Course.title, Course.credits, Course.department, Course.level,
+    Course.description, Course.prerequisites, Course.is_active
+)
+
+
+class CatalogSnapshot:
+    """All courses of one catalog version, indexed by course_id and department"""
+
+    def __init__(self, version: int, records: Tuple[CourseRecord, ...]):
+        self.version = version
+        self.records = records
+        self.index: Dict[str, int] = {record.course_id: record.index for record in records}
+
+        by_department: Dict[str, List[int]] = {}
+        for record in records:
+            if record.is_active:
+                by_department.setdefault(record.department, []).append(record.index)
+        self.by_department = {dept: tuple(indexes) for dept, indexes in by_department.items()}
+        self.departments = tuple(sorted(self.by_department))
+
+    @classmethod
+    def build(cls, rows, version: int = 0) -> "CatalogSnapshot":
+        """Build a snapshot from rows in SNAPSHOT_COLUMNS order"""
+        records = []
+        for course_id, title, credits, department, level, description, prerequisites, is_active in rows:
+            records.append(CourseRecord(
+                len(records), course_id, title, credits, sys.intern(department), level,
+                description, prerequisites, bool(is_active)
+            ))
+        return cls(version, tuple(records))
+
+    def __len__(self):
+        return len(self.records)
+
+    def __contains__(self, course_id):
+        return course_id in self.index
+
+    def get(self, course_id: str) -> Optional[CourseRecord]:
+        i = self.index.get(course_id)
+        return self.records[i] if i is not None else None
+
+    def level_of(self, course_id: str) -> Optional[int]:
+        i = self.index.get(course_id)
+        return self.records[i].level if i is not None else None
+
+    def department_courses(self, department: str) -> List[CourseRecord]:
+        return [self.records[i] for i in self.by_department.get(department, ())]
+
+
+_snapshot: Optional[CatalogSnapshot] = None
+_snapshot_lock = threading.Lock()
+
+
+def get_catalog_snapshot(db) -> CatalogSnapshot:
+    """Return the shared snapshot, rebuilding it if the catalog version has moved on"""
+    global _snapshot
+    version = get_catalog_version(db)
+
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+
+    # Query outside the lock (see get_prereq_graph)
+    rows = db.execute(select(*SNAPSHOT_COLUMNS).order_by(Course.course_id)).all()
+    return _install_snapshot(rows, version)
+
+
+async def get_catalog_snapshot_async(db) -> CatalogSnapshot:
+    """get_catalog_snapshot for an AsyncSession; a rebuild runs on a worker thread, off the event loop"""
+    version = await db.run_sync(get_catalog_version)
+
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+
+    rows = (await db.execute(select(*SNAPSHOT_COLUMNS).order_by(Course.course_id))).all()
+    return await run_in_threadpool(_install_snapshot, rows, version)
+
+
+def _install_snapshot(rows, version) -> CatalogSnapshot:
+    global _snapshot
+    with _snapshot_lock:
+        if _snapshot is None or _snapshot.version != version:
+            _snapshot = CatalogSnapshot.build(rows, version)
+        return _snapshot
+
+
+def invalidate_catalog_snapshot():
+    """Drop the cached snapshot so the next request rebuilds it"""
+    global _snapshot
+    with _snapshot_lock:
+        _snapshot = None
@@ -0,0 +1,129 @@
+"""
+Shared pytest fixtures: an isolated database seeded with the CS major.
+
+The database is a temporary SQLite file so that the sync session used for
+seeding (`db`) and the AsyncSession the routers use (`adb`) see the same data.
+`async def` tests are run to completion on a fresh event loop.
+"""
+
+import asyncio
+import inspect
+import json
+import os
+from functools import partial
+
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from database import bump_catalog_version, configure_sqlite
+from models import Base, Course, Major, Semester, major_required_courses, semester_courses
+from prereq_graph import invalidate_prereq_graph
+from catalog_snapshot import invalidate_catalog_snapshot
+import query_audit
+
+REQUIREMENTS_PATH = os.path.join(os.path.dirname(__file__), "data", "cs_degree_requirements.json")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    if inspect.iscoroutinefunction(pyfuncitem.obj):
+        args = {name: pyfuncitem.funcargs[name] for name in pyfuncitem._fixtureinfo.argnames}
+        asyncio.run(pyfuncitem.obj(**args))
+        return True
+
+
+@pytest.fixture
+def database_path(tmp_path):
+    return tmp_path / "test.db"
+
+
+@pytest.fixture
+def engine(database_path):
+    engine = create_engine(f"sqlite:///{database_path}", connect_args={"check_same_thread": False})
+    configure_sqlite(engine)
+    Base.metadata.create_all(engine)
+    invalidate_prereq_graph()
+    invalidate_catalog_snapshot()
+    yield engine
+    invalidate_prereq_graph()
+    invalidate_catalog_snapshot()
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def async_engine(engine, database_path):
+    # NullPool: every test runs on its own event loop, so connections must not outlive it
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{database_path}", poolclass=NullPool)
+    configure_sqlite(async_engine.sync_engine)
+    yield async_engine
+    asyncio.run(async_engine.dispose())
+
+
+@pytest.fixture
+def query_budget(async_engine):
+    """`with query_budget(max_queries=N):` fails the test if handlers in the block go over budget or repeat a query shape"""
+    return partial(query_audit.query_budget, async_engine.sync_engine)
+
+
+@pytest.fixture
+def adb(async_engine):
+    """AsyncSession for calling router handlers directly"""
+    session = AsyncSession(async_engine, autoflush=False, expire_on_commit=False)
+    yield session
+    asyncio.run(session.close())
+
+
+@pytest.fixture
+def cs_major(db):
+    """Seed the CS major and its required courses (with prerequisites) from the JSON data file"""
+    with open(REQUIREMENTS_PATH) as f:
+        requirements = json.load(f)
+
+    course_meta = requirements["course_meta"]
+    db.execute(insert(Course), [
+        {
+            "course_id": course_id,
+            "title": course_id,
+            "credits": meta["credits"],
+            "department": course_id.rstrip("0123456789"),
+            "level": int(course_id.lstrip("ABCDEFGHIJKLMNOPQRSTUVWXYZ")[0]) * 100,
+            "prerequisites": json.dumps(meta["prerequisites"]) if meta["prerequisites"] else None,
+        }
+        for course_id, meta in course_meta.items()
+    ])
+
+    major = Major(name="Computer Science", department="CS", total_credits_required=128)
+    db.add(major)
+    db.flush()
+    db.execute(insert(major_required_courses), [
+        {"major_id": major.id, "course_id": course_id, "is_core": True}
+        for course_id in course_meta
+    ])
+    bump_catalog_version(db)
+    db.commit()
+    return major
+
+
+@pytest.fixture
+def seed_semesters(db):
+    """`seed_semesters(course_ids, count)` adds `count` semesters that each hold `course_ids`"""
+    def seed(course_ids, count):
+        for i in range(count):
+            semester = Semester(name=f"Semester {i}")
+            db.add(semester)
+            db.flush()
+            db.execute(insert(semester_courses), [
+                {"semester_id": semester.id, "course_id": course_id} for course_id in course_ids
+            ])
+        db.commit()
+    return seed
@@ -1,17 +1,150 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, func, insert, make_url, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from models import (
     Base, Course, Semester, Major, Minor, StudentProfile,
-    DegreePlan, PlannedSemester
+    DegreePlan, PlannedSemester, CatalogState, course_content_hash
 )
-import requests
-import xml.etree.ElementTree as ET
+import migrations
+from prereq_expr import prerequisites_from_description
+from catalog_client import CatalogClient
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
+import io
+import os
+import sqlite3
 import time
+import uuid
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+import xml.etree.ElementTree as ET
+
+# Engine and pool settings; every value can be overridden from the environment.
+# DATABASE_URL=sqlite:///:memory: gives a fresh in-memory database shared by
+# both engines (for tests and benchmarks).
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./course_planner.db")
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", "")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # seconds to wait for a free connection
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "-1"))  # seconds; -1 never recycles
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "0") == "1"
+DB_CONNECT_TIMEOUT = float(os.getenv("DB_CONNECT_TIMEOUT", "5"))  # SQLite lock wait, seconds
+
+# Name of the shared-cache database that in-memory URLs are mapped to
+MEMORY_DATABASE_NAME = "course_planner"
+
+# Applied to every new SQLite connection. WAL lets readers proceed while a
+# write is in progress; synchronous=NORMAL is durable across crashes in WAL
+# mode. busy_timeout (from DB_CONNECT_TIMEOUT, see sqlite_pragmas) makes
+# writers wait for the lock instead of failing.
+SQLITE_PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-20000",  # ~20 MB page cache
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=134217728",  # 128 MB
+]
+
+def sqlite_pragmas():
+    """SQLITE_PRAGMAS plus the lock wait configured by DB_CONNECT_TIMEOUT"""
+    return SQLITE_PRAGMAS + [f"PRAGMA busy_timeout={int(DB_CONNECT_TIMEOUT * 1000)}"]
+
+def configure_sqlite(engine):
+    """Apply sqlite_pragmas() whenever the engine opens a connection"""
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in sqlite_pragmas():
+            cursor.execute(pragma)
+        cursor.close()
+
+def resolve_database_url(url: str) -> str:
+    """
+    Map in-memory SQLite URLs onto one named shared-cache database.
+
+    A plain `sqlite://` database is private to the connection that opened it,
+    so the sync engine, the async engine and every pooled connection would
+    each see a different, empty database.
+    """
+    if make_url(url).get_backend_name() == "sqlite" and make_url(url).database in (None, "", ":memory:"):
+        return f"sqlite:///file:{MEMORY_DATABASE_NAME}?mode=memory&cache=shared&uri=true"
+    return url
+
+def async_url_for(url: str) -> str:
+    """Async driver URL for a sync URL (SQLite goes through aiosqlite)"""
+    parsed = make_url(url)
+    if parsed.drivername == "sqlite":
+        return parsed.set(drivername="sqlite+aiosqlite").render_as_string(hide_password=False)
+    return url
 
-DATABASE_URL = "sqlite:///./course_planner.db"
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+def engine_options(url: str, is_async: bool = False) -> dict:
+    """create_engine keyword arguments for `url` from the DB_* settings"""
+    options = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+    if make_url(url).get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False, "timeout": DB_CONNECT_TIMEOUT}
+        # SQLAlchemy would pick a single-connection pool for in-memory databases
+        options["poolclass"] = AsyncAdaptedQueuePool if is_async else QueuePool
+    return options
+
+def create_engines(url: str = DATABASE_URL, async_url: str = ASYNC_DATABASE_URL):
+    """Build the (sync, async) engine pair for a database URL"""
+    url = resolve_database_url(url)
+    async_url = resolve_database_url(async_url) if async_url else async_url_for(url)
+
+    engine = create_engine(url, **engine_options(url))
+    async_engine = create_async_engine(async_url, **engine_options(async_url, is_async=True))
+
+    if engine.dialect.name == "sqlite":
+        configure_sqlite(engine)
+        configure_sqlite(async_engine.sync_engine)
+        if "mode=memory" in url:
+            # A shared in-memory database lives only while a connection to it is open
+            # (the full URI: mode/cache are query parameters, not part of the name)
+            _memory_keepers.append(sqlite3.connect(url.split(":///", 1)[1], uri=True))
+
+    return engine, async_engine
+
+def pool_stats() -> dict:
+    """Connection-pool counters for both engines"""
+    stats = {}
+    for name, pool in (("sync", engine.pool), ("async", async_engine.sync_engine.pool)):
+        stats[name] = {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": DB_MAX_OVERFLOW,
+            "timeout": pool.timeout(),
+        }
+    return stats
+
+def log_pool_stats():
+    for name, stats in pool_stats().items():
+        print(f"DB pool [{name}]: size={stats['size']} checked_out={stats['checked_out']} "
+              f"checked_in={stats['checked_in']} overflow={stats['overflow']}/{stats['max_overflow']}")
+
+_memory_keepers = []
+
+engine, async_engine = create_engines()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Request handlers use the async engine; scripts, startup and batch jobs use the sync one
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 def get_db():
     db = SessionLocal()
     try:
@@ -19,141 +152,346 @@ def get_db():
     finally:
         db.close()
 
-def fetch_uiuc_courses():
-    """Fetch courses from UIUC Course Explorer API"""
-    courses = []
-
-    # Use current year and spring semester
-    year = "2026"
-    semester = "spring"
-
-    # List of engineering and relevant departments to fetch from UIUC
-    departments = [
-        "CS",      # Computer Science
-        "ECE",     # Electrical and Computer Engineering
-        "MATH",    # Mathematics
-        "STAT",    # Statistics
-        "PHYS",    # Physics
-        "ECON",    # Economics
-        "CWL",     # Comparative and World Literature
-        "MACS",    # Media and Cinema Studies
-        "ENG"      # General Engineering
-    ]
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def get_catalog_version(db):
+    """Current catalog version (works with a Session or a Connection)"""
+    version = db.execute(select(CatalogState.version).where(CatalogState.id == 1)).scalar()
+    return version or 0
+
+def get_catalog_state(db):
+    """(instance id, version) of the catalog; unlike the version alone, unique across recreated databases"""
+    row = db.execute(select(CatalogState.instance_id, CatalogState.version).where(CatalogState.id == 1)).first()
+    return (row.instance_id or "", row.version) if row else ("", 0)
+
+def bump_catalog_version(db):
+    """Record a catalog change so cached catalog-derived structures are rebuilt"""
+    instance_id = uuid.uuid4().hex
+    result = db.execute(
+        update(CatalogState).where(CatalogState.id == 1).values(
+            version=CatalogState.version + 1,
+            instance_id=func.coalesce(CatalogState.instance_id, instance_id),  # databases from before instance ids
+        )
+    )
+    if result.rowcount == 0:
+        db.execute(insert(CatalogState).values(id=1, version=1, instance_id=instance_id))
+
+# Current term and the engineering and relevant departments to fetch from UIUC
+CATALOG_YEAR = "2026"
+CATALOG_SEMESTER = "spring"
+CATALOG_DEPARTMENTS = [
+    "CS",      # Computer Science
+    "ECE",     # Electrical and Computer Engineering
+    "MATH",    # Mathematics
+    "STAT",    # Statistics
+    "PHYS",    # Physics
+    "ECON",    # Economics
+    "CWL",     # Comparative and World Literature
+    "MACS",    # Media and Cinema Studies
+    "ENG"      # General Engineering
+]
+
+# Number of detail requests kept in flight, and rows per executemany batch
+FETCH_WINDOW_PER_WORKER = 4
+INSERT_CHUNK_SIZE = 500
+
+# Prebuilt catalog (see catalog_export.py) used to seed an empty database
+# without network access; set CATALOG_SNAPSHOT= to always crawl instead
+CATALOG_SNAPSHOT = os.getenv(
+    "CATALOG_SNAPSHOT", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "catalog_snapshot.db")
+)
+
+def _local_name(tag):
+    """Strip any XML namespace from an element tag"""
+    return tag.rsplit('}', 1)[-1]
+
+def _iter_listing_numbers(content):
+    """Incrementally parse a department listing, yielding course numbers"""
+    for _, elem in ET.iterparse(io.BytesIO(content), events=("end",)):
+        if _local_name(elem.tag) == 'course':
+            number = elem.get('id')
+            elem.clear()
+            if number:
+                yield number
+
+def _parse_course_detail(content):
+    """Incrementally parse a course detail document into its raw text fields"""
+    fields = {}
+    for _, elem in ET.iterparse(io.BytesIO(content), events=("end",)):
+        name = _local_name(elem.tag)
+        if name in ('label', 'description', 'creditHours') and name not in fields:
+            fields[name] = elem.text or ''
+        elem.clear()
+    return fields
+
+def normalize_course(dept, number, fields):
+    """Turn raw Course Explorer fields into a row for the courses table"""
+    title = fields.get('label', '').strip()
+    description = fields.get('description', '').strip()
+    credit_hours = fields.get('creditHours', '3')
+
+    # Parse credit hours (can be a range like "3 or 4")
+    try:
+        credits = int(credit_hours.split()[0])
+    except (ValueError, IndexError):
+        credits = 3
+
+    # Determine course level from course number
+    try:
+        level = int(number[0]) * 100
+    except (ValueError, IndexError):
+        level = 100
+
+    return {
+        "course_id": f"{dept}{number}",
+        "title": title[:255] if title else f"{dept} {number}",
+        "credits": credits,
+        "department": dept,
+        "level": level,
+        "description": description[:500] if description else None,
+        "prerequisites": prerequisites_from_description(description)
+    }
+
+def _fetch_department_listing(client, year, semester, dept):
+    """Return the course numbers listed for a department"""
+    try:
+        content = client.get(f"schedule/{year}/{semester}/{dept}.xml")
+        if content is None:
+            return []
+
+        return list(_iter_listing_numbers(content))
+    except Exception as e:
+        print(f"  Error fetching {dept}: {e}")
+        return []
+
+def _fetch_course_detail(client, year, semester, dept, number):
+    """Fetch a single course detail document and normalize it into a course dict"""
+    try:
+        content = client.get(f"schedule/{year}/{semester}/{dept}/{number}.xml")
+        if content is None:
+            return None
+
+        course_data = normalize_course(dept, number, _parse_course_detail(content))
+    except Exception as e:
+        print(f"  Error fetching details for {dept}{number}: {e}")
+        return None
+
+    print(f"  Added: {course_data['course_id']} - {course_data['title']}")
+    return course_data
+
+def iter_uiuc_courses(client=None, departments=None, year=CATALOG_YEAR, semester=CATALOG_SEMESTER, listed=None):
+    """
+    Stream courses from UIUC Course Explorer API.
+
+    Department listings and course details are downloaded concurrently over a
+    bounded worker pool. Pacing is handled by the client's token bucket, so
+    throughput is governed by CATALOG_REQUESTS_PER_SECOND / CATALOG_MAX_WORKERS.
+    Only a fixed window of detail requests is in flight at once, and courses
+    are yielded in listing order as soon as they are parsed, so memory use does
+    not grow with the size of the catalog.
+
+    If `listed` is a set, the ID of every course in the department listings
+    is added to it, including courses whose detail request then fails.
+    """
+    departments = departments or CATALOG_DEPARTMENTS
+    owns_client = client is None
+    client = client or CatalogClient()
+    window = client.max_workers * FETCH_WINDOW_PER_WORKER
+    fetched = 0
 
     print(f"Fetching courses from UIUC Course Explorer API for {semester} {year}...")
 
-    for dept in departments:
+    try:
+        with ThreadPoolExecutor(max_workers=client.max_workers) as pool:
+            listings = [
+                (dept, pool.submit(_fetch_department_listing, client, year, semester, dept))
+                for dept in departments
+            ]
+            pending = deque()
+
+            for dept, listing in listings:
+                numbers = listing.result()
+                if listed is not None:
+                    listed.update(f"{dept}{number}" for number in numbers)
+
+                for number in numbers:
+                    pending.append(pool.submit(_fetch_course_detail, client, year, semester, dept, number))
+
+                    while len(pending) >= window:
+                        course = pending.popleft().result()
+                        if course:
+                            fetched += 1
+                            yield course
+
+            while pending:
+                course = pending.popleft().result()
+                if course:
+                    fetched += 1
+                    yield course
+    finally:
+        if owns_client:
+            client.close()
+
+    stats = client.stats
+    print(f"\nTotal courses fetched: {fetched}")
+    print(f"  {stats['requests']} requests, {stats['not_modified']} not modified, "
+          f"{stats['bytes_downloaded']} bytes downloaded")
+
+def fetch_uiuc_courses(client=None, departments=None, year=CATALOG_YEAR, semester=CATALOG_SEMESTER):
+    """Fetch courses from UIUC Course Explorer API"""
+    return list(iter_uiuc_courses(client, departments, year, semester))
+
+def bulk_insert_courses(conn, courses, chunk_size=INSERT_CHUNK_SIZE, progress=None, commit=False):
+    """
+    Insert an iterable of course dicts in executemany batches. Returns the row count.
+
+    With `commit`, each batch is committed as soon as it is written, together
+    with a catalog version bump: a long crawl never holds the SQLite write lock
+    for more than one batch, and anything cached from a partial catalog is
+    rebuilt after the next batch.
+    `progress(inserted)` is called after every batch with the running total.
+    """
+    courses = iter(courses)
+    inserted = 0
+
+    while True:
+        chunk = list(islice(courses, chunk_size))
+        if not chunk:
+            return inserted
+
+        rows = [{**course, "content_hash": course_content_hash(course)} for course in chunk]
+        conn.execute(insert(Course.__table__), rows)
+        if commit:
+            bump_catalog_version(conn)
+            conn.commit()
+        inserted += len(rows)
+        if progress:
+            progress(inserted)
+
+def _lock_file(f, blocking):
+    """Take an exclusive lock on an open file; False if it is held elsewhere and not `blocking`"""
+    if fcntl:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            return True
+        except BlockingIOError:
+            return False
+    while True:
         try:
-            url = f"https://courses.illinois.edu/cisapp/explorer/schedule/{year}/{semester}/{dept}.xml"
-            print(f"Fetching {dept} courses from {url}")
-
-            # Add delay to avoid rate limiting
-            time.sleep(0.5)
-
-            response = requests.get(url, timeout=10)
-
-            if response.status_code == 200:
-                root = ET.fromstring(response.content)
-
-                # Parse XML and extract courses
-                for course_elem in root.findall('.//course'):
-                    course_id_elem = course_elem.get('id')
-
-                    if course_id_elem:
-                        # Get course details
-                        try:
-                            detail_url = f"https://courses.illinois.edu/cisapp/explorer/schedule/{year}/{semester}/{dept}/{course_id_elem}.xml"
-                            time.sleep(0.2)  # Small delay between course detail requests
-                            detail_response = requests.get(detail_url, timeout=10)
-
-                            if detail_response.status_code == 200:
-                                detail_root = ET.fromstring(detail_response.content)
-
-                                # Extract course information
-                                title = detail_root.findtext('label', '').strip()
-                                description = detail_root.findtext('description', '').strip()
-                                credit_hours = detail_root.findtext('creditHours', '3')
-
-                                # Parse credit hours (can be a range like "3 or 4")
-                                try:
-                                    credits = int(credit_hours.split()[0])
-                                except (ValueError, IndexError):
-                                    credits = 3
-
-                                # Determine course level from course number
-                                try:
-                                    level = int(course_id_elem[0]) * 100
-                                except (ValueError, IndexError):
-                                    level = 100
-
-                                course_data = {
-                                    "course_id": f"{dept}{course_id_elem}",
-                                    "title": title[:255] if title else f"{dept} {course_id_elem}",
-                                    "credits": credits,
-                                    "department": dept,
-                                    "level": level,
-                                    "description": description[:500] if description else None,
-                                    "prerequisites": None  # Would need additional parsing
-                                }
-
-                                courses.append(course_data)
-                                print(f"  Added: {course_data['course_id']} - {course_data['title']}")
-
-                        except Exception as e:
-                            print(f"  Error fetching details for {dept}{course_id_elem}: {e}")
-                            continue
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            if not blocking:
+                return False
+            time.sleep(0.1)
+
+@contextmanager
+def database_lock(bind, name):
+    """
+    Exclusive lock `name` shared by every process using the same SQLite file.
 
+    Yields True when another process held it and this one had to wait. Other
+    databases (including in-memory ones, private to one process) get no lock.
+    """
+    url = bind.url
+    in_memory = url.database in (None, "", ":memory:") or url.query.get("mode") == "memory"
+    if url.get_backend_name() != "sqlite" or in_memory:
+        yield False
+        return
+
+    with open(f"{url.database}.{name}.lock", "a+b") as f:
+        f.seek(0)
+        waited = not _lock_file(f, blocking=False)
+        if waited:
+            _lock_file(f, blocking=True)
+        try:
+            yield waited
+        finally:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_UN)
             else:
-                print(f"  Failed to fetch {dept}: Status {response.status_code}")
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
 
-        except Exception as e:
-            print(f"  Error fetching {dept}: {e}")
-            continue
+def create_schema(bind=None):
+    """Create missing tables and apply migrations (one process at a time, as every server worker runs this)"""
+    bind = bind or engine
+    with database_lock(bind, "schema"):
+        Base.metadata.create_all(bind=bind)
+        migrations.upgrade(bind)
 
-    print(f"\nTotal courses fetched: {len(courses)}")
-    return courses
+def init_db(sync=None, progress=None):
+    """Create the schema and seed the course catalog (see seed_catalog)"""
+    create_schema()
+    seed_catalog(sync=sync, progress=progress)
 
-def init_db():
-    Base.metadata.create_all(bind=engine)
+def seed_catalog(sync=None, progress=None, bind=None):
+    """
+    Seed the course catalog of a database whose schema is up to date.
 
-    db = SessionLocal()
+    An empty database is seeded from the CATALOG_SNAPSHOT file if there is
+    one, otherwise from the API. When courses already exist they
+    are left alone, unless `sync` (or CATALOG_SYNC_ON_STARTUP=1) asks for an
+    incremental sync against the upstream catalog. `progress(inserted)` is
+    called as seeded courses are written.
 
-    existing_courses = db.query(Course).first()
-    if existing_courses:
-        print("Database already contains courses. Skipping initialization.")
-        db.close()
+    Every server worker runs this at startup. Only one of them seeds (or
+    syncs); the others wait for it and then find the catalog in place.
+    """
+    bind = bind or engine
+    if sync is None:
+        sync = os.getenv("CATALOG_SYNC_ON_STARTUP") == "1"
+
+    with database_lock(bind, "seed") as waited:
+        with bind.connect() as conn:
+            existing_courses = conn.execute(select(Course.course_id).limit(1)).first()
+
+        if existing_courses and waited:
+            print("Catalog was seeded or synced by another process.")
+        elif existing_courses and sync:
+            from sync_catalog import sync_catalog
+            sync_catalog(bind=bind)
+        elif existing_courses:
+            print("Database already contains courses. Skipping initialization.")
+        else:
+            _seed_empty_catalog(bind, progress)
+
+def _seed_empty_catalog(bind, progress):
+    """Fill an empty courses table from the snapshot, the API or the fallback sample"""
+    if CATALOG_SNAPSHOT and os.path.exists(CATALOG_SNAPSHOT):
+        from catalog_export import import_snapshot
+        meta = import_snapshot(CATALOG_SNAPSHOT, bind=bind)
+        if progress:
+            progress(int(meta["rows.courses"]))
+        print(f"Seeded {meta['rows.courses']} courses from catalog snapshot {CATALOG_SNAPSHOT} "
+              f"(taken {meta['created_at']})")
         return
 
-    # Fetch courses from UIUC API
+    # Stream courses from UIUC API into the table, committing every chunk (with
+    # a version bump) so API writes aren't locked out while the crawl runs and
+    # readers' catalog caches follow the courses as they arrive.
+    added = 0
+
+    def committed(inserted):
+        nonlocal added
+        added = inserted
+        if progress:
+            progress(inserted)
+
     try:
-        uiuc_courses = fetch_uiuc_courses()
-
-        if not uiuc_courses:
-            print("No courses fetched from API, using fallback sample data...")
-            # Fallback to sample courses if API fails
-            uiuc_courses = [
-                {
-                    "course_id": "CS101",
-                    "title": "Intro to Computing",
-                    "credits": 3,
-                    "department": "CS",
-                    "level": 100,
-                    "description": "Introduction to computer science concepts and programming",
-                    "prerequisites": None
-                },
-                {
-                    "course_id": "CS125",
-                    "title": "Intro to Computer Science",
-                    "credits": 4,
-                    "department": "CS",
-                    "level": 100,
-                    "description": "Introduction to programming and computer science",
-                    "prerequisites": None
-                },
-            ]
+        with bind.connect() as conn:
+            bulk_insert_courses(conn, iter_uiuc_courses(), progress=committed, commit=True)
     except Exception as e:
         print(f"Error fetching courses from API: {e}")
-        print("Using fallback sample data...")
+        if added:
+            print(f"Keeping the {added} courses stored before the error; run sync_catalog.py to finish.")
+
+    if not added:
+        print("WARNING: No courses fetched from API and no catalog snapshot found, "
+              "using fallback sample data...")
+        # Fallback to sample courses if API fails
         uiuc_courses = [
             {
                 "course_id": "CS101",
@@ -164,12 +502,18 @@ def init_db():
                 "description": "Introduction to computer science concepts and programming",
                 "prerequisites": None
             },
+            {
+                "course_id": "CS125",
+                "title": "Intro to Computer Science",
+                "credits": 4,
+                "department": "CS",
+                "level": 100,
+                "description": "Introduction to programming and computer science",
+                "prerequisites": None
+            },
         ]
+        with bind.begin() as conn:
+            added = bulk_insert_courses(conn, uiuc_courses)
+            bump_catalog_version(conn)
 
-    for course_data in uiuc_courses:
-        course = Course(**course_data)
-        db.add(course)
-
-    db.commit()
-    print(f"Successfully added {len(uiuc_courses)} courses to database!")
-    db.close()
+    print(f"Successfully added {added} courses to database!")
@@ -0,0 +1,39 @@
+"""
+Fast JSON encoding for large API responses.
+
+Uses orjson when it is installed and falls back to the stdlib encoder
+otherwise. The fast path is opt-in with FAST_SERIALIZATION=1: list endpoints
+then build plain row dicts from Core queries and encode them here, skipping
+ORM instances and Pydantic validation entirely.
+"""
+
+import json
+import os
+
+from fastapi import Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+FAST_SERIALIZATION = os.getenv("FAST_SERIALIZATION", "0") == "1"
+
+
+def _default(obj):
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(payload) -> bytes:
+    """Encode a payload of plain rows (and Pydantic models) to compact UTF-8 JSON"""
+    if orjson is not None:
+        return orjson.dumps(payload, default=_default)
+    return json.dumps(payload, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def json_response(payload, status_code: int = 200, headers: dict = None) -> Response:
+    return Response(content=dumps(payload), status_code=status_code, headers=headers,
+                    media_type="application/json")
@@ -0,0 +1,29 @@
+"""
+Eager-loading strategies for endpoints that return nested relationships.
+
+Response models serialize `courses`, `minors`, `major` and
+`planned_semesters` from lazy relationships, which would otherwise issue one
+query per parent row. Each option set below loads a response's full object
+graph in a fixed number of queries, whatever the number of rows.
+"""
+
+from sqlalchemy.orm import joinedload, selectinload
+
+from models import DegreePlan, PlannedSemester, Semester, StudentProfile
+
+# SemesterSchema: semester -> courses
+SEMESTER_OPTIONS = (
+    selectinload(Semester.courses),
+)
+
+# StudentProfileSchema: profile -> major, minors, completed_courses
+STUDENT_PROFILE_OPTIONS = (
+    joinedload(StudentProfile.major),
+    selectinload(StudentProfile.minors),
+    selectinload(StudentProfile.completed_courses),
+)
+
+# DegreePlanSchema: plan -> planned_semesters -> courses
+DEGREE_PLAN_OPTIONS = (
+    selectinload(DegreePlan.planned_semesters).selectinload(PlannedSemester.courses),
+)
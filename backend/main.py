@@ -1,6 +1,10 @@
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from database import init_db
+from fastapi.middleware.gzip import GZipMiddleware
+from database import async_engine, create_schema, engine, pool_stats
+from metrics import instrument_engine, metrics_endpoint, metrics_middleware
+from bootstrap import bootstrap_state, start_background_bootstrap
 from routers import courses, semesters, degree_planning
 
 app = FastAPI(title="UIUC Course Planner API")
@@ -11,16 +15,46 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+# Compress large (catalog-sized) responses
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+# Outermost, so latency includes compression; SQL is attributed per request
+app.middleware("http")(metrics_middleware)
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+
 app.include_router(courses.router, prefix="/api/courses", tags=["courses"])
 app.include_router(semesters.router, prefix="/api/semesters", tags=["semesters"])
 app.include_router(degree_planning.router, prefix="/api/degree-planning", tags=["degree-planning"])
 
 @app.on_event("startup")
 async def startup_event():
-    init_db()
+    # Tables must exist before the first request. Seeding can crawl the whole
+    # upstream catalog, so it runs in the background and the server starts
+    # answering (and health-checking) right away
+    create_schema()
+    start_background_bootstrap()
 
 @app.get("/")
 async def root():
     return {"message": "UIUC Course Planner API"}
+
+@app.get("/healthz")
+async def healthz():
+    """Liveness: the process is up and serving requests"""
+    return {"status": "ok"}
+
+@app.get("/readyz")
+async def readyz():
+    """Readiness: the catalog is loaded. 503 with bootstrap progress until then."""
+    return JSONResponse(bootstrap_state.as_dict(), status_code=200 if bootstrap_state.ready else 503)
+
+app.add_api_route("/metrics", metrics_endpoint, methods=["GET"], include_in_schema=False)
+
+@app.get("/api/pool-stats")
+async def get_pool_stats():
+    """Connection-pool usage of the sync and async engines"""
+    return pool_stats()
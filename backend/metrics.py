@@ -0,0 +1,181 @@
+"""
+In-process request and SQL metrics, exposed in Prometheus text format.
+
+A middleware times every request and files it under its route template
+(`/api/semesters/{semester_id}`, not the concrete path). SQLAlchemy cursor
+events add each statement's count and duration to the request that issued it,
+found through a context variable, so the numbers are per request even with
+async handlers and the threadpool. GET /metrics renders everything; no
+external collector is needed.
+
+Set SLOW_REQUEST_MS to log requests slower than that, with their slowest SQL,
+and QUERY_AUDIT=1 to flag repeated statement shapes per request (see query_audit).
+"""
+
+import contextvars
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+from fastapi import Request
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import event
+
+import query_audit
+
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "0"))  # 0 disables the slow-request log
+SLOW_REQUEST_SQL_LIMIT = 5
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+class RequestStats:
+    """SQL issued while handling one request"""
+    __slots__ = ("statements", "db_seconds", "queries")
+
+    def __init__(self, keep_queries=False):
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.queries = [] if keep_queries else None  # (seconds, statement)
+
+
+current_request = contextvars.ContextVar("current_request", default=None)
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Per-route histograms and counters, guarded by one lock"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency = defaultdict(lambda: Histogram(LATENCY_BUCKETS))  # (method, route, status)
+        self.statements = defaultdict(lambda: Histogram(STATEMENT_BUCKETS))  # (method, route)
+        self.db_seconds = defaultdict(float)  # (method, route)
+
+    def record(self, method, route, status, seconds, stats: RequestStats):
+        with self._lock:
+            self.latency[(method, route, str(status))].observe(seconds)
+            self.statements[(method, route)].observe(stats.statements)
+            self.db_seconds[(method, route)] += stats.db_seconds
+
+    def reset(self):
+        with self._lock:
+            self.latency.clear()
+            self.statements.clear()
+            self.db_seconds.clear()
+
+    def render(self) -> str:
+        """Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            _render_histogram(lines, "http_request_duration_seconds", "Request latency by route",
+                              ("method", "route", "status"), self.latency)
+            _render_histogram(lines, "db_statements_per_request", "SQL statements issued per request",
+                              ("method", "route"), self.statements)
+            lines.append("# HELP db_duration_seconds_total Time spent executing SQL, by route")
+            lines.append("# TYPE db_duration_seconds_total counter")
+            for labels, total in sorted(self.db_seconds.items()):
+                lines.append(f"db_duration_seconds_total{_labels(('method', 'route'), labels)} {total:.6f}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(names, values, extra=""):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _render_histogram(lines, name, help_text, label_names, histograms):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for labels, histogram in sorted(histograms.items()):
+        cumulative = 0
+        for bound, count in zip(histogram.buckets + ("+Inf",), histogram.counts):
+            cumulative += count
+            le = f'le="{bound}"'
+            lines.append(f"{name}_bucket{_labels(label_names, labels, le)} {cumulative}")
+        lines.append(f"{name}_sum{_labels(label_names, labels)} {histogram.sum:.6f}")
+        lines.append(f"{name}_count{_labels(label_names, labels)} {histogram.count}")
+
+
+registry = MetricsRegistry()
+
+
+def instrument_engine(engine):
+    """Attribute every statement run on `engine` (a sync Engine) to the current request"""
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        stats = current_request.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.db_seconds += elapsed
+            if stats.queries is not None:
+                stats.queries.append((elapsed, statement))
+
+
+def route_template(request: Request) -> str:
+    """The matched route's path template, including any router prefix"""
+    # Newer FastAPI resolves included routers lazily; the prefixed template is
+    # then on the effective route context rather than on the route itself
+    context = request.scope.get("fastapi", {}).get("effective_route_context")
+    route = request.scope.get("route")
+    return getattr(context, "path_format", None) or getattr(route, "path", None) or "unmatched"
+
+
+async def metrics_middleware(request: Request, call_next):
+    stats = RequestStats(keep_queries=SLOW_REQUEST_MS > 0 or query_audit.QUERY_AUDIT)
+    token = current_request.set(stats)
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        elapsed = time.perf_counter() - started
+        current_request.reset(token)
+        route = route_template(request)
+        registry.record(request.method, route, status, elapsed, stats)
+
+        if SLOW_REQUEST_MS and elapsed * 1000 >= SLOW_REQUEST_MS:
+            log_slow_request(request.method, request.url.path, route, elapsed, stats)
+        if query_audit.QUERY_AUDIT:
+            query_audit.report_repeated(f"{request.method} {route}", [statement for _, statement in stats.queries])
+
+
+def log_slow_request(method, path, route, elapsed, stats: RequestStats):
+    print(f"SLOW REQUEST {method} {path} ({route}): {elapsed * 1000:.1f} ms, "
+          f"{stats.statements} statements, {stats.db_seconds * 1000:.1f} ms in SQL")
+    for seconds, statement in sorted(stats.queries, reverse=True)[:SLOW_REQUEST_SQL_LIMIT]:
+        print(f"  {seconds * 1000:8.1f} ms  {' '.join(statement.split())}")
+
+
+async def metrics_endpoint():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
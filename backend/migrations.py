@@ -0,0 +1,80 @@
+"""
+Lightweight in-place schema upgrades for existing course_planner.db files.
+
+`Base.metadata.create_all` only creates missing tables, so columns added to
+existing tables after a database was first created are added here, along
+with SQLite-specific objects the ORM metadata doesn't describe.
+"""
+
+from sqlalchemy import inspect, text
+
+from models import (
+    Base, semester_courses, student_completed_courses, major_required_courses,
+    minor_required_courses, student_minors, planned_semester_courses
+)
+from search import ensure_search_index
+
+# (table, column, DDL type/default) added after the initial schema
+ADDED_COLUMNS = [
+    ("courses", "content_hash", "VARCHAR"),
+    ("courses", "is_active", "BOOLEAN NOT NULL DEFAULT 1"),
+    ("catalog_state", "instance_id", "VARCHAR"),
+]
+
+# Link tables created before they had composite primary keys
+JUNCTION_TABLES = [
+    semester_courses, student_completed_courses, major_required_courses,
+    minor_required_courses, student_minors, planned_semester_courses,
+]
+
+
+def rebuild_junction_table(conn, table):
+    """
+    Recreate a link table with its primary key, dropping duplicate and NULL links.
+
+    SQLite can't add a primary key to an existing table, so the old table is
+    renamed, the new one created from the model, and the first copy of every
+    link carried over.
+    """
+    old_name = f"{table.name}_old"
+    columns = ", ".join(c.name for c in table.columns)
+    keys = " AND ".join(f"{c.name} IS NOT NULL" for c in table.primary_key.columns)
+
+    conn.execute(text(f"ALTER TABLE {table.name} RENAME TO {old_name}"))
+    table.create(conn)
+    conn.execute(text(
+        f"INSERT OR IGNORE INTO {table.name} ({columns}) "
+        f"SELECT {columns} FROM {old_name} WHERE {keys} ORDER BY rowid"
+    ))
+    conn.execute(text(f"DROP TABLE {old_name}"))
+
+
+def upgrade(engine):
+    """Bring an existing database up to the current schema."""
+    inspector = inspect(engine)
+    tables = set(inspector.get_table_names())
+
+    with engine.begin() as conn:
+        for table, column, ddl in ADDED_COLUMNS:
+            if table not in tables:
+                continue
+
+            existing = {c["name"] for c in inspector.get_columns(table)}
+            if column not in existing:
+                print(f"Migrating: adding {table}.{column}")
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+
+        for table in JUNCTION_TABLES:
+            if table.name in tables and not inspector.get_pk_constraint(table.name)["constrained_columns"]:
+                print(f"Migrating: adding primary key to {table.name}")
+                rebuild_junction_table(conn, table)
+
+        # create_all skips indexes on tables that already exist
+        for table in Base.metadata.sorted_tables:
+            if table.name in tables:
+                for index in table.indexes:
+                    index.create(conn, checkfirst=True)
+
+    # Full-text index and the triggers that keep it in sync with courses
+    if "courses" in tables:
+        ensure_search_index(engine)
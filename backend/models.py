@@ -1,41 +1,47 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Table, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, Table, Boolean, Index
 from sqlalchemy.orm import relationship, declarative_base
 from pydantic import BaseModel
 from typing import List, Optional
+import hashlib
+import json
 
 Base = declarative_base()
 
 semester_courses = Table(
     'semester_courses',
     Base.metadata,
-    Column('semester_id', Integer, ForeignKey('semesters.id')),
-    Column('course_id', String, ForeignKey('courses.course_id'))
+    Column('semester_id', Integer, ForeignKey('semesters.id'), primary_key=True),
+    Column('course_id', String, ForeignKey('courses.course_id'), primary_key=True),
+    Index('ix_semester_courses_course_id', 'course_id')
 )
 
 # Junction table for student's completed courses
 student_completed_courses = Table(
     'student_completed_courses',
     Base.metadata,
-    Column('student_id', Integer, ForeignKey('student_profiles.id')),
-    Column('course_id', String, ForeignKey('courses.course_id'))
+    Column('student_id', Integer, ForeignKey('student_profiles.id'), primary_key=True),
+    Column('course_id', String, ForeignKey('courses.course_id'), primary_key=True),
+    Index('ix_student_completed_courses_course_id', 'course_id')
 )
 
 # Junction table for major requirements
 major_required_courses = Table(
     'major_required_courses',
     Base.metadata,
-    Column('major_id', Integer, ForeignKey('majors.id')),
-    Column('course_id', String, ForeignKey('courses.course_id')),
-    Column('is_core', Boolean, default=True)  # True for core, False for elective
+    Column('major_id', Integer, ForeignKey('majors.id'), primary_key=True),
+    Column('course_id', String, ForeignKey('courses.course_id'), primary_key=True),
+    Column('is_core', Boolean, default=True),  # True for core, False for elective
+    Index('ix_major_required_courses_course_id', 'course_id')
 )
 
 # Junction table for minor requirements
 minor_required_courses = Table(
     'minor_required_courses',
     Base.metadata,
-    Column('minor_id', Integer, ForeignKey('minors.id')),
-    Column('course_id', String, ForeignKey('courses.course_id')),
-    Column('is_core', Boolean, default=True)
+    Column('minor_id', Integer, ForeignKey('minors.id'), primary_key=True),
+    Column('course_id', String, ForeignKey('courses.course_id'), primary_key=True),
+    Column('is_core', Boolean, default=True),
+    Index('ix_minor_required_courses_course_id', 'course_id')
 )
 
 class Course(Base):
@@ -44,13 +50,32 @@ class Course(Base):
     course_id = Column(String, primary_key=True)
     title = Column(String, nullable=False)
     credits = Column(Integer, nullable=False)
-    department = Column(String, nullable=False)
-    level = Column(Integer, nullable=False)
+    department = Column(String, nullable=False, index=True)
+    level = Column(Integer, nullable=False, index=True)
     description = Column(String)
     prerequisites = Column(String)
+    content_hash = Column(String)  # Hash of the upstream catalog fields, used by catalog sync
+    is_active = Column(Boolean, nullable=False, default=True, server_default="1")  # False once removed upstream
 
     semesters = relationship("Semester", secondary=semester_courses, back_populates="courses")
 
+# Fields that come from the upstream catalog (prerequisites are maintained locally)
+COURSE_CONTENT_FIELDS = ("title", "credits", "department", "level", "description")
+
+def course_content_hash(course_data):
+    """Stable hash of a course dict's upstream catalog fields"""
+    values = [course_data.get(field) for field in COURSE_CONTENT_FIELDS]
+    return hashlib.sha1(json.dumps(values).encode()).hexdigest()
+
+class CatalogState(Base):
+    """Single-row table holding a version counter that every catalog write bumps"""
+    __tablename__ = "catalog_state"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    # Random id of this database's catalog, so versions of a recreated database don't repeat
+    instance_id = Column(String)
+
 class Semester(Base):
     __tablename__ = "semesters"
 
@@ -99,24 +124,27 @@ class StudentProfile(Base):
 student_minors = Table(
     'student_minors',
     Base.metadata,
-    Column('student_id', Integer, ForeignKey('student_profiles.id')),
-    Column('minor_id', Integer, ForeignKey('minors.id'))
+    Column('student_id', Integer, ForeignKey('student_profiles.id'), primary_key=True),
+    Column('minor_id', Integer, ForeignKey('minors.id'), primary_key=True),
+    Index('ix_student_minors_minor_id', 'minor_id')
 )
 
 class DegreePlan(Base):
     __tablename__ = "degree_plans"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    student_id = Column(Integer, ForeignKey('student_profiles.id'), nullable=False)
+    student_id = Column(Integer, ForeignKey('student_profiles.id'), nullable=False, index=True)
 
     student = relationship("StudentProfile", back_populates="degree_plan")
-    planned_semesters = relationship("PlannedSemester", back_populates="degree_plan")
+    planned_semesters = relationship(
+        "PlannedSemester", back_populates="degree_plan", order_by="PlannedSemester.semester_order"
+    )
 
 class PlannedSemester(Base):
     __tablename__ = "planned_semesters"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    degree_plan_id = Column(Integer, ForeignKey('degree_plans.id'), nullable=False)
+    degree_plan_id = Column(Integer, ForeignKey('degree_plans.id'), nullable=False, index=True)
     semester_name = Column(String, nullable=False)  # e.g., "Fall 2025"
     semester_order = Column(Integer, nullable=False)  # 1, 2, 3, etc.
 
@@ -127,8 +155,9 @@ class PlannedSemester(Base):
 planned_semester_courses = Table(
     'planned_semester_courses',
     Base.metadata,
-    Column('planned_semester_id', Integer, ForeignKey('planned_semesters.id')),
-    Column('course_id', String, ForeignKey('courses.course_id'))
+    Column('planned_semester_id', Integer, ForeignKey('planned_semesters.id'), primary_key=True),
+    Column('course_id', String, ForeignKey('courses.course_id'), primary_key=True),
+    Index('ix_planned_semester_courses_course_id', 'course_id')
 )
 
 class CourseSchema(BaseModel):
@@ -143,6 +172,21 @@ class CourseSchema(BaseModel):
     class Config:
         from_attributes = True
 
+class CourseListItem(BaseModel):
+    """Course with every field optional, so list responses can carry a `fields=` projection"""
+    course_id: str
+    title: Optional[str] = None
+    credits: Optional[int] = None
+    department: Optional[str] = None
+    level: Optional[int] = None
+    description: Optional[str] = None
+    prerequisites: Optional[str] = None
+
+class CourseSearchResult(CourseSchema):
+    title_highlight: str  # Title with matched terms wrapped in <mark>
+    description_snippet: Optional[str] = None
+    score: float  # bm25 rank, lower is better
+
 class SemesterSchema(BaseModel):
     id: int
     name: str
@@ -210,6 +254,10 @@ class StudentProfileSchema(BaseModel):
     class Config:
         from_attributes = True
 
+class StudentProfileCreateResult(StudentProfileSchema):
+    unknown_minor_ids: List[int] = []  # Requested minors that don't exist
+    unknown_course_ids: List[str] = []  # Completed-course equivalents not in the catalog
+
 class PlannedSemesterSchema(BaseModel):
     id: int
     semester_name: str
@@ -232,3 +280,15 @@ class GenerateDegreePlanRequest(BaseModel):
     start_semester: str  # e.g., "Fall 2025"
     start_year: int
     courses_per_semester: int = 4  # Default to 4 courses per semester
+
+class BatchGenerateDegreePlanRequest(BaseModel):
+    student_ids: List[int]
+    start_semester: str  # e.g., "Fall"
+    start_year: int
+    courses_per_semester: int = 4
+
+class BatchDegreePlanResult(BaseModel):
+    plans_generated: int
+    missing_student_ids: List[int] = []
+    elapsed_seconds: float
+    plans_per_second: float
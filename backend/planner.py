@@ -0,0 +1,256 @@
+"""
+Pure degree-plan scheduling, independent of the database session.
+
+Each remaining course's compiled prerequisite clauses (see prereq_expr) are
+narrowed to the student: clauses already met by completed courses are dropped,
+and the rest become pairs of bitmasks over the remaining courses. A course is
+ready once every clause has a course scheduled in an earlier semester (or, for
+concurrent requirements, in the same one), which is a couple of integer ANDs per
+clause. Ready courses wait in a heap ordered by critical-path length (the
+longest chain of remaining courses that depend on it) and then by course
+level, so deep prerequisite chains are started first.
+"""
+
+import heapq
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, List
+
+
+def schedule_courses(
+    graph,
+    remaining_ids: Iterable[str],
+    completed_ids: Iterable[str],
+    levels: Dict[str, int],
+    courses_per_semester: int,
+) -> List[List[str]]:
+    """
+    Split the remaining courses into semesters of at most `courses_per_semester`.
+
+    `graph` is a PrerequisiteGraph. A course is ready once each of its
+    prerequisite clauses is met by a completed course, a course scheduled in an
+    earlier semester or, for concurrent prerequisites, one in the same semester.
+    Courses whose prerequisites can never be met (cycles, or clauses naming only
+    courses outside both the completed and remaining sets) are only placed when
+    nothing else is ready, lowest level first, which keeps the planner from
+    stalling.
+    """
+    if courses_per_semester < 1:
+        return []
+
+    remaining_ids = list(dict.fromkeys(remaining_ids))
+    completed = set(completed_ids)
+    position = {course_id: i for i, course_id in enumerate(remaining_ids)}
+    n = len(remaining_ids)
+
+    # Per course: [(prior_mask, concurrent_mask)] over positions in remaining_ids
+    requirements = [[] for _ in range(n)]
+    blocked = [False] * n
+    dependents = [[] for _ in range(n)]
+
+    course_ids = graph.course_ids
+    for i, course_id in enumerate(remaining_ids):
+        node = graph.index.get(course_id)
+        if node is None:
+            continue
+
+        mentioned = 0
+        for clause in graph.clauses[node]:
+            masks = [0, 0]  # prior, concurrent
+            for kind, prereq_nodes in enumerate(clause):
+                for p in prereq_nodes:
+                    prereq_id = course_ids[p]
+                    if prereq_id in completed:
+                        break
+                    j = position.get(prereq_id)
+                    if j is not None and j != i:
+                        masks[kind] |= 1 << j
+                else:
+                    continue
+                break  # met by a completed course
+            else:
+                clause_mask = masks[0] | masks[1]
+                if not clause_mask:
+                    blocked[i] = True
+                    continue
+                requirements[i].append((masks[0], masks[1]))
+                mentioned |= clause_mask
+
+        while mentioned:
+            low = mentioned & -mentioned
+            dependents[low.bit_length() - 1].append(i)
+            mentioned ^= low
+
+    def is_ready(i, done, current):
+        available = done | current
+        return all(prior & done or concurrent & available for prior, concurrent in requirements[i])
+
+    # Critical path: longest chain of remaining dependents, computed in reverse topological order
+    order = []
+    pending = [0] * n
+    for i in range(n):
+        for d in dependents[i]:
+            pending[d] += 1
+    stack = [i for i in range(n) if pending[i] == 0]
+    while stack:
+        i = stack.pop()
+        order.append(i)
+        for d in dependents[i]:
+            pending[d] -= 1
+            if pending[d] == 0:
+                stack.append(d)
+
+    critical_path = [1] * n
+    for i in reversed(order):
+        for d in dependents[i]:
+            critical_path[i] = max(critical_path[i], critical_path[d] + 1)
+
+    def priority(i):
+        return (-critical_path[i], levels.get(remaining_ids[i], 0), i)
+
+    queued = [not blocked[i] and not requirements[i] for i in range(n)]
+    ready = [priority(i) for i in range(n) if queued[i]]
+    heapq.heapify(ready)
+
+    # Fallback ordering for breaking deadlocks, with lazy deletion of scheduled courses
+    fallback = [(levels.get(remaining_ids[i], 0), -critical_path[i], i) for i in range(n)]
+    heapq.heapify(fallback)
+
+    scheduled = [False] * n
+    done = 0
+    left = n
+    semesters = []
+
+    def unlock(i, current):
+        """Queue dependents of `i` that its scheduling made ready"""
+        for d in dependents[i]:
+            if not queued[d] and not scheduled[d] and not blocked[d] and is_ready(d, done, current):
+                queued[d] = True
+                heapq.heappush(ready, priority(d))
+
+    while left:
+        batch = []
+        current = 0
+        while ready and len(batch) < courses_per_semester:
+            i = heapq.heappop(ready)[-1]
+            batch.append(i)
+            current |= 1 << i
+            # Courses that may be taken concurrently with i can join this semester
+            unlock(i, current)
+
+        if not batch:
+            # No courses available - either a cycle in prereqs or prerequisites that are never met.
+            # Take the lowest level courses to break the deadlock.
+            while fallback and len(batch) < courses_per_semester:
+                i = heapq.heappop(fallback)[-1]
+                if not scheduled[i]:
+                    batch.append(i)
+                    scheduled[i] = True
+
+        if not batch:
+            break
+
+        for i in batch:
+            scheduled[i] = True
+            done |= 1 << i
+        left -= len(batch)
+
+        # Courses unlocked by this semester become available from the next one
+        for i in batch:
+            unlock(i, 0)
+
+        semesters.append([remaining_ids[i] for i in batch])
+
+    return semesters
+
+
+def semester_names(start_semester: str, start_year: int, count: int) -> List[str]:
+    """Consecutive Fall/Spring semester names starting at the given term"""
+    names = []
+    year = start_year
+    semester_index = 0 if start_semester == "Fall" else 1
+
+    for _ in range(count):
+        names.append(f"{('Fall', 'Spring')[semester_index]} {year}")
+
+        # Move to next semester
+        semester_index = (semester_index + 1) % 2
+        if semester_index == 1:  # Moving from Fall to Spring increments the year
+            year += 1
+
+    return names
+
+
+# Graph shared by process-pool workers, installed once per worker by _init_worker
+_worker_graph = None
+
+# Workers are started from a clean server process rather than forked from a
+# multithreaded one, where another thread may be holding a lock
+_MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+# One pool per process, reused across calls until the graph or worker count changes
+_pool = None
+_pool_graph = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _init_worker(graph):
+    global _worker_graph
+    _worker_graph = graph
+
+
+def _plan(graph, args):
+    student_id, remaining_ids, completed_ids, levels, courses_per_semester = args
+    return student_id, schedule_courses(graph, remaining_ids, completed_ids, levels, courses_per_semester)
+
+
+def _plan_in_worker(args):
+    return _plan(_worker_graph, args)
+
+
+def _get_pool(graph, max_workers):
+    """The shared process pool for `graph`; must be called with _pool_lock held"""
+    global _pool, _pool_graph, _pool_workers
+    if _pool is None or _pool_graph is not graph or _pool_workers != max_workers:
+        if _pool is not None:
+            # Work already submitted by other callers still finishes
+            _pool.shutdown(wait=False)
+        _pool = ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=_MP_CONTEXT, initializer=_init_worker, initargs=(graph,)
+        )
+        _pool_graph = graph
+        _pool_workers = max_workers
+    return _pool
+
+
+def plan_many(graph, inputs, courses_per_semester: int, max_workers: int = 1, chunksize: int = 16):
+    """
+    Schedule many students at once.
+
+    `inputs` is a list of (student_id, remaining_ids, completed_ids, levels)
+    tuples. With max_workers > 1 the work is fanned out over a process pool
+    whose workers receive the graph once, at start-up; the pool is kept for
+    later calls with the same graph. Returns {student_id: semesters}.
+    """
+    tasks = [(*student, courses_per_semester) for student in inputs]
+
+    if max_workers <= 1 or len(tasks) < 2:
+        return dict(_plan(graph, task) for task in tasks)
+
+    global _pool
+    with _pool_lock:
+        # map() submits every task before returning, so the pool can't be replaced underneath it
+        pool = _get_pool(graph, max_workers)
+        results = pool.map(_plan_in_worker, tasks, chunksize=chunksize)
+    try:
+        return dict(results)
+    except BrokenProcessPool:
+        with _pool_lock:
+            if _pool is pool:
+                _pool = None
+        raise
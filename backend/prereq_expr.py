@@ -0,0 +1,399 @@
+"""
+Boolean prerequisite expressions: parsing, storage and compilation.
+
+Prerequisites are stored in `Course.prerequisites` as JSON. A plain list means
+"all of" (the original format, still accepted everywhere); richer requirements
+use nested objects:
+
+    ["CS124", "CS128"]                                    CS 124 and CS 128
+    {"and": ["CS225", {"or": ["MATH225", "MATH257"]}]}    CS 225 and (MATH 225 or MATH 257)
+    {"concurrent": "CS173"}                               CS 173, before or in the same semester
+
+Catalog text such as "CS 225; one of MATH 225 or MATH 257. Credit or
+concurrent registration in CS 173." is parsed into the same structure.
+
+For evaluation an expression is compiled once (and cached by its stored text)
+into conjunctive normal form: a tuple of clauses, each satisfied by any one of
+its courses taken earlier or, for concurrent ones, in the same semester.
+"""
+
+import json
+import re
+from functools import lru_cache
+from itertools import product
+from typing import List, Optional, Tuple
+
+# Normalized nodes: ("course", id), ("concurrent", id), ("and", children), ("or", children)
+Node = tuple
+
+# A compiled clause: (courses that satisfy it if taken earlier, courses that also may be concurrent)
+Clause = Tuple[Tuple[str, ...], Tuple[str, ...]]
+
+MAX_CLAUSES = 256  # guard against CNF blow-up on pathological OR-of-AND expressions
+
+
+class PrerequisiteSyntaxError(ValueError):
+    pass
+
+
+def course(course_id: str) -> Node:
+    return ("course", course_id)
+
+
+def all_of(*children) -> Node:
+    return _combine("and", children)
+
+
+def any_of(*children) -> Node:
+    return _combine("or", children)
+
+
+def concurrent(node: Node) -> Node:
+    """Allow every course in `node` to be taken in the same semester"""
+    kind = node[0]
+    if kind in ("course", "concurrent"):
+        return ("concurrent", node[1])
+    return _combine(kind, [concurrent(child) for child in node[1]])
+
+
+def _combine(kind, children) -> Optional[Node]:
+    """Flatten nested same-kind nodes, drop empties and duplicates, unwrap single children"""
+    flat = []
+    for child in children:
+        if child is None:
+            continue
+        for grandchild in (child[1] if child[0] == kind else (child,)):
+            if grandchild not in flat:
+                flat.append(grandchild)
+    if not flat:
+        return None
+    if len(flat) == 1:
+        return flat[0]
+    return (kind, tuple(flat))
+
+
+# --- Stored JSON form --------------------------------------------------------------------------
+
+def from_json(value) -> Optional[Node]:
+    """Normalize a decoded JSON prerequisite value (list = all of)"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return course(value.strip()) if value.strip() else None
+    if isinstance(value, list):
+        return all_of(*(from_json(item) for item in value))
+    if isinstance(value, dict) and len(value) == 1:
+        (kind, body), = value.items()
+        if kind == "and":
+            return all_of(*(from_json(item) for item in body))
+        if kind == "or":
+            return any_of(*(from_json(item) for item in body))
+        if kind == "concurrent":
+            inner = from_json(body)
+            return concurrent(inner) if inner else None
+    raise PrerequisiteSyntaxError(f"Unrecognized prerequisite value: {value!r}")
+
+
+def to_json(node: Optional[Node]):
+    """JSON-ready form; an all-of over plain courses stays a flat list"""
+    if node is None:
+        return None
+    kind, body = node
+    if kind == "course":
+        return body
+    if kind == "concurrent":
+        return {"concurrent": body}
+    if kind == "and" and all(child[0] == "course" for child in body):
+        return [child[1] for child in body]
+    return {kind: [to_json(child) for child in body]}
+
+
+def dump_prerequisites(node: Optional[Node]) -> Optional[str]:
+    """Text to store in Course.prerequisites (None when there are none)"""
+    if node is None:
+        return None
+    value = to_json(node)
+    return json.dumps([value] if isinstance(value, str) else value)
+
+
+def load_prerequisites(raw: Optional[str]) -> Optional[Node]:
+    """Parse a stored prerequisites value: JSON (list or expression) or catalog text"""
+    if not raw:
+        return None
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        # Not JSON: older comma-separated values, or free text
+        return parse_expression(raw)
+    return from_json(value)
+
+
+# --- Catalog text ------------------------------------------------------------------------------
+
+_PHRASES = [
+    (re.compile(r"\b(?:credit\s+or\s+)?concurrent(?:ly)?(?:\s+(?:registration|enrollment))?(?:\s+in)?\b", re.I), " CONCURRENT "),
+    (re.compile(r"\bone\s+of(?:\s+the\s+following)?:?", re.I), " ONEOF "),
+]
+_TOKEN = re.compile(
+    # "300-level" is a course level, not a course number
+    r"(?P<course>\b(?-i:[A-Z]{2,4})\s?\d{3}\b(?![-\s]*level))|(?P<number>\b\d{3}\b(?![-\s]*level))"
+    r"|(?P<word>\b(?:and|or|CONCURRENT|ONEOF)\b)|(?P<punct>[(),;.&|])",
+    re.I,
+)
+
+
+def _tokenize(text):
+    """(kind, value) tokens; words that aren't course codes or connectives are skipped"""
+    for phrase, replacement in _PHRASES:
+        text = phrase.sub(replacement, text)
+
+    tokens = []
+    department = None
+    for match in _TOKEN.finditer(text):
+        if match.group("course"):
+            code = match.group("course").replace(" ", "").upper()
+            department = re.match(r"[A-Z]+", code).group()
+            tokens.append(("course", code))
+        elif match.group("number"):
+            # "CS 124 or 125": a bare number continues the last department
+            if department:
+                tokens.append(("course", department + match.group("number")))
+        elif match.group("word"):
+            word = match.group("word").upper()
+            tokens.append({"AND": ("and", None), "OR": ("or", None)}.get(word, (word.lower(), None)))
+        else:
+            punct = match.group("punct")
+            tokens.append({"&": ("and", None), "|": ("or", None), ".": (";", None)}.get(punct, (punct, None)))
+    return tokens
+
+
+class _Parser:
+    """
+    Recursive descent over catalog prerequisite text.
+
+        requirement := clause (';' clause)*         all of
+        clause      := group (',' ['and' | 'or'] group)*   "A or B, and C" is (A or B) and C
+        group       := conjunct ('or' conjunct)*
+        conjunct    := listing ('and' listing)*
+        listing     := unary (',' unary)* [',' ('and' | 'or') unary]   "A, B, or C" is any of
+        unary       := 'concurrent' unary | 'oneof' listing | '(' requirement ')' | COURSE
+
+    A listing only takes a ", and" / ", or" that ends a list of two or more
+    items; after a single item it belongs to the clause instead.
+    """
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self, offset=0):
+        pos = self.pos + offset
+        return self.tokens[pos][0] if pos < len(self.tokens) else None
+
+    def take(self):
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def requirement(self, closing=None):
+        clauses = [self.clause()]
+        while self.peek() == ";":
+            self.take()
+            clauses.append(self.clause())
+        if self.peek() not in (None, closing):
+            raise PrerequisiteSyntaxError(f"Unexpected {self.peek()!r}")
+        return all_of(*clauses)
+
+    def clause(self):
+        node = self.group()
+        while self.peek() == ",":
+            self.take()
+            kind = self.take()[0] if self.peek() in ("and", "or") else "and"
+            node = any_of(node, self.group()) if kind == "or" else all_of(node, self.group())
+        return node
+
+    def group(self):
+        parts = [self.conjunct()]
+        while self.peek() == "or":
+            self.take()
+            parts.append(self.conjunct())
+        return any_of(*parts)
+
+    def conjunct(self):
+        parts = [self.listing()]
+        while self.peek() == "and":
+            self.take()
+            parts.append(self.listing())
+        return all_of(*parts)
+
+    def listing(self, kind="and"):
+        items = [self.unary()]
+        while self.peek() == ",":
+            connective = self.peek(1)
+            if connective in ("and", "or"):
+                if len(items) < 2:
+                    break  # "A or B, and C": the connective applies to the whole group
+                self.take()
+                self.take()
+                if kind != "or":  # "one of A, B, and C" is still any of
+                    kind = connective
+                items.append(self.unary())
+                break  # the list is finished; a further ", and" belongs to the clause
+            self.take()
+            items.append(self.unary())
+        return any_of(*items) if kind == "or" else all_of(*items)
+
+    def unary(self):
+        kind = self.peek()
+        if kind == "concurrent":
+            self.take()
+            inner = self.unary()
+            return concurrent(inner) if inner else None
+        if kind == "oneof":
+            self.take()
+            return self.listing("or")
+        if kind == "(":
+            self.take()
+            inner = self.requirement(closing=")")
+            if self.peek() == ")":
+                self.take()
+            return inner
+        if kind == "course":
+            return course(self.take()[1])
+        # A clause with no course in it ("consent of instructor"); contributes nothing
+        return None
+
+
+def parse_expression(text: str) -> Optional[Node]:
+    """Parse prerequisite text like "CS 225 and (MATH 225 or MATH 257)" (commas mean and)"""
+    tokens = _tokenize(text)
+    # Connectives whose operand had no course in it ("or consent of instructor;")
+    # and empty groups carry no requirement; the separators around them still count
+    cleaned = []
+    for token in tokens:
+        kind = token[0]
+        if kind in (";", ",", ")"):
+            while cleaned and cleaned[-1][0] in ("and", "or"):
+                cleaned.pop()
+        previous = cleaned[-1][0] if cleaned else "("
+        if kind in ("and", "or"):
+            if previous in ("and", "or"):
+                cleaned.pop()  # "CS 225 or consent of instructor and MATH 241": the later one applies
+            elif previous in (";", "("):
+                continue
+        elif kind == ";" and previous == ",":
+            cleaned.pop()
+        elif kind in (";", ",") and previous in (";", ",", "("):
+            continue
+        cleaned.append(token)
+    while cleaned and cleaned[-1][0] in ("and", "or", ";", ","):
+        cleaned.pop()
+    if not cleaned:
+        return None
+    return _Parser(cleaned).requirement()
+
+
+_PREREQUISITE_SENTENCE = re.compile(r"\bPrerequisites?\s*:\s*(.+)", re.I | re.S)
+_SENTENCE_END = re.compile(r"\.(?:\s+|$)")
+# Sentences after the prerequisite one that still state a requirement
+_CONTINUATION = re.compile(r"(?:credit\s+or\s+)?concurrent|one\s+of", re.I)
+
+
+def prerequisite_text(description: Optional[str]) -> Optional[str]:
+    """
+    The "Prerequisite: ..." sentence of a catalog description.
+
+    Following sentences are included only while they continue the requirement
+    ("Credit or concurrent registration in CS 173."); anything else ("Credit is
+    not given for both ...", "Same as ...") ends it.
+    """
+    match = _PREREQUISITE_SENTENCE.search(description or "")
+    if not match:
+        return None
+    sentences = _SENTENCE_END.split(match.group(1).strip())
+    kept = [sentences[0]]
+    for sentence in sentences[1:]:
+        if not _CONTINUATION.match(sentence.strip()):
+            break
+        kept.append(sentence)
+    return ". ".join(kept)
+
+
+def prerequisites_from_description(description: Optional[str]) -> Optional[str]:
+    """Stored prerequisites for a catalog description's "Prerequisite: ..." text, if any"""
+    text = prerequisite_text(description)
+    if not text:
+        return None
+    try:
+        return dump_prerequisites(parse_expression(text))
+    except PrerequisiteSyntaxError:
+        return None
+
+
+# --- Compilation -------------------------------------------------------------------------------
+
+def to_clauses(node: Optional[Node]) -> List[frozenset]:
+    """Conjunctive normal form: a list of clauses, each a set of (course_id, concurrent) literals"""
+    if node is None:
+        return []
+    kind, body = node
+    if kind == "course":
+        return [frozenset([(body, False)])]
+    if kind == "concurrent":
+        return [frozenset([(body, True)])]
+    if kind == "and" and all(child[0] == "course" for child in body):
+        # The common flat list: one single-course clause each, already deduplicated
+        return [frozenset([(child[1], False)]) for child in body]
+    if kind == "and":
+        clauses = [clause for child in body for clause in to_clauses(child)]
+    else:
+        clauses = [frozenset().union(*combination) for combination in product(*(to_clauses(child) for child in body))]
+        if len(clauses) > MAX_CLAUSES:
+            raise PrerequisiteSyntaxError(f"Prerequisite expression expands to {len(clauses)} clauses")
+    return _simplify(clauses)
+
+
+def _simplify(clauses):
+    """Drop literals made redundant by a concurrent one, and clauses implied by smaller ones"""
+    normalized = []
+    for clause in clauses:
+        concurrent_ids = {course_id for course_id, is_concurrent in clause if is_concurrent}
+        normalized.append(frozenset(
+            (course_id, is_concurrent) for course_id, is_concurrent in clause
+            if is_concurrent or course_id not in concurrent_ids
+        ))
+    unique = list(dict.fromkeys(normalized))  # keeps the expression's order
+    return [clause for clause in unique if not any(other < clause for other in unique)]
+
+
+@lru_cache(maxsize=65536)
+def compile_prerequisites(raw: Optional[str]) -> Tuple[Clause, ...]:
+    """Compiled clauses for a stored prerequisites value, cached by its text"""
+    if raw and raw.startswith("["):
+        # Fast path for the common flat list: one single-course clause per entry
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            value = None
+        if isinstance(value, list) and all(isinstance(item, str) for item in value):
+            return tuple(((course_id,), ()) for course_id in dict.fromkeys(item.strip() for item in value) if course_id)
+
+    try:
+        clauses = to_clauses(load_prerequisites(raw))
+    except PrerequisiteSyntaxError as e:
+        # One bad row shouldn't stop planning for the whole catalog
+        print(f"WARNING: ignoring unreadable prerequisites {raw!r}: {e}")
+        return ()
+
+    compiled = []
+    for clause in clauses:
+        prior = tuple(sorted(course_id for course_id, is_concurrent in clause if not is_concurrent))
+        same_term = tuple(sorted(course_id for course_id, is_concurrent in clause if is_concurrent))
+        compiled.append((prior, same_term))
+    return tuple(compiled)
+
+
+def describe_clause(clause: Clause) -> str:
+    """Human-readable clause: "MATH225 or MATH257", "CS173 (concurrent)\""""
+    prior, same_term = clause
+    return " or ".join(list(prior) + [f"{course_id} (concurrent)" for course_id in same_term])
@@ -0,0 +1,199 @@
+"""
+Process-wide prerequisite graph compiled from the courses table.
+
+Prerequisite expressions are compiled once (see prereq_expr) into clauses over
+integer course indexes, plus integer-indexed adjacency arrays (CSR layout) of
+every course an expression mentions, instead of on every planning request.
+The compiled graph is tagged with the catalog version it was built from and is
+rebuilt the next time it is requested after a catalog write bumps that version.
+"""
+
+import threading
+from array import array
+from typing import Iterable, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+
+from database import get_catalog_version
+from models import Course
+from prereq_expr import compile_prerequisites
+
+
+class PrerequisiteGraph:
+    """
+    Immutable prerequisite graph over integer course indexes.
+
+    The requirement of node i is clauses[i]: a tuple of (prior, concurrent)
+    index tuples, all of which must be met, each by any one of its courses
+    taken earlier (prior) or no later than the same semester (concurrent).
+    Every course node i's expression mentions is in
+    prereq_targets[prereq_offsets[i]:prereq_offsets[i + 1]], and its dependents
+    are dependent_targets[dependent_offsets[i]:dependent_offsets[i + 1]].
+    Prerequisites that name courses missing from the catalog get their own
+    nodes so they can never be treated as satisfied by accident.
+    """
+
+    def __init__(self, version: int, course_ids: List[str], prereqs: List[List[int]], clauses=None,
+                 catalog_size: Optional[int] = None):
+        self.version = version
+        self.course_ids = course_ids
+        # Nodes from catalog_size on are prerequisites missing from the catalog
+        self.catalog_size = len(course_ids) if catalog_size is None else catalog_size
+        self.index = {course_id: i for i, course_id in enumerate(course_ids)}
+        # Without compiled clauses, every prerequisite is required (the flat-list meaning)
+        self.clauses = clauses if clauses is not None else [tuple(((t,), ()) for t in row) for row in prereqs]
+
+        self.prereq_offsets, self.prereq_targets = self._to_csr(prereqs)
+
+        dependents = [[] for _ in course_ids]
+        for node, targets in enumerate(prereqs):
+            for target in targets:
+                dependents[target].append(node)
+        self.dependent_offsets, self.dependent_targets = self._to_csr(dependents)
+
+    @staticmethod
+    def _to_csr(adjacency):
+        offsets = array('i', [0])
+        targets = array('i')
+        for row in adjacency:
+            targets.extend(row)
+            offsets.append(len(targets))
+        return offsets, targets
+
+    def __len__(self):
+        return len(self.course_ids)
+
+    def prereq_indexes(self, node: int):
+        return self.prereq_targets[self.prereq_offsets[node]:self.prereq_offsets[node + 1]]
+
+    def dependent_indexes(self, node: int):
+        return self.dependent_targets[self.dependent_offsets[node]:self.dependent_offsets[node + 1]]
+
+    def prerequisites_of(self, course_id: str) -> List[str]:
+        """Every course the prerequisite expression mentions"""
+        node = self.index.get(course_id)
+        if node is None:
+            return []
+        return [self.course_ids[i] for i in self.prereq_indexes(node)]
+
+    def unmet_clauses(self, course_id: str, done: Iterable[str], current: Iterable[str] = ()):
+        """
+        Clauses of `course_id` not met when `done` courses were taken earlier
+        and `current` ones are taken in the same semester, as (prior, concurrent)
+        course ID tuples.
+        """
+        node = self.index.get(course_id)
+        if node is None:
+            return []
+        done = set(done)
+        available = done.union(current)
+        ids = self.course_ids
+        return [
+            (tuple(ids[i] for i in prior), tuple(ids[i] for i in same_term))
+            for prior, same_term in self.clauses[node]
+            if not any(ids[i] in done for i in prior) and not any(ids[i] in available for i in same_term)
+        ]
+
+    def eligible_courses(self, done: Iterable[str], current: Iterable[str] = ()) -> List[str]:
+        """Catalog courses not yet taken whose prerequisites are met by `done` (and `current` for concurrent ones)"""
+        taken = bytearray(len(self.course_ids))  # 1 = taken earlier, 2 = this semester
+        for course_id in current:
+            if course_id in self.index:
+                taken[self.index[course_id]] = 2
+        for course_id in done:
+            if course_id in self.index:
+                taken[self.index[course_id]] = 1
+
+        return [
+            self.course_ids[node]
+            for node, clauses in enumerate(self.clauses[:self.catalog_size])
+            if not taken[node] and all(
+                any(taken[i] == 1 for i in prior) or any(taken[i] for i in same_term)
+                for prior, same_term in clauses
+            )
+        ]
+
+    @classmethod
+    def compile(cls, rows, version: int = 0) -> "PrerequisiteGraph":
+        """Build a graph from (course_id, prerequisites) rows"""
+        rows = list(rows)
+        course_ids = [course_id for course_id, _ in rows]
+        catalog_size = len(course_ids)
+        index = {course_id: i for i, course_id in enumerate(course_ids)}
+        prereqs = []
+        clauses = []
+
+        def node_for(prereq_id):
+            if prereq_id not in index:
+                index[prereq_id] = len(course_ids)
+                course_ids.append(prereq_id)
+            return index[prereq_id]
+
+        for _, raw in rows:
+            compiled = tuple(
+                (tuple(map(node_for, prior)), tuple(map(node_for, same_term)))
+                for prior, same_term in compile_prerequisites(raw)
+            )
+            clauses.append(compiled)
+            prereqs.append(list(dict.fromkeys(
+                target for prior, same_term in compiled for target in prior + same_term
+            )))
+
+        # Nodes for unknown prerequisites have no prerequisites of their own
+        extra = len(course_ids) - len(prereqs)
+        prereqs.extend([] for _ in range(extra))
+        clauses.extend(() for _ in range(extra))
+        return cls(version, course_ids, prereqs, clauses, catalog_size)
+
+
+_graph: Optional[PrerequisiteGraph] = None
+_graph_lock = threading.Lock()
+
+
+def get_prereq_graph(db) -> PrerequisiteGraph:
+    """Return the shared graph, recompiling it if the catalog version has moved on"""
+    global _graph
+    version = get_catalog_version(db)
+
+    graph = _graph
+    if graph is not None and graph.version == version:
+        return graph
+
+    # Query before taking the lock: under AsyncSession.run_sync the query yields
+    # to the event loop, and another request blocking on the lock would stall it
+    rows = db.execute(select(Course.course_id, Course.prerequisites)).all()
+    return _install_graph(rows, version)
+
+
+async def get_prereq_graph_async(db) -> PrerequisiteGraph:
+    """
+    get_prereq_graph for an AsyncSession.
+
+    Compiling takes over a second on a 100k-course catalog and recurs after
+    every catalog version bump, so it runs on a worker thread rather than on
+    the event loop (where AsyncSession.run_sync would put it).
+    """
+    version = await db.run_sync(get_catalog_version)
+
+    graph = _graph
+    if graph is not None and graph.version == version:
+        return graph
+
+    rows = (await db.execute(select(Course.course_id, Course.prerequisites))).all()
+    return await run_in_threadpool(_install_graph, rows, version)
+
+
+def _install_graph(rows, version) -> PrerequisiteGraph:
+    global _graph
+    with _graph_lock:
+        if _graph is None or _graph.version != version:
+            _graph = PrerequisiteGraph.compile(rows, version)
+        return _graph
+
+
+def invalidate_prereq_graph():
+    """Drop the cached graph so the next request recompiles it"""
+    global _graph
+    with _graph_lock:
+        _graph = None
@@ -0,0 +1,109 @@
+"""
+N+1 detection: fingerprint SQL and flag statement shapes that repeat.
+
+Literals and IN lists are normalized away, so `WHERE course_id = 'CS124'` and
+`WHERE course_id = 'CS225'` share one fingerprint. A shape issued more than
+N_PLUS_ONE_THRESHOLD times within one request (or one script run) is almost
+always a query in a loop.
+
+Set QUERY_AUDIT=1 in development to print repeated shapes per request and per
+seed/sync script run. Tests use `query_budget` to fail when an endpoint goes
+over its declared number of queries or repeats a shape.
+"""
+
+import os
+import re
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+from sqlalchemy import event
+
+QUERY_AUDIT = os.getenv("QUERY_AUDIT", "0") == "1"
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"\?|%\(\w+\)s|%s|:\w+|\$\d+")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*(?:\?|__\[POSTCOMPILE_\w+\])(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_VALUES_LIST = re.compile(r"(\(\s*\?(?:\s*,\s*\?)*\s*\))(?:\s*,\s*\1)+")
+_COMMENT = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+
+
+def fingerprint(statement: str) -> str:
+    """Statement shape with literals, placeholders and list lengths removed"""
+    shape = _COMMENT.sub(" ", statement)
+    shape = _STRING.sub("?", shape)
+    shape = _NUMBER.sub("?", shape)
+    shape = _PLACEHOLDER.sub("?", shape)
+    shape = " ".join(shape.split())
+    shape = _IN_LIST.sub("IN (...)", shape)
+    return _VALUES_LIST.sub(r"\1", shape)
+
+
+def repeated_shapes(statements, threshold=None):
+    """[(fingerprint, count)] for shapes issued more than `threshold` times, most frequent first"""
+    threshold = N_PLUS_ONE_THRESHOLD if threshold is None else threshold
+    counts = Counter(fingerprint(statement) for statement in statements)
+    return [(shape, count) for shape, count in counts.most_common() if count > threshold]
+
+
+def report_repeated(label, statements, threshold=None) -> bool:
+    """Print a warning for each repeated shape; True if any were found"""
+    repeated = repeated_shapes(statements, threshold)
+    for shape, count in repeated:
+        print(f"N+1 WARNING {label}: {count}x {shape}")
+    return bool(repeated)
+
+
+@contextmanager
+def capture_queries(*engines):
+    """Collect every statement executed on the given sync engines"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", record)
+
+
+@contextmanager
+def _audited_run(label, engines, threshold):
+    with capture_queries(*engines) as statements:
+        yield statements
+    report_repeated(label, statements, threshold)
+
+
+def audit_run(label, *engines, threshold=None):
+    """Report repeated shapes for a script run when QUERY_AUDIT is enabled; otherwise a no-op"""
+    if not QUERY_AUDIT:
+        return nullcontext()
+    return _audited_run(label, engines, threshold)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def query_budget(*engines, max_queries, max_repeats=None):
+    """
+    Fail if the block issues more than `max_queries` statements, or repeats any
+    shape more than `max_repeats` times (default N_PLUS_ONE_THRESHOLD).
+    """
+    with capture_queries(*engines) as statements:
+        yield statements
+
+    problems = []
+    if len(statements) > max_queries:
+        problems.append(f"{len(statements)} queries, budget is {max_queries}")
+    for shape, count in repeated_shapes(statements, max_repeats):
+        problems.append(f"repeated {count}x: {shape}")
+    if problems:
+        listing = "\n".join(f"  {fingerprint(statement)}" for statement in statements)
+        raise QueryBudgetExceeded("; ".join(problems) + "\nStatements:\n" + listing)
@@ -1,31 +1,101 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
-from database import get_db
-from models import Course, CourseSchema
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from database import get_async_db
+from models import Course, CourseSchema, CourseListItem, CourseSearchResult
+from search import search_courses
+from catalog_cache import cached_json_response
+from catalog_snapshot import get_catalog_snapshot, get_catalog_snapshot_async
 
 router = APIRouter()
 
-@router.get("/", response_model=List[CourseSchema])
-def get_all_courses(
-    department: str = None,
-    level: int = None,
-    db: Session = Depends(get_db)
-):
-    query = db.query(Course)
+# Columns a client may request through `fields=`
+COURSE_FIELDS = {name: getattr(Course, name) for name in CourseSchema.model_fields}
+
+def list_courses(db, department=None, level=None, min_level=None, max_level=None,
+                 after=None, limit=None, fields=None):
+    """Run a catalog listing query. Returns (rows as dicts, next cursor or None)."""
+    if fields:
+        requested = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = [f for f in requested if f not in COURSE_FIELDS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+        # course_id is always returned since it is the pagination key
+        names = ["course_id"] + [f for f in dict.fromkeys(requested) if f != "course_id"]
+    else:
+        names = list(COURSE_FIELDS)
+
+    query = select(*(COURSE_FIELDS[name] for name in names)).where(Course.is_active)
 
     if department:
-        query = query.filter(Course.department == department)
+        query = query.where(Course.department.in_(department))
 
     if level:
-        query = query.filter(Course.level == level)
+        query = query.where(Course.level == level)
+
+    if min_level is not None:
+        query = query.where(Course.level >= min_level)
+
+    if max_level is not None:
+        query = query.where(Course.level <= max_level)
+
+    if after:
+        query = query.where(Course.course_id > after)
+
+    query = query.order_by(Course.course_id)
+    next_cursor = None
+
+    if limit:
+        # Fetch one extra row to learn whether another page exists
+        rows = db.execute(query.limit(limit + 1)).all()
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = rows[-1].course_id
+    else:
+        rows = db.execute(query).all()
 
-    courses = query.all()
-    return courses
+    return [dict(row._mapping) for row in rows], next_cursor
+
+@router.get("/", response_model=List[CourseListItem], response_model_exclude_unset=True)
+async def get_all_courses(
+    request: Request,
+    department: Optional[List[str]] = Query(None),
+    level: int = None,
+    min_level: Optional[int] = None,
+    max_level: Optional[int] = None,
+    after: Optional[str] = Query(None, description="Return courses after this course_id (keyset cursor)"),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. course_id,title"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    List catalog courses ordered by course_id.
+
+    With `limit`, results are paginated by keyset: pass the `X-Next-Cursor`
+    response header back as `after` to fetch the next page.
+    """
+    params = (tuple(department or ()), level, min_level, max_level, after, limit, fields)
+
+    def build(session):
+        rows, next_cursor = list_courses(session, department, level, min_level, max_level, after, limit, fields)
+        return rows, ({"X-Next-Cursor": next_cursor} if next_cursor else {})
+
+    return await cached_json_response(request, db, ("courses", params), build)
+
+@router.get("/search", response_model=List[CourseSearchResult])
+async def search(
+    q: str = Query(..., min_length=1),
+    department: Optional[List[str]] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Full-text course search over codes, titles and descriptions, best matches first"""
+    return await db.run_sync(search_courses, q, limit, department)
 
 @router.get("/{course_id}", response_model=CourseSchema)
-def get_course(course_id: str, db: Session = Depends(get_db)):
-    course = db.query(Course).filter(Course.course_id == course_id).first()
+async def get_course(course_id: str, db: AsyncSession = Depends(get_async_db)):
+    course = (await get_catalog_snapshot_async(db)).get(course_id)
 
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
@@ -33,6 +103,8 @@ def get_course(course_id: str, db: Session = Depends(get_db)):
     return course
 
 @router.get("/departments/list")
-def get_departments(db: Session = Depends(get_db)):
-    departments = db.query(Course.department).distinct().all()
-    return {"departments": [dept[0] for dept in departments]}
+async def get_departments(request: Request, db: AsyncSession = Depends(get_async_db)):
+    def build(session):
+        return {"departments": list(get_catalog_snapshot(session).departments)}, {}
+
+    return await cached_json_response(request, db, ("departments",), build, warm=get_catalog_snapshot_async)
@@ -1,43 +1,63 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 import json
-from database import get_db
+from database import get_db, get_async_db
+from prereq_expr import describe_clause
+from prereq_graph import get_prereq_graph_async
+from planner import schedule_courses
+from batch_planning import generate_degree_plans, load_planning_inputs, write_degree_plans
+from loaders import STUDENT_PROFILE_OPTIONS, DEGREE_PLAN_OPTIONS
+from catalog_cache import cached_json_response
+from catalog_snapshot import get_catalog_snapshot_async
 from models import (
-    StudentProfile, Major, Minor, DegreePlan, PlannedSemester, Course, Semester,
+    StudentProfile, Major, Minor, DegreePlan, Semester,
     StudentProfileCreate, StudentProfileSchema, MajorSchema, MinorSchema,
     DegreePlanSchema, GenerateDegreePlanRequest, student_completed_courses,
-    student_minors, major_required_courses, minor_required_courses,
-    planned_semester_courses, semester_courses
+    student_minors, semester_courses,
+    StudentProfileCreateResult, BatchGenerateDegreePlanRequest, BatchDegreePlanResult
 )
 
 router = APIRouter()
 
 # Major endpoints
 @router.get("/majors", response_model=List[MajorSchema])
-def get_all_majors(db: Session = Depends(get_db)):
+async def get_all_majors(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Get all available majors"""
-    return db.query(Major).all()
+    def build(session):
+        return [MajorSchema.model_validate(major) for major in session.query(Major).all()], {}
+
+    return await cached_json_response(request, db, ("majors",), build)
 
 @router.get("/majors/{major_id}", response_model=MajorSchema)
-def get_major(major_id: int, db: Session = Depends(get_db)):
+async def get_major(major_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a specific major by ID"""
-    major = db.query(Major).filter(Major.id == major_id).first()
+    major = await db.get(Major, major_id)
     if not major:
         raise HTTPException(status_code=404, detail="Major not found")
     return major
 
 # Minor endpoints
 @router.get("/minors", response_model=List[MinorSchema])
-def get_all_minors(db: Session = Depends(get_db)):
+async def get_all_minors(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Get all available minors"""
-    return db.query(Minor).all()
+    def build(session):
+        return [MinorSchema.model_validate(minor) for minor in session.query(Minor).all()], {}
+
+    return await cached_json_response(request, db, ("minors",), build)
 
 # Student profile endpoints
-@router.post("/student-profile", response_model=StudentProfileSchema)
-def create_student_profile(profile: StudentProfileCreate, db: Session = Depends(get_db)):
+@router.post("/student-profile", response_model=StudentProfileCreateResult)
+async def create_student_profile(profile: StudentProfileCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new student profile with major, minors, AP credits, dual enrollment, and completed courses"""
+    catalog = await get_catalog_snapshot_async(db)  # a cold rebuild runs off the event loop
+    return await db.run_sync(_create_student_profile, profile, catalog)
 
+def _create_student_profile(db: Session, profile: StudentProfileCreate, catalog):
+    """Body of create_student_profile, run on the request's connection with a sync Session"""
     # Verify major exists
     major = db.query(Major).filter(Major.id == profile.major_id).first()
     if not major:
@@ -57,17 +77,18 @@ def create_student_profile(profile: StudentProfileCreate, db: Session = Depends(
     db.add(student)
     db.flush()  # Get the student ID
 
-    # Add minors
-    if profile.minor_ids:
-        for minor_id in profile.minor_ids:
-            minor = db.query(Minor).filter(Minor.id == minor_id).first()
-            if minor:
-                db.execute(
-                    student_minors.insert().values(
-                        student_id=student.id,
-                        minor_id=minor_id
-                    )
-                )
+    # Add minors, resolving every requested ID with a single IN query
+    minor_ids = list(dict.fromkeys(profile.minor_ids))
+    known_minor_ids = set(
+        db.execute(select(Minor.id).where(Minor.id.in_(minor_ids))).scalars()
+    ) if minor_ids else set()
+    unknown_minor_ids = [minor_id for minor_id in minor_ids if minor_id not in known_minor_ids]
+
+    if known_minor_ids:
+        db.execute(insert(student_minors), [
+            {"student_id": student.id, "minor_id": minor_id}
+            for minor_id in minor_ids if minor_id in known_minor_ids
+        ])
 
     # Collect all completed course IDs from multiple sources
     completed_course_ids = set()
@@ -75,11 +96,9 @@ def create_student_profile(profile: StudentProfileCreate, db: Session = Depends(
     # 1. Add courses from dashboard semesters (if requested)
     if profile.use_dashboard_semesters:
         # Get all courses from all semesters
-        dashboard_courses = db.query(Course).join(
-            semester_courses,
-            Course.course_id == semester_courses.c.course_id
-        ).all()
-        completed_course_ids.update(c.course_id for c in dashboard_courses)
+        completed_course_ids.update(
+            db.execute(select(semester_courses.c.course_id).distinct()).scalars()
+        )
 
     # 2. Add AP credit equivalents
     if profile.ap_credits:
@@ -92,160 +111,141 @@ def create_student_profile(profile: StudentProfileCreate, db: Session = Depends(
             if de_course.uiuc_equivalent:
                 completed_course_ids.add(de_course.uiuc_equivalent)
 
-    # Add all completed courses to the student profile
-    for course_id in completed_course_ids:
-        course = db.query(Course).filter(Course.course_id == course_id).first()
-        if course:
-            db.execute(
-                student_completed_courses.insert().values(
-                    student_id=student.id,
-                    course_id=course_id
-                )
-            )
+    # Add all known completed courses to the student profile in one statement
+    known_course_ids = {course_id for course_id in completed_course_ids if course_id in catalog}
+    unknown_course_ids = sorted(completed_course_ids - known_course_ids)
+
+    if known_course_ids:
+        db.execute(insert(student_completed_courses), [
+            {"student_id": student.id, "course_id": course_id}
+            for course_id in sorted(known_course_ids)
+        ])
 
     db.commit()
-    db.refresh(student)
-    return student
+    student = db.query(StudentProfile).options(*STUDENT_PROFILE_OPTIONS).filter(
+        StudentProfile.id == student.id
+    ).one()
+    return StudentProfileCreateResult.model_validate(student).model_copy(update={
+        "unknown_minor_ids": unknown_minor_ids,
+        "unknown_course_ids": unknown_course_ids
+    })
 
 @router.get("/student-profile/{student_id}", response_model=StudentProfileSchema)
-def get_student_profile(student_id: int, db: Session = Depends(get_db)):
+async def get_student_profile(student_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a student profile by ID"""
-    student = db.query(StudentProfile).filter(StudentProfile.id == student_id).first()
+    student = (await db.execute(
+        select(StudentProfile).options(*STUDENT_PROFILE_OPTIONS).where(StudentProfile.id == student_id)
+    )).scalar_one_or_none()
     if not student:
         raise HTTPException(status_code=404, detail="Student profile not found")
     return student
 
 @router.get("/student-profiles", response_model=List[StudentProfileSchema])
-def get_all_student_profiles(db: Session = Depends(get_db)):
+async def get_all_student_profiles(db: AsyncSession = Depends(get_async_db)):
     """Get all student profiles"""
-    return db.query(StudentProfile).all()
+    return (await db.execute(select(StudentProfile).options(*STUDENT_PROFILE_OPTIONS))).scalars().all()
 
 # Degree plan endpoints
 @router.post("/generate-degree-plan", response_model=DegreePlanSchema)
-def generate_degree_plan(request: GenerateDegreePlanRequest, db: Session = Depends(get_db)):
+async def generate_degree_plan(request: GenerateDegreePlanRequest, db: AsyncSession = Depends(get_async_db)):
     """Generate a degree completion plan for a student"""
-
-    # Get student profile
-    student = db.query(StudentProfile).filter(StudentProfile.id == request.student_id).first()
-    if not student:
+    # Queries run on the request's connection; rebuilding the shared catalog
+    # structures and scheduling are CPU-bound and run on worker threads, so
+    # they don't stall other requests on the event loop
+    catalog = await get_catalog_snapshot_async(db)
+
+    # Load the student's remaining required courses (404 if the student doesn't exist)
+    inputs, missing = await db.run_sync(load_planning_inputs, [request.student_id], catalog)
+    if missing:
         raise HTTPException(status_code=404, detail="Student profile not found")
 
-    # Delete existing degree plan if it exists
-    if student.degree_plan:
-        db.delete(student.degree_plan)
-        db.flush()
-
-    # Create new degree plan
-    degree_plan = DegreePlan(student_id=student.id)
-    db.add(degree_plan)
-    db.flush()
-
-    # Get required courses for major
-    major_courses = db.query(Course).join(
-        major_required_courses,
-        Course.course_id == major_required_courses.c.course_id
-    ).filter(major_required_courses.c.major_id == student.major_id).all()
-
-    # Get required courses for minors
-    minor_courses = []
-    for minor in student.minors:
-        courses = db.query(Course).join(
-            minor_required_courses,
-            Course.course_id == minor_required_courses.c.course_id
-        ).filter(minor_required_courses.c.minor_id == minor.id).all()
-        minor_courses.extend(courses)
-
-    # Combine all required courses
-    all_required = list(set(major_courses + minor_courses))
-
-    # Filter out completed courses
-    completed_ids = {c.course_id for c in student.completed_courses}
-    remaining_courses = [c for c in all_required if c.course_id not in completed_ids]
-
-    # Build prerequisite map
-    prereq_map = {}
-    for course in all_required:
-        prereq_map[course.course_id] = []
-        if course.prerequisites:
-            # Parse prerequisites (stored as JSON array or comma-separated)
-            import json
-            try:
-                prereqs = json.loads(course.prerequisites)
-                if isinstance(prereqs, list):
-                    prereq_map[course.course_id] = prereqs
-            except:
-                # Fallback to comma-separated
-                prereq_map[course.course_id] = [p.strip() for p in course.prerequisites.split(',') if p.strip()]
+    student_id, remaining_ids, completed_ids, levels = inputs[0]
+
+    # Shared prerequisite graph (compiled once per catalog version)
+    prereq_graph = await get_prereq_graph_async(db)
 
     # Schedule courses semester by semester using prerequisite-aware algorithm
-    semester_names = ["Fall", "Spring"]
-    semester_order = 1
-    year = request.start_year
-    semester_index = 0 if request.start_semester == "Fall" else 1
-
-    scheduled_courses = set(completed_ids)  # Track all completed/scheduled courses
-    remaining = {c.course_id: c for c in remaining_courses}
-
-    while remaining:
-        # Find courses that can be taken this semester (prerequisites met)
-        available = []
-        for course_id, course in remaining.items():
-            prereqs = prereq_map.get(course_id, [])
-            if all(prereq in scheduled_courses for prereq in prereqs):
-                available.append(course)
-
-        if not available:
-            # No courses available - either cycle in prereqs or all remaining courses need something
-            # Just take lowest level courses to break the deadlock
-            available = sorted(remaining.values(), key=lambda c: c.level)[:request.courses_per_semester]
-
-        # Sort available courses by level (lower level first) and take up to courses_per_semester
-        available.sort(key=lambda c: c.level)
-        semester_courses_batch = available[:request.courses_per_semester]
-
-        if not semester_courses_batch:
-            break  # No more courses to schedule
-
-        semester_name = f"{semester_names[semester_index]} {year}"
-
-        # Create planned semester
-        planned_semester = PlannedSemester(
-            degree_plan_id=degree_plan.id,
-            semester_name=semester_name,
-            semester_order=semester_order
-        )
-        db.add(planned_semester)
-        db.flush()
-
-        # Add courses to planned semester
-        for course in semester_courses_batch:
-            db.execute(
-                planned_semester_courses.insert().values(
-                    planned_semester_id=planned_semester.id,
-                    course_id=course.course_id
-                )
-            )
-            scheduled_courses.add(course.course_id)
-            remaining.pop(course.course_id, None)
-
-        # Move to next semester
-        semester_index = (semester_index + 1) % 2
-        if semester_index == 1:  # Moving from Fall to Spring increments the year
-            year += 1
-        semester_order += 1
+    semester_batches = await run_in_threadpool(
+        schedule_courses, prereq_graph, remaining_ids, completed_ids, levels, request.courses_per_semester
+    )
 
+    plan_id = await db.run_sync(_save_degree_plan, student_id, semester_batches, request)
+
+    # The plan was rewritten with Core statements, so don't trust any loaded copy of it
+    return (await db.execute(
+        select(DegreePlan).options(*DEGREE_PLAN_OPTIONS).where(DegreePlan.id == plan_id)
+        .execution_options(populate_existing=True)
+    )).scalar_one()
+
+def _save_degree_plan(db: Session, student_id: int, semester_batches, request: GenerateDegreePlanRequest) -> int:
+    """Persist one student's degree plan; returns the new plan's ID"""
+    # Replace any existing plan with a fixed number of bulk statements
+    plan_ids = write_degree_plans(
+        db, {student_id: semester_batches}, request.start_semester, request.start_year
+    )
     db.commit()
-    db.refresh(degree_plan)
-    return degree_plan
+    return plan_ids[student_id]
+
+@router.post("/generate-degree-plans", response_model=BatchDegreePlanResult)
+def generate_degree_plans_batch(request: BatchGenerateDegreePlanRequest, db: Session = Depends(get_db)):
+    """Generate degree plans for a whole cohort of students in one request"""
+    # CPU-bound and potentially long, so it stays a sync handler on the threadpool
+    # rather than blocking the event loop
+    return generate_degree_plans(
+        db,
+        request.student_ids,
+        request.start_semester,
+        request.start_year,
+        request.courses_per_semester
+    )
 
 @router.get("/degree-plan/{student_id}", response_model=DegreePlanSchema)
-def get_degree_plan(student_id: int, db: Session = Depends(get_db)):
+async def get_degree_plan(student_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get the degree plan for a student"""
-    student = db.query(StudentProfile).filter(StudentProfile.id == student_id).first()
+    student_exists = await db.scalar(select(StudentProfile.id).where(StudentProfile.id == student_id))
+    if not student_exists:
+        raise HTTPException(status_code=404, detail="Student profile not found")
+
+    degree_plan = (await db.execute(
+        select(DegreePlan).options(*DEGREE_PLAN_OPTIONS).where(DegreePlan.student_id == student_id)
+    )).scalars().first()
+    if not degree_plan:
+        raise HTTPException(status_code=404, detail="No degree plan found for this student")
+
+    return degree_plan
+
+@router.get("/degree-plan/{student_id}/validate")
+async def validate_degree_plan(student_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Check that every planned course comes after its prerequisites (or with its concurrent ones)"""
+    student = (await db.execute(
+        select(StudentProfile).options(*STUDENT_PROFILE_OPTIONS).where(StudentProfile.id == student_id)
+    )).scalar_one_or_none()
     if not student:
         raise HTTPException(status_code=404, detail="Student profile not found")
 
-    if not student.degree_plan:
+    degree_plan = (await db.execute(
+        select(DegreePlan).options(*DEGREE_PLAN_OPTIONS).where(DegreePlan.student_id == student_id)
+    )).scalars().first()
+    if not degree_plan:
         raise HTTPException(status_code=404, detail="No degree plan found for this student")
 
-    return student.degree_plan
+    prereq_graph = await get_prereq_graph_async(db)
+    satisfied = {c.course_id for c in student.completed_courses}
+    issues = []
+
+    for semester in degree_plan.planned_semesters:
+        current = {c.course_id for c in semester.courses}
+        for course in semester.courses:
+            # Each unmet clause, e.g. "CS225" or "MATH225 or MATH257"
+            unmet = prereq_graph.unmet_clauses(course.course_id, satisfied, current)
+            if unmet:
+                issues.append({
+                    "semester_name": semester.semester_name,
+                    "course_id": course.course_id,
+                    "missing_prerequisites": [describe_clause(clause) for clause in unmet]
+                })
+
+        # Courses only count as prerequisites from the following semester on
+        satisfied.update(c.course_id for c in semester.courses)
+
+    return {"student_id": student_id, "valid": not issues, "issues": issues}
@@ -1,52 +1,83 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from database import get_db
-from models import Semester, SemesterSchema, SemesterCreate, Course, CourseAdd
+from database import get_async_db
+from models import Semester, SemesterSchema, SemesterCreate, Course, CourseAdd, CourseSchema, semester_courses
+from loaders import SEMESTER_OPTIONS
+import fastjson
 
 router = APIRouter()
 
+# Course columns in SemesterSchema.courses, in schema order
+COURSE_COLUMNS = [getattr(Course, name) for name in CourseSchema.model_fields]
+
+def semester_rows(db):
+    """Build SemesterSchema-shaped dicts straight from two Core queries (fast path)"""
+    semesters = {
+        row.id: {"id": row.id, "name": row.name, "courses": []}
+        for row in db.execute(select(Semester.id, Semester.name).order_by(Semester.id))
+    }
+
+    links = db.execute(
+        select(semester_courses.c.semester_id, *COURSE_COLUMNS)
+        .join(Course, Course.course_id == semester_courses.c.course_id)
+    )
+    for semester_id, *values in links:
+        semesters[semester_id]["courses"].append(dict(zip(CourseSchema.model_fields, values)))
+
+    return list(semesters.values())
+
+async def load_semester(db: AsyncSession, semester_id: int) -> Semester:
+    """Fetch a semester with its courses loaded, or raise 404"""
+    semester = (await db.execute(
+        select(Semester).options(*SEMESTER_OPTIONS).where(Semester.id == semester_id)
+    )).scalar_one_or_none()
+
+    if not semester:
+        raise HTTPException(status_code=404, detail="Semester not found")
+
+    return semester
+
+async def load_course(db: AsyncSession, course_id: str) -> Course:
+    course = await db.get(Course, course_id)
+    if not course:
+        raise HTTPException(status_code=404, detail="Course not found")
+    return course
+
 @router.get("/", response_model=List[SemesterSchema])
-def get_all_semesters(db: Session = Depends(get_db)):
-    semesters = db.query(Semester).all()
+async def get_all_semesters(db: AsyncSession = Depends(get_async_db)):
+    if fastjson.FAST_SERIALIZATION:
+        return fastjson.json_response(await db.run_sync(semester_rows))
+
+    semesters = (await db.execute(select(Semester).options(*SEMESTER_OPTIONS))).scalars().all()
     return semesters
 
 @router.post("/", response_model=SemesterSchema)
-def create_semester(semester_data: SemesterCreate, db: Session = Depends(get_db)):
-    semester = Semester(name=semester_data.name)
+async def create_semester(semester_data: SemesterCreate, db: AsyncSession = Depends(get_async_db)):
+    semester = Semester(name=semester_data.name, courses=[])
     db.add(semester)
-    db.commit()
-    db.refresh(semester)
+    await db.commit()
     return semester
 
 @router.get("/{semester_id}", response_model=SemesterSchema)
-def get_semester(semester_id: int, db: Session = Depends(get_db)):
-    semester = db.query(Semester).filter(Semester.id == semester_id).first()
-
-    if not semester:
-        raise HTTPException(status_code=404, detail="Semester not found")
-
-    return semester
+async def get_semester(semester_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await load_semester(db, semester_id)
 
 @router.post("/{semester_id}/courses")
-def add_course_to_semester(
+async def add_course_to_semester(
     semester_id: int,
     course_data: CourseAdd,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    semester = db.query(Semester).filter(Semester.id == semester_id).first()
-    if not semester:
-        raise HTTPException(status_code=404, detail="Semester not found")
-
-    course = db.query(Course).filter(Course.course_id == course_data.course_id).first()
-    if not course:
-        raise HTTPException(status_code=404, detail="Course not found")
+    semester = await load_semester(db, semester_id)
+    course = await load_course(db, course_data.course_id)
 
     if course in semester.courses:
         raise HTTPException(status_code=400, detail="Course already in semester")
 
     semester.courses.append(course)
-    db.commit()
+    await db.commit()
 
     total_credits = sum(c.credits for c in semester.courses)
 
@@ -58,24 +89,19 @@ def add_course_to_semester(
     }
 
 @router.delete("/{semester_id}/courses/{course_id}")
-def remove_course_from_semester(
+async def remove_course_from_semester(
     semester_id: int,
     course_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    semester = db.query(Semester).filter(Semester.id == semester_id).first()
-    if not semester:
-        raise HTTPException(status_code=404, detail="Semester not found")
-
-    course = db.query(Course).filter(Course.course_id == course_id).first()
-    if not course:
-        raise HTTPException(status_code=404, detail="Course not found")
+    semester = await load_semester(db, semester_id)
+    course = await load_course(db, course_id)
 
     if course not in semester.courses:
         raise HTTPException(status_code=400, detail="Course not in semester")
 
     semester.courses.remove(course)
-    db.commit()
+    await db.commit()
 
     total_credits = sum(c.credits for c in semester.courses)
 
@@ -87,13 +113,11 @@ def remove_course_from_semester(
     }
 
 @router.delete("/{semester_id}")
-def delete_semester(semester_id: int, db: Session = Depends(get_db)):
-    semester = db.query(Semester).filter(Semester.id == semester_id).first()
-
-    if not semester:
-        raise HTTPException(status_code=404, detail="Semester not found")
+async def delete_semester(semester_id: int, db: AsyncSession = Depends(get_async_db)):
+    # Courses are loaded so the ORM can clear the semester's links
+    semester = await load_semester(db, semester_id)
 
-    db.delete(semester)
-    db.commit()
+    await db.delete(semester)
+    await db.commit()
 
     return {"message": "Semester deleted successfully"}
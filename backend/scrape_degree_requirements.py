@@ -11,6 +11,7 @@ import requests
 from bs4 import BeautifulSoup
 import json
 import re
+import sys
 from typing import List, Dict, Set
 
 
@@ -245,4 +246,4 @@ def main():
 
 
 if __name__ == "__main__":
-    exit(main())
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+SQLite FTS5 full-text index over the course catalog.
+
+`courses_fts` holds course codes, titles and descriptions and is kept in sync
+with the courses table by triggers, so every ingestion path (init_db, catalog
+sync, prerequisite updates) updates it without extra code. Rows are keyed by
+course_id rather than rowid because VACUUM may renumber the implicit rowids of
+a table with a string primary key.
+"""
+
+import re
+from typing import List, Optional
+
+from sqlalchemy import text
+
+# `code` holds "CS 225 CS225" so both spellings (and the bare number) match
+SEARCH_INDEX_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS courses_fts USING fts5(
+        course_id, code, title, description, tokenize = 'unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS courses_fts_insert AFTER INSERT ON courses BEGIN
+        INSERT INTO courses_fts (course_id, code, title, description) VALUES (
+            new.course_id,
+            new.department || ' ' || substr(new.course_id, length(new.department) + 1) || ' ' || new.course_id,
+            new.title,
+            coalesce(new.description, '')
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS courses_fts_delete AFTER DELETE ON courses BEGIN
+        DELETE FROM courses_fts WHERE courses_fts MATCH 'course_id:"' || old.course_id || '"';
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS courses_fts_update AFTER UPDATE OF course_id, department, title, description ON courses BEGIN
+        DELETE FROM courses_fts WHERE courses_fts MATCH 'course_id:"' || old.course_id || '"';
+        INSERT INTO courses_fts (course_id, code, title, description) VALUES (
+            new.course_id,
+            new.department || ' ' || substr(new.course_id, length(new.department) + 1) || ' ' || new.course_id,
+            new.title,
+            coalesce(new.description, '')
+        );
+    END
+    """,
+]
+
+REBUILD_SQL = """
+    INSERT INTO courses_fts (course_id, code, title, description)
+    SELECT course_id,
+           department || ' ' || substr(course_id, length(department) + 1) || ' ' || course_id,
+           title,
+           coalesce(description, '')
+    FROM courses
+"""
+
+# bm25 column weights: course_id, code, title, description
+SEARCH_SQL = """
+    SELECT c.course_id, c.title, c.credits, c.department, c.level, c.description, c.prerequisites,
+           highlight(courses_fts, 2, '<mark>', '</mark>') AS title_highlight,
+           snippet(courses_fts, 3, '<mark>', '</mark>', '…', 24) AS description_snippet,
+           bm25(courses_fts, 10.0, 10.0, 5.0, 1.0) AS score
+    FROM courses_fts
+    JOIN courses c ON c.course_id = courses_fts.course_id
+    WHERE courses_fts MATCH :query AND c.is_active {department_filter}
+    ORDER BY score
+    LIMIT :limit
+"""
+
+
+def ensure_search_index(engine):
+    """Create the FTS table and triggers, backfilling the index if it is empty."""
+    with engine.begin() as conn:
+        for ddl in SEARCH_INDEX_DDL:
+            conn.exec_driver_sql(ddl)
+
+        indexed = conn.exec_driver_sql("SELECT count(*) FROM courses_fts").scalar()
+        if not indexed and conn.exec_driver_sql("SELECT count(*) FROM courses").scalar():
+            conn.exec_driver_sql(REBUILD_SQL)
+
+
+def build_match_query(q: str) -> Optional[str]:
+    """
+    Turn free-form user input into a safe FTS5 prefix query.
+
+    Words are split on letter/digit boundaries so "cs225" and "CS 225" both
+    become "cs"* AND "225"*, and every term is quoted so FTS5 syntax in the
+    input is treated as plain text.
+    """
+    terms = re.findall(r"[^\W\d_]+|\d+", q.lower())
+    if not terms:
+        return None
+    return " AND ".join(f'"{term}"*' for term in terms)
+
+
+def search_courses(db, q: str, limit: int = 20, departments: Optional[List[str]] = None):
+    """Ranked course search; returns rows with highlighted title and description snippet"""
+    query = build_match_query(q)
+    if not query:
+        return []
+
+    params = {"query": query, "limit": limit}
+    department_filter = ""
+    if departments:
+        placeholders = ", ".join(f":dept{i}" for i in range(len(departments)))
+        department_filter = f"AND c.department IN ({placeholders})"
+        params.update({f"dept{i}": dept for i, dept in enumerate(departments)})
+
+    sql = text(SEARCH_SQL.format(department_filter=department_filter))
+    return [dict(row._mapping) for row in db.execute(sql, params)]
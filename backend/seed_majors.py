@@ -1,4 +1,7 @@
-from database import SessionLocal, engine
+from sqlalchemy import insert, select
+
+from database import SessionLocal, engine, bump_catalog_version
+from query_audit import audit_run
 from models import Base, Major, Minor, major_required_courses, minor_required_courses, Course
 
 def seed_majors_and_minors():
@@ -62,11 +65,8 @@ def seed_majors_and_minors():
             ]
 
             print("Creating majors...")
-            for major_data in majors_data:
-                major = Major(**major_data)
-                db.add(major)
-
-            db.flush()  # Get IDs for majors
+            # One executemany; nothing here needs the new IDs
+            db.execute(insert(Major), majors_data)
 
             # Create some popular minors
             minors_data = [
@@ -103,10 +103,9 @@ def seed_majors_and_minors():
             ]
 
             print("Creating minors...")
-            for minor_data in minors_data:
-                minor = Minor(**minor_data)
-                db.add(minor)
+            db.execute(insert(Minor), minors_data)
 
+            bump_catalog_version(db)
             db.commit()
             print(f"Successfully seeded {len(majors_data)} majors and {len(minors_data)} minors!")
 
@@ -124,8 +123,18 @@ def seed_majors_and_minors():
             with open(json_path, 'r') as f:
                 requirements_data = json.load(f)
 
+            groups = requirements_data.get('groups', [])
+
+            # Look up known courses and existing requirements once, not per course
+            wanted = {course_id for group in groups for course_id in group['courses']}
+            known = set(db.scalars(select(Course.course_id).where(Course.course_id.in_(wanted))))
+            existing = set(db.scalars(
+                select(major_required_courses.c.course_id).where(major_required_courses.c.major_id == cs_major.id)
+            ))
+            rows = []
+
             # Process each requirement group
-            for group in requirements_data.get('groups', []):
+            for group in groups:
                 group_title = group['title']
                 group_courses = group['courses']
 
@@ -138,27 +147,16 @@ def seed_majors_and_minors():
                 print(f"\n  Processing group: {group_title} ({len(group_courses)} courses, core={is_core_group})")
 
                 for course_id in group_courses:
-                    # Check if course exists in database
-                    course = db.query(Course).filter(Course.course_id == course_id).first()
-                    if course:
-                        # Check if not already added
-                        existing = db.execute(
-                            major_required_courses.select().where(
-                                (major_required_courses.c.major_id == cs_major.id) &
-                                (major_required_courses.c.course_id == course_id)
-                            )
-                        ).first()
-
-                        if not existing:
-                            db.execute(
-                                major_required_courses.insert().values(
-                                    major_id=cs_major.id,
-                                    course_id=course_id,
-                                    is_core=is_core_group
-                                )
-                            )
-                            print(f"    Added {course_id}")
+                    # Only courses in the database that aren't already required
+                    if course_id in known and course_id not in existing:
+                        existing.add(course_id)
+                        rows.append({"major_id": cs_major.id, "course_id": course_id, "is_core": is_core_group})
+                        print(f"    Added {course_id}")
+
+            if rows:
+                db.execute(major_required_courses.insert(), rows)
 
+            bump_catalog_version(db)
             db.commit()
             print("\nSuccessfully added CS major requirements from JSON!")
         else:
@@ -168,16 +166,12 @@ def seed_majors_and_minors():
             # Fallback to minimal hardcoded list
             print("\nUsing fallback minimal requirements...")
             minimal_cs_required = ["CS124", "CS128", "CS173", "CS225", "MATH220", "MATH231"]
-            for course_id in minimal_cs_required:
-                course = db.query(Course).filter(Course.course_id == course_id).first()
-                if course:
-                    db.execute(
-                        major_required_courses.insert().values(
-                            major_id=cs_major.id,
-                            course_id=course_id,
-                            is_core=True
-                        )
-                    )
+            known = db.scalars(select(Course.course_id).where(Course.course_id.in_(minimal_cs_required))).all()
+            if known:
+                db.execute(major_required_courses.insert(), [
+                    {"major_id": cs_major.id, "course_id": course_id, "is_core": True} for course_id in known
+                ])
+            bump_catalog_version(db)
             db.commit()
 
     except Exception as e:
@@ -187,4 +181,5 @@ def seed_majors_and_minors():
         db.close()
 
 if __name__ == "__main__":
-    seed_majors_and_minors()
+    with audit_run("seed_majors", engine):
+        seed_majors_and_minors()
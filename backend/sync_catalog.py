@@ -0,0 +1,137 @@
+"""
+Incrementally sync the courses table with the UIUC Course Explorer catalog.
+
+Each upstream course is hashed over its catalog fields and compared with the
+stored `content_hash`, so only new or changed rows are written. Courses that
+disappear from the upstream department listings are tombstoned
+(`is_active = False`) rather than deleted, which keeps existing semester and
+plan links intact. A listed course whose detail request failed is kept.
+
+Stored courses without prerequisites are also filled in from the crawled
+"Prerequisite: ..." text, so catalogs seeded before prerequisite parsing
+pick them up on the next sync. Prerequisites already set (for example by
+update_prerequisites.py) are never overwritten.
+
+Usage: python sync_catalog.py
+"""
+
+from itertools import islice
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.sqlite import insert
+
+from database import engine, iter_uiuc_courses, bump_catalog_version, INSERT_CHUNK_SIZE
+from models import Base, Course, COURSE_CONTENT_FIELDS, course_content_hash
+import migrations
+from query_audit import audit_run
+
+
+def _upsert(conn, rows):
+    """Insert or update a batch of course rows; prerequisites are only filled in where missing."""
+    stmt = insert(Course.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Course.course_id],
+        set_={
+            **{field: stmt.excluded[field] for field in COURSE_CONTENT_FIELDS},
+            "content_hash": stmt.excluded.content_hash,
+            "is_active": True,
+            "prerequisites": func.coalesce(Course.__table__.c.prerequisites, stmt.excluded.prerequisites),
+        }
+    )
+    conn.execute(stmt, rows)
+
+
+def sync_catalog(courses=None, bind=None, chunk_size=INSERT_CHUNK_SIZE, listed=None):
+    """
+    Diff upstream courses against the database and upsert only what changed.
+
+    `courses` defaults to a live stream from iter_uiuc_courses() and `bind`
+    to the application engine. `listed` is the set of course IDs in the
+    upstream listings, filled while `courses` is consumed (the live stream
+    collects it); without it only the courses received count as present.
+    Returns a report of inserted / updated / unchanged / removed counts.
+    """
+    bind = bind or engine
+    Base.metadata.create_all(bind=bind)
+    migrations.upgrade(bind)
+
+    report = {"inserted": 0, "updated": 0, "unchanged": 0, "removed": 0}
+    if courses is None:
+        listed = set()
+        courses = iter_uiuc_courses(listed=listed)
+    courses = iter(courses)
+
+    # Every chunk is committed on its own, with a catalog version bump, so API
+    # writes aren't locked out for the length of the crawl and nothing cached
+    # mid-sync is served under the version it was built from.
+    with bind.connect() as conn:
+        # Only the key, hash, status, department and whether prerequisites are set are needed for the diff
+        stored = {
+            row.course_id: (row.content_hash, row.is_active, row.department, row.has_prerequisites)
+            for row in conn.execute(
+                select(Course.course_id, Course.content_hash, Course.is_active, Course.department,
+                       Course.prerequisites.is_not(None).label("has_prerequisites"))
+            )
+        }
+        conn.commit()
+        seen = set()
+        seen_departments = set()
+
+        while True:
+            chunk = list(islice(courses, chunk_size))
+            if not chunk:
+                break
+
+            changed = []
+            for course in chunk:
+                course_id = course["course_id"]
+                content_hash = course_content_hash(course)
+                seen.add(course_id)
+                seen_departments.add(course["department"])
+
+                if course_id not in stored:
+                    report["inserted"] += 1
+                elif stored[course_id][:2] != (content_hash, True):
+                    report["updated"] += 1
+                elif course.get("prerequisites") and not stored[course_id][3]:
+                    # Unchanged upstream, but its prerequisites were never filled in
+                    report["updated"] += 1
+                else:
+                    report["unchanged"] += 1
+                    continue
+
+                changed.append({**course, "content_hash": content_hash, "is_active": True})
+
+            if changed:
+                _upsert(conn, changed)
+                bump_catalog_version(conn)
+                conn.commit()
+
+        # Tombstone courses that vanished from the listings. Departments that
+        # returned nothing at all (e.g. a failed listing request) are left untouched.
+        if listed is not None:
+            seen |= listed
+            seen_departments |= {course_id.rstrip("0123456789") for course_id in listed}
+        removed = [
+            course_id for course_id, (_, is_active, department, _) in stored.items()
+            if is_active and course_id not in seen and department in seen_departments
+        ]
+
+        for start in range(0, len(removed), chunk_size):
+            batch = removed[start:start + chunk_size]
+            conn.execute(update(Course).where(Course.course_id.in_(batch)).values(is_active=False))
+        if removed:
+            bump_catalog_version(conn)
+            conn.commit()
+        report["removed"] = len(removed)
+
+    print(
+        f"Catalog sync complete: {report['inserted']} inserted, {report['updated']} updated, "
+        f"{report['unchanged']} unchanged, {report['removed']} removed"
+    )
+    return report
+
+
+if __name__ == "__main__":
+    with audit_run("sync_catalog", engine):
+        sync_catalog()
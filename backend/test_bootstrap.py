@@ -0,0 +1,97 @@
+"""
+Background catalog bootstrap and the readiness probe.
+"""
+
+import json
+import threading
+import time
+
+from sqlalchemy import create_engine, func, select
+
+import catalog_export
+import database
+import main
+from bootstrap import BootstrapState, run_bootstrap, start_background_bootstrap
+from catalog_export import export_snapshot
+from models import Course
+
+
+async def test_startup_returns_before_the_catalog_is_seeded(monkeypatch):
+    state = BootstrapState()
+    monkeypatch.setattr(main, "bootstrap_state", state)
+    release = threading.Event()
+
+    def slow_init(progress):
+        progress(500)
+        release.wait(5)
+        progress(1000)
+
+    started = time.perf_counter()
+    thread = start_background_bootstrap(state, init=slow_init, warm=lambda: 1000)
+    assert time.perf_counter() - started < 0.5
+
+    time.sleep(0.05)
+    not_ready = await main.readyz()
+    assert not_ready.status_code == 503
+    assert json.loads(not_ready.body)["courses_loaded"] == 500
+
+    release.set()
+    thread.join(5)
+    ready = await main.readyz()
+    assert ready.status_code == 200
+    assert json.loads(ready.body)["status"] == "ready"
+
+
+async def test_schema_is_created_before_the_background_bootstrap(monkeypatch):
+    calls = []
+    monkeypatch.setattr(main, "create_schema", lambda: calls.append("schema"))
+    monkeypatch.setattr(main, "start_background_bootstrap", lambda: calls.append("bootstrap"))
+
+    await main.startup_event()
+    assert calls == ["schema", "bootstrap"]
+
+
+def test_failed_bootstrap_is_reported():
+    state = BootstrapState()
+
+    def broken_init(progress):
+        raise RuntimeError("no network")
+
+    run_bootstrap(state, init=broken_init)
+    assert state.as_dict()["status"] == "failed"
+    assert state.as_dict()["error"] == "no network"
+
+
+def test_concurrent_workers_seed_the_catalog_once(engine, cs_major, tmp_path, monkeypatch):
+    snapshot = str(tmp_path / "snapshot.db")
+    export_snapshot(snapshot, bind=engine)
+    monkeypatch.setattr(database, "CATALOG_SNAPSHOT", snapshot)
+
+    # Hold the import open long enough for both workers to be bootstrapping at once
+    import_snapshot = catalog_export.import_snapshot
+
+    def slow_import(*args, **kwargs):
+        time.sleep(0.2)
+        return import_snapshot(*args, **kwargs)
+
+    monkeypatch.setattr(catalog_export, "import_snapshot", slow_import)
+
+    fresh = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    database.create_schema(fresh)
+    states = [BootstrapState() for _ in range(2)]
+    threads = [
+        threading.Thread(target=run_bootstrap, args=(state,), kwargs={
+            "init": lambda progress: database.seed_catalog(sync=False, progress=progress, bind=fresh),
+            "warm": lambda: 0,
+        })
+        for state in states
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert [state.status for state in states] == ["ready", "ready"]
+    with fresh.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(Course)).scalar() == len(cs_major.required_courses)
+    fresh.dispose()
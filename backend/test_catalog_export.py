@@ -0,0 +1,42 @@
+"""
+Catalog snapshot export/import round trip.
+"""
+
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from catalog_export import export_snapshot, import_snapshot, read_snapshot_meta
+from database import get_catalog_version
+from models import Course, Major, major_required_courses
+from search import search_courses
+
+
+def test_snapshot_round_trip(engine, cs_major, tmp_path):
+    path = str(tmp_path / "catalog_snapshot.db")
+    meta = export_snapshot(path, bind=engine)
+    assert read_snapshot_meta(path)["rows.courses"] == str(meta["rows.courses"])
+
+    target = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    import_snapshot(path, bind=target)
+
+    with Session(engine) as source, Session(target) as seeded:
+        for table in (Course.__table__, Major.__table__, major_required_courses):
+            assert seeded.execute(select(table)).all() == source.execute(select(table)).all()
+        assert get_catalog_version(seeded) == 1
+        # Search index is built by the triggers during import
+        assert search_courses(seeded, "CS225")[0]["course_id"] == "CS225"
+
+    with pytest.raises(ValueError):
+        import_snapshot(path, bind=target)
+    target.dispose()
+
+
+def test_rejects_files_that_are_not_snapshots(tmp_path):
+    path = str(tmp_path / "other.db")
+    sqlite3.connect(path).close()
+
+    with pytest.raises(ValueError):
+        read_snapshot_meta(path)
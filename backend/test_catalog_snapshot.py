@@ -0,0 +1,86 @@
+"""
+In-memory catalog snapshot: lookups, read-only records and swap on catalog change.
+"""
+
+import asyncio
+import json
+import threading
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from catalog_snapshot import CourseRecord, get_catalog_snapshot
+from database import bulk_insert_courses, bump_catalog_version
+from models import Course, CourseSchema
+from prereq_graph import get_prereq_graph
+from routers.courses import get_course
+
+
+def test_snapshot_lookups(db, cs_major):
+    snapshot = get_catalog_snapshot(db)
+
+    course = snapshot.get("CS225")
+    assert course.title == db.get(Course, "CS225").title
+    assert snapshot.records[snapshot.index["CS225"]] is course
+    assert snapshot.level_of("CS225") == 200
+    assert "CS999" not in snapshot and snapshot.get("CS999") is None
+
+    # Departments are interned, so every CS record shares one string object
+    cs_courses = snapshot.department_courses("CS")
+    assert len({id(c.department) for c in cs_courses}) == 1
+    assert "CS" in snapshot.departments and snapshot.departments == tuple(sorted(snapshot.departments))
+
+    with pytest.raises(AttributeError):
+        course.title = "Changed"
+    assert not hasattr(course, "__dict__")
+
+
+def test_snapshot_is_swapped_when_catalog_changes(db, cs_major):
+    before = get_catalog_snapshot(db)
+    assert get_catalog_snapshot(db) is before
+
+    db.add(Course(course_id="CS999", title="New Course", credits=3, department="CS", level=400))
+    bump_catalog_version(db)
+    db.commit()
+
+    after = get_catalog_snapshot(db)
+    assert after is not before
+    assert "CS999" in after and "CS999" not in before
+
+
+async def test_get_course_is_served_from_snapshot(db, adb, cs_major):
+    course = await get_course("CS225", adb)
+    assert isinstance(course, CourseRecord)
+    assert CourseSchema.model_validate(course) == CourseSchema.model_validate(db.get(Course, "CS225"))
+
+    with pytest.raises(HTTPException):
+        await get_course("CS999", adb)
+
+
+def test_concurrent_cold_builds_on_async_sessions_do_not_deadlock(engine, async_engine):
+    # All requests run on one event loop thread; querying under the lock would
+    # block the loop while the lock holder's query is waiting on it. A few
+    # thousand courses make the build slow enough for the requests to overlap.
+    with engine.begin() as conn:
+        bulk_insert_courses(conn, [
+            {"course_id": f"CS{1000 + i}", "title": f"Course {i}", "credits": 3, "department": "CS",
+             "level": 100, "description": "", "prerequisites": json.dumps([f"CS{999 + i}"]) if i else None}
+            for i in range(3000)
+        ])
+        bump_catalog_version(conn)
+
+    async def build_concurrently():
+        async def build(session):
+            async with session:
+                await session.run_sync(get_prereq_graph)
+                return len(await session.run_sync(get_catalog_snapshot))
+
+        return await asyncio.gather(*(build(AsyncSession(async_engine)) for _ in range(4)))
+
+    results = []
+    thread = threading.Thread(target=lambda: results.extend(asyncio.run(build_concurrently())), daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+    assert not thread.is_alive(), "cache builds deadlocked the event loop"
+    assert len(set(results)) == 1
@@ -0,0 +1,116 @@
+"""
+Tests for the course catalog endpoints.
+"""
+
+import json
+
+from sqlalchemy import create_engine
+from starlette.requests import Request
+
+from catalog_cache import CatalogCache, cached_json_response, make_etag
+from database import bump_catalog_version, get_catalog_state
+from models import Base
+from routers.courses import list_courses
+from sync_catalog import sync_catalog
+
+
+def make_course(course_id, department, level):
+    return {
+        "course_id": course_id,
+        "title": f"{course_id} title",
+        "credits": 3,
+        "department": department,
+        "level": level,
+        "description": "A long description " * 20,
+        "prerequisites": None,
+    }
+
+
+def seed_catalog(engine):
+    sync_catalog([
+        make_course("CS124", "CS", 100),
+        make_course("CS225", "CS", 200),
+        make_course("CS374", "CS", 300),
+        make_course("MATH231", "MATH", 200),
+        make_course("STAT400", "STAT", 400),
+    ], bind=engine)
+
+
+def test_keyset_pagination_walks_the_catalog(db, engine):
+    seed_catalog(engine)
+
+    pages = []
+    cursor = None
+    while True:
+        page, cursor = list_courses(db, after=cursor, limit=2, fields="title")
+        pages.append([c["course_id"] for c in page])
+        if not cursor:
+            break
+
+    assert pages == [["CS124", "CS225"], ["CS374", "MATH231"], ["STAT400"]]
+
+
+def test_field_projection_and_filters(db, engine):
+    seed_catalog(engine)
+
+    courses, _ = list_courses(db, department=["CS", "STAT"], min_level=200, max_level=400, fields="credits,title")
+    assert courses == [
+        {"course_id": "CS225", "credits": 3, "title": "CS225 title"},
+        {"course_id": "CS374", "credits": 3, "title": "CS374 title"},
+        {"course_id": "STAT400", "credits": 3, "title": "STAT400 title"},
+    ]
+
+    # Without a projection every column comes back
+    assert set(list_courses(db, department=["MATH"])[0][0]) == {
+        "course_id", "title", "credits", "department", "level", "description", "prerequisites"
+    }
+
+
+def make_request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+async def test_catalog_cache_serves_etags_and_invalidates_on_catalog_writes(adb, engine):
+    seed_catalog(engine)
+    cache = CatalogCache()
+    builds = []
+
+    def build(session):
+        builds.append(1)
+        rows, _ = list_courses(session, department=["CS"], fields="title")
+        return rows, {}
+
+    first = await cached_json_response(make_request(), adb, ("courses", "CS"), build, cache)
+    second = await cached_json_response(make_request(), adb, ("courses", "CS"), build, cache)
+    assert first.status_code == second.status_code == 200
+    assert first.body == second.body
+    assert json.loads(first.body)[0] == {"course_id": "CS124", "title": "CS124 title"}
+    assert len(builds) == 1
+
+    etag = first.headers["ETag"]
+    not_modified = await cached_json_response(make_request(etag), adb, ("courses", "CS"), build, cache)
+    assert not_modified.status_code == 304
+    assert not_modified.body == b""
+
+    # A catalog write bumps the version, changing the ETag and forcing a rebuild
+    await adb.commit()  # end the session's read transaction so it sees the write
+    sync_catalog([make_course("CS128", "CS", 100)], bind=engine)
+    refreshed = await cached_json_response(make_request(etag), adb, ("courses", "CS"), build, cache)
+    assert refreshed.status_code == 200
+    assert refreshed.headers["ETag"] != etag
+    assert len(builds) == 2
+
+
+def test_etags_differ_between_recreated_databases():
+    # Both databases are at catalog version 1, e.g. after seeding from the same snapshot
+    states = []
+    for _ in range(2):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            bump_catalog_version(conn)
+            states.append(get_catalog_state(conn))
+
+    assert states[0][1] == states[1][1] == 1
+    assert make_etag(states[0], ("departments",)) != make_etag(states[1], ("departments",))
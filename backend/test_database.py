@@ -0,0 +1,48 @@
+"""
+Engine configuration: URL handling, pool settings and shared in-memory SQLite.
+"""
+
+from sqlalchemy import text
+
+import database
+from database import async_url_for, create_engines, engine_options, resolve_database_url
+
+
+def test_in_memory_urls_map_to_one_shared_database():
+    shared = resolve_database_url("sqlite://")
+    assert shared == resolve_database_url("sqlite:///:memory:")
+    assert "mode=memory" in shared and "cache=shared" in shared
+
+    assert resolve_database_url("sqlite:///./course_planner.db") == "sqlite:///./course_planner.db"
+    assert async_url_for("sqlite:///./course_planner.db") == "sqlite+aiosqlite:///./course_planner.db"
+
+
+def test_pool_settings_come_from_environment(monkeypatch):
+    monkeypatch.setattr(database, "DB_POOL_SIZE", 20)
+    monkeypatch.setattr(database, "DB_POOL_PRE_PING", True)
+
+    options = engine_options("sqlite:///./course_planner.db")
+    assert options["pool_size"] == 20 and options["pool_pre_ping"]
+    assert options["connect_args"]["timeout"] == database.DB_CONNECT_TIMEOUT
+
+
+def test_busy_timeout_follows_connect_timeout(monkeypatch):
+    monkeypatch.setattr(database, "DB_CONNECT_TIMEOUT", 30.0)
+    engine, async_engine = create_engines("sqlite:///file:test_busy_timeout?mode=memory&cache=shared&uri=true")
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 30000
+    engine.dispose()
+
+
+async def test_sync_and_async_engines_share_an_in_memory_database():
+    engine, async_engine = create_engines("sqlite:///file:test_engines?mode=memory&cache=shared&uri=true")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (x INTEGER)"))
+        conn.execute(text("INSERT INTO t VALUES (42)"))
+
+    async with async_engine.connect() as conn:
+        assert (await conn.execute(text("SELECT x FROM t"))).scalar() == 42
+    await async_engine.dispose()
+    engine.dispose()
+
+    assert set(database.pool_stats()) == {"sync", "async"}
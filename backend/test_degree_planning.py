@@ -0,0 +1,231 @@
+"""
+Tests for degree plan generation and validation.
+"""
+
+import threading
+
+from sqlalchemy import event
+
+from batch_planning import generate_degree_plans, load_planning_inputs
+from catalog_snapshot import get_catalog_snapshot
+from database import bump_catalog_version
+from models import (
+    APCredit, DegreePlan, GenerateDegreePlanRequest, Minor, StudentProfile, StudentProfileCreate
+)
+import planner
+import routers.degree_planning
+from planner import plan_many, schedule_courses
+from prereq_graph import PrerequisiteGraph, get_prereq_graph
+from routers.degree_planning import create_student_profile, generate_degree_plan, validate_degree_plan
+
+
+def make_student(db, major):
+    student = StudentProfile(name="Test Student", major_id=major.id)
+    db.add(student)
+    db.commit()
+    return student
+
+
+def test_compiled_graph_keeps_unknown_prerequisites():
+    graph = PrerequisiteGraph.compile([
+        ("CS225", '["CS128"]'),
+        ("CS128", "CS124, CS100"),
+        ("CS124", None),
+    ])
+
+    assert graph.prerequisites_of("CS225") == ["CS128"]
+    assert graph.prerequisites_of("CS128") == ["CS124", "CS100"]
+    assert "CS100" in graph.index
+    assert [graph.course_ids[i] for i in graph.dependent_indexes(graph.index["CS128"])] == ["CS225"]
+
+
+def test_scheduler_starts_longest_chain_first():
+    graph = PrerequisiteGraph.compile([
+        ("CS301", None),
+        ("CS302", '["CS301"]'),
+        ("CS303", '["CS302"]'),
+        ("ENG100", None),
+        ("ENG101", None),
+        ("ENG102", None),
+    ])
+    levels = {"CS301": 300, "CS302": 300, "CS303": 300, "ENG100": 100, "ENG101": 100, "ENG102": 100}
+
+    semesters = schedule_courses(graph, sorted(levels), [], levels, 2)
+
+    # Level-first ordering would leave the three-semester chain until last
+    assert semesters == [["CS301", "ENG100"], ["CS302", "ENG101"], ["ENG102", "CS303"]]
+
+
+def test_scheduler_breaks_deadlocks_by_level():
+    graph = PrerequisiteGraph.compile([
+        ("CS400", '["CS401"]'),
+        ("CS401", '["CS400"]'),
+        ("CS225", '["CS999"]'),
+    ])
+    levels = {"CS400": 400, "CS401": 400, "CS225": 200}
+
+    semesters = schedule_courses(graph, ["CS400", "CS401", "CS225"], [], levels, 1)
+
+    assert semesters == [["CS225"], ["CS400"], ["CS401"]]
+
+
+def test_prereq_graph_is_shared_until_catalog_version_changes(db, cs_major):
+    graph = get_prereq_graph(db)
+    assert get_prereq_graph(db) is graph
+
+    bump_catalog_version(db)
+    db.commit()
+    assert get_prereq_graph(db) is not graph
+
+
+async def test_generated_plan_respects_prerequisites(db, adb, cs_major):
+    student = make_student(db, cs_major)
+    request = GenerateDegreePlanRequest(
+        student_id=student.id, start_semester="Fall", start_year=2026, courses_per_semester=4
+    )
+
+    plan = await generate_degree_plan(request, adb)
+    planned = [c.course_id for s in plan.planned_semesters for c in s.courses]
+
+    assert sorted(planned) == sorted(c.course_id for c in cs_major.required_courses)
+    assert (await validate_degree_plan(student.id, adb))["valid"]
+
+
+async def test_plan_generation_compiles_and_schedules_off_the_event_loop(db, adb, cs_major, monkeypatch):
+    student = make_student(db, cs_major)
+    bump_catalog_version(db)  # force a cold graph and snapshot
+    db.commit()
+    threads = {}
+    compile_graph = PrerequisiteGraph.compile.__func__
+    schedule = routers.degree_planning.schedule_courses
+
+    def recording_compile(cls, *args, **kwargs):
+        threads["compile"] = threading.current_thread()
+        return compile_graph(cls, *args, **kwargs)
+
+    def recording_schedule(*args, **kwargs):
+        threads["schedule"] = threading.current_thread()
+        return schedule(*args, **kwargs)
+
+    monkeypatch.setattr(PrerequisiteGraph, "compile", classmethod(recording_compile))
+    monkeypatch.setattr(routers.degree_planning, "schedule_courses", recording_schedule)
+    request = GenerateDegreePlanRequest(
+        student_id=student.id, start_semester="Fall", start_year=2026, courses_per_semester=4
+    )
+
+    await generate_degree_plan(request, adb)
+
+    loop_thread = threading.current_thread()
+    assert threads["compile"] is not loop_thread
+    assert threads["schedule"] is not loop_thread
+
+
+async def test_batch_generation_matches_single_plans(db, adb, cs_major):
+    students = [make_student(db, cs_major) for _ in range(3)]
+    request = GenerateDegreePlanRequest(
+        student_id=students[0].id, start_semester="Fall", start_year=2026, courses_per_semester=4
+    )
+    single = await generate_degree_plan(request, adb)
+    expected = [[c.course_id for c in s.courses] for s in single.planned_semesters]
+
+    report = generate_degree_plans(db, [s.id for s in students] + [999], "Fall", 2026, 4, max_workers=2)
+    assert report["plans_generated"] == 3
+    assert report["missing_student_ids"] == [999]
+
+    # Regenerating replaced the earlier single plan instead of adding a second one
+    assert db.query(DegreePlan).count() == 3
+    for student in students:
+        db.refresh(student)
+        plan = sorted(student.degree_plan.planned_semesters, key=lambda s: s.semester_order)
+        assert [sorted(c.course_id for c in s.courses) for s in plan] == [sorted(ids) for ids in expected]
+        assert plan[0].semester_name == "Fall 2026"
+
+
+def test_plan_many_process_pool_matches_in_process(db, cs_major):
+    students = [make_student(db, cs_major) for _ in range(4)]
+    inputs, _ = load_planning_inputs(db, [s.id for s in students])
+    graph = get_prereq_graph(db)
+
+    assert plan_many(graph, inputs, 4, max_workers=2) == plan_many(graph, inputs, 4, max_workers=1)
+
+    # The pool is reused across calls, and the in-process path never touches the workers' global graph
+    pool = planner._pool
+    plan_many(graph, inputs, 4, max_workers=2)
+    assert planner._pool is pool
+    assert planner._worker_graph is None
+    # Never forked from the (multithreaded) server process
+    assert planner._MP_CONTEXT.get_start_method() in ("forkserver", "spawn")
+
+
+async def test_plan_write_cost_is_independent_of_plan_length(db, adb, async_engine, cs_major):
+    student = make_student(db, cs_major)
+    get_prereq_graph(db)
+    get_catalog_snapshot(db)
+    statements = []
+    event.listen(async_engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    counts = []
+    for per_semester in (6, 1):
+        statements.clear()
+        request = GenerateDegreePlanRequest(
+            student_id=student.id, start_semester="Fall", start_year=2026, courses_per_semester=per_semester
+        )
+        plan = await generate_degree_plan(request, adb)
+        counts.append(len(statements))
+
+    assert len(plan.planned_semesters) == len(cs_major.required_courses)
+    assert counts[0] == counts[1]
+    assert db.query(DegreePlan).count() == 1
+
+
+async def test_create_student_profile_statement_count_is_constant(db, adb, async_engine, cs_major):
+    minor = Minor(name="Mathematics", department="MATH", total_credits_required=21)
+    db.add(minor)
+    db.commit()
+    minor_id = minor.id
+    get_catalog_snapshot(db)
+    course_ids = sorted(c.course_id for c in cs_major.required_courses)
+
+    statements = []
+    event.listen(async_engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    counts = []
+    for equivalents in (course_ids[:2], course_ids + ["CS999"]):
+        statements.clear()
+        profile = StudentProfileCreate(
+            name="Transfer Student",
+            major_id=cs_major.id,
+            minor_ids=[minor_id, 404],
+            ap_credits=[APCredit(exam_name="AP Exam", score=5, course_equivalents=[c]) for c in equivalents],
+            use_dashboard_semesters=False
+        )
+        result = await create_student_profile(profile, adb)
+        counts.append(len(statements))
+
+    assert counts[0] == counts[1]
+    assert result.unknown_minor_ids == [404]
+    assert result.unknown_course_ids == ["CS999"]
+    assert sorted(c.course_id for c in result.completed_courses) == course_ids
+    assert [m.id for m in result.minors] == [minor_id]
+
+
+def test_scheduler_needs_only_one_alternative_and_allows_concurrent_courses():
+    graph = PrerequisiteGraph.compile([
+        ("CS225", '{"and": ["CS128", {"or": ["MATH213", "CS173"]}]}'),
+        ("CS233", '{"and": ["CS225", {"concurrent": "CS210"}]}'),
+        ("CS128", None),
+        ("CS173", None),
+        ("CS210", None),
+    ])
+    levels = {"CS225": 200, "CS233": 200, "CS128": 100, "CS173": 100, "CS210": 200}
+
+    # MATH213 was already taken, so CS225 only waits for CS128; CS233 may share a semester with CS210
+    semesters = schedule_courses(graph, ["CS225", "CS233", "CS128", "CS210"], ["MATH213"], levels, 2)
+    assert semesters == [["CS128", "CS210"], ["CS225"], ["CS233"]]
+
+    semesters = schedule_courses(graph, ["CS233", "CS210"], ["CS225"], levels, 2)
+    assert semesters == [["CS210", "CS233"]]
+
+    # With neither alternative taken or planned, CS225 can't be ready until the deadlock fallback
+    semesters = schedule_courses(graph, ["CS225", "CS128"], [], levels, 2)
+    assert semesters == [["CS128"], ["CS225"]]
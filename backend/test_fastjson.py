@@ -0,0 +1,35 @@
+"""
+The fast serialization path must produce the same documents as the response models.
+"""
+
+import json
+from typing import List
+
+from pydantic import TypeAdapter
+
+import fastjson
+from models import CourseSchema, SemesterSchema
+from routers.semesters import get_all_semesters, semester_rows
+
+
+async def test_semester_rows_match_response_model(db, adb, cs_major, seed_semesters, monkeypatch):
+    monkeypatch.setattr(fastjson, "FAST_SERIALIZATION", False)
+    seed_semesters(["CS124", "CS128", "MATH220"], 3)
+
+    expected = TypeAdapter(List[SemesterSchema]).dump_python(
+        TypeAdapter(List[SemesterSchema]).validate_python(await get_all_semesters(adb), from_attributes=True),
+        mode="json"
+    )
+    fast = json.loads(fastjson.dumps(semester_rows(db)))
+
+    key = lambda course: course["course_id"]
+    for semester in expected + fast:
+        semester["courses"].sort(key=key)
+    assert fast == expected
+
+
+def test_dumps_encodes_pydantic_models():
+    course = CourseSchema(course_id="CS225", title="Data Structures", credits=4,
+                          department="CS", level=200, description="Trees — and graphs")
+    body = fastjson.dumps({"courses": [course]})
+    assert json.loads(body) == {"courses": [course.model_dump()]}
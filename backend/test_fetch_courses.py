@@ -0,0 +1,197 @@
+"""
+Tests for concurrent catalog ingestion against a local stand-in Course Explorer server.
+"""
+
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from sqlalchemy import create_engine, func, select
+
+from catalog_client import CatalogClient, ResponseCache, TokenBucket
+from database import bulk_insert_courses, fetch_uiuc_courses, iter_uiuc_courses
+from models import Base, Course
+from sync_catalog import sync_catalog
+
+FIXTURES = {
+    "/schedule/2026/spring/CS.xml": """<?xml version="1.0" encoding="UTF-8"?>
+<ns2:subject xmlns:ns2="http://rest.cis.illinois.edu" id="CS">
+  <courses>
+    <course id="124">Introduction to Computer Science I</course>
+    <course id="225">Data Structures</course>
+    <course id="999">Missing Course</course>
+  </courses>
+</ns2:subject>""",
+    "/schedule/2026/spring/MATH.xml": """<?xml version="1.0" encoding="UTF-8"?>
+<ns2:subject xmlns:ns2="http://rest.cis.illinois.edu" id="MATH">
+  <courses>
+    <course id="231">Calculus II</course>
+  </courses>
+</ns2:subject>""",
+    "/schedule/2026/spring/CS/124.xml": """<?xml version="1.0" encoding="UTF-8"?>
+<ns2:course xmlns:ns2="http://rest.cis.illinois.edu" id="CS 124">
+  <label>Introduction to Computer Science I</label>
+  <description>Basic concepts in computing.</description>
+  <creditHours>3 hours.</creditHours>
+</ns2:course>""",
+    "/schedule/2026/spring/CS/225.xml": """<?xml version="1.0" encoding="UTF-8"?>
+<ns2:course xmlns:ns2="http://rest.cis.illinois.edu" id="CS 225">
+  <label>Data Structures</label>
+  <description>Data abstractions.</description>
+  <creditHours>4 hours.</creditHours>
+</ns2:course>""",
+    "/schedule/2026/spring/MATH/231.xml": """<?xml version="1.0" encoding="UTF-8"?>
+<ns2:course xmlns:ns2="http://rest.cis.illinois.edu" id="MATH 231">
+  <label>Calculus II</label>
+  <description>Second course in calculus.</description>
+  <creditHours>3 hours.</creditHours>
+</ns2:course>""",
+}
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.request_count += 1
+        body = FIXTURES.get(self.path)
+
+        if self.path in self.server.failing:
+            self.send_response(500)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if body is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        payload = body.encode()
+        etag = '"%s"' % hashlib.md5(payload).hexdigest()
+
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/xml")
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_fixture_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    server.request_count = 0
+    server.failing = set()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_fetch_uiuc_courses_concurrently():
+    server = start_fixture_server()
+    try:
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        with CatalogClient(base_url=base_url, max_workers=4, requests_per_second=0, cache_dir=None) as client:
+            courses = fetch_uiuc_courses(client=client, departments=["CS", "MATH"])
+
+        by_id = {c["course_id"]: c for c in courses}
+        assert [c["course_id"] for c in courses] == ["CS124", "CS225", "MATH231"]
+        assert by_id["CS225"]["credits"] == 4
+        assert by_id["CS225"]["level"] == 200
+        assert by_id["MATH231"]["title"] == "Calculus II"
+
+        # 2 listings + 4 detail documents (one of which 404s)
+        assert server.request_count == 6
+    finally:
+        server.shutdown()
+
+
+def test_stream_courses_into_database():
+    server = start_fixture_server()
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    try:
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        with CatalogClient(base_url=base_url, max_workers=2, requests_per_second=0, cache_dir=None) as client:
+            with engine.begin() as conn:
+                added = bulk_insert_courses(conn, iter_uiuc_courses(client, ["CS", "MATH"]), chunk_size=2)
+
+        assert added == 3
+        with engine.connect() as conn:
+            assert conn.execute(select(func.count()).select_from(Course)).scalar() == 3
+            assert conn.execute(select(Course.credits).where(Course.course_id == "CS124")).scalar() == 3
+    finally:
+        server.shutdown()
+
+
+def test_unchanged_resync_is_served_from_cache(tmp_path):
+    server = start_fixture_server()
+    try:
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        with CatalogClient(base_url=base_url, requests_per_second=0, cache_dir=str(tmp_path)) as client:
+            first = fetch_uiuc_courses(client=client, departments=["CS", "MATH"])
+        with CatalogClient(base_url=base_url, requests_per_second=0, cache_dir=str(tmp_path)) as client:
+            second = fetch_uiuc_courses(client=client, departments=["CS", "MATH"])
+
+        assert second == first
+        # Everything except the 404 revalidates to a bodiless 304
+        assert client.stats["not_modified"] == 5
+        assert client.stats["bytes_downloaded"] == 0
+    finally:
+        server.shutdown()
+
+
+def test_response_cache_evicts_by_size(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_bytes=10)
+    cache.put("http://example/a", b"123456", '"a"', None)
+    time.sleep(0.01)
+    cache.put("http://example/b", b"abcdef", '"b"', None)
+    cache.prune()
+
+    assert cache.get("http://example/a") is None
+    assert cache.get("http://example/b")["body"] == b"abcdef"
+
+
+def test_token_bucket_enforces_rate():
+    bucket = TokenBucket(rate=50, capacity=1)
+    start = time.monotonic()
+    for _ in range(11):
+        bucket.acquire()
+    elapsed = time.monotonic() - start
+
+    # First token is free, the remaining 10 need ~0.2s at 50/s
+    assert elapsed >= 0.18
+
+
+def test_sync_keeps_listed_courses_whose_details_fail():
+    server = start_fixture_server()
+    engine = create_engine("sqlite://")
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def sync():
+        listed = set()
+        with CatalogClient(base_url=base_url, requests_per_second=0, cache_dir=None) as client:
+            courses = iter_uiuc_courses(client, ["CS", "MATH"], listed=listed)
+            return sync_catalog(courses, bind=engine, listed=listed)
+
+    try:
+        assert sync()["inserted"] == 3
+
+        # A transient server error on a listed course must not tombstone it
+        server.failing.add("/schedule/2026/spring/CS/225.xml")
+        assert sync()["removed"] == 0
+        with engine.connect() as conn:
+            assert conn.execute(select(Course.is_active).where(Course.course_id == "CS225")).scalar()
+    finally:
+        server.shutdown()
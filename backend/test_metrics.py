@@ -0,0 +1,72 @@
+"""
+Request metrics: per-route latency, per-request SQL attribution and the
+Prometheus rendering.
+"""
+
+from types import SimpleNamespace
+
+from sqlalchemy import text
+from starlette.requests import Request
+from starlette.responses import Response
+
+import metrics
+from metrics import MetricsRegistry, RequestStats, current_request, instrument_engine
+
+
+def make_request(path, route_path):
+    scope = {"type": "http", "method": "GET", "path": path, "headers": [], "query_string": b""}
+    request = Request(scope)
+    # The router stores the matched route in the scope
+    scope["route"] = SimpleNamespace(path=route_path)
+    return request
+
+
+async def test_middleware_records_route_template_and_request_sql(monkeypatch, async_engine):
+    monkeypatch.setattr(metrics, "registry", MetricsRegistry())
+    instrument_engine(async_engine.sync_engine)
+
+    async def call_next(request):
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await conn.execute(text("SELECT 2"))
+        return Response(status_code=200)
+
+    for semester_id in (1, 2):
+        await metrics.metrics_middleware(make_request(f"/api/semesters/{semester_id}", "/api/semesters/{semester_id}"), call_next)
+
+    rendered = metrics.registry.render()
+    labels = 'method="GET",route="/api/semesters/{semester_id}"'
+    assert f'http_request_duration_seconds_count{{{labels},status="200"}} 2' in rendered
+    assert f'db_statements_per_request_sum{{{labels}}} 4.000000' in rendered
+    assert f'db_statements_per_request_bucket{{{labels},le="2"}} 2' in rendered
+    assert "/api/semesters/1" not in rendered
+
+
+def test_statements_outside_a_request_are_not_attributed(engine):
+    instrument_engine(engine)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))  # no current request: must not fail
+
+    stats = RequestStats(keep_queries=True)
+    token = current_request.set(stats)
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    finally:
+        current_request.reset(token)
+    assert stats.statements == 1 and stats.queries[0][1] == "SELECT 1"
+
+
+async def test_slow_requests_are_logged_with_their_sql(monkeypatch, capsys, engine):
+    monkeypatch.setattr(metrics, "registry", MetricsRegistry())
+    monkeypatch.setattr(metrics, "SLOW_REQUEST_MS", 0.001)
+    instrument_engine(engine)
+
+    async def call_next(request):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 42"))
+        return Response(status_code=200)
+
+    await metrics.metrics_middleware(make_request("/api/courses/", "/api/courses/"), call_next)
+    output = capsys.readouterr().out
+    assert "SLOW REQUEST GET /api/courses/" in output and "SELECT 42" in output
@@ -0,0 +1,49 @@
+"""
+Upgrading a database created before junction tables had primary keys and indexes.
+"""
+
+from sqlalchemy import create_engine, inspect, text
+
+import migrations
+from database import configure_sqlite
+from models import Base
+
+LEGACY_SCHEMA = [
+    "CREATE TABLE courses (course_id VARCHAR PRIMARY KEY, title VARCHAR NOT NULL, credits INTEGER NOT NULL, "
+    "department VARCHAR NOT NULL, level INTEGER NOT NULL, description VARCHAR, prerequisites VARCHAR)",
+    "CREATE TABLE semesters (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL)",
+    "CREATE TABLE semester_courses (semester_id INTEGER, course_id VARCHAR)",
+    "CREATE TABLE majors (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL UNIQUE, department VARCHAR NOT NULL, "
+    "total_credits_required INTEGER NOT NULL, description VARCHAR)",
+    "CREATE TABLE major_required_courses (major_id INTEGER, course_id VARCHAR, is_core BOOLEAN)",
+]
+
+
+def test_upgrade_adds_primary_keys_and_indexes(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    configure_sqlite(engine)
+    with engine.begin() as conn:
+        for ddl in LEGACY_SCHEMA:
+            conn.execute(text(ddl))
+        conn.execute(text("INSERT INTO courses VALUES ('CS225', 'Data Structures', 4, 'CS', 200, NULL, NULL)"))
+        conn.execute(text("INSERT INTO semester_courses VALUES (1, 'CS225'), (1, 'CS225'), (NULL, 'CS225')"))
+        conn.execute(text("INSERT INTO major_required_courses VALUES (1, 'CS225', 1), (1, 'CS225', 0)"))
+
+    Base.metadata.create_all(engine)
+    migrations.upgrade(engine)
+
+    inspector = inspect(engine)
+    assert inspector.get_pk_constraint("semester_courses")["constrained_columns"] == ["semester_id", "course_id"]
+    assert inspector.get_pk_constraint("major_required_courses")["constrained_columns"] == ["major_id", "course_id"]
+    assert {"ix_courses_department", "ix_courses_level"} <= {i["name"] for i in inspector.get_indexes("courses")}
+    assert "ix_semester_courses_course_id" in {i["name"] for i in inspector.get_indexes("semester_courses")}
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT * FROM semester_courses")).all() == [(1, "CS225")]
+        # The first copy of a duplicated link wins
+        assert conn.execute(text("SELECT is_core FROM major_required_courses")).scalar() == 1
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+
+    # Running it again is a no-op
+    migrations.upgrade(engine)
+    engine.dispose()
@@ -0,0 +1,101 @@
+"""
+Prerequisite expressions: parsing catalog text, the stored JSON form and compiled clauses.
+"""
+
+import json
+
+import pytest
+
+from prereq_expr import (
+    PrerequisiteSyntaxError, compile_prerequisites, describe_clause, dump_prerequisites, load_prerequisites,
+    parse_expression, prerequisites_from_description
+)
+from prereq_graph import PrerequisiteGraph
+
+
+def stored(text):
+    return json.loads(dump_prerequisites(parse_expression(text)))
+
+
+def test_catalog_text_is_parsed_into_structured_json():
+    assert stored("CS 225 and (MATH 225 or MATH 257)") == {"and": ["CS225", {"or": ["MATH225", "MATH257"]}]}
+    assert stored("CS 124 or 125; CS 128; one of MATH 220, MATH 221, or MATH 231. "
+                  "Credit or concurrent registration in CS 173.") == {"and": [
+        {"or": ["CS124", "CS125"]}, "CS128", {"or": ["MATH220", "MATH221", "MATH231"]}, {"concurrent": "CS173"}
+    ]}
+    # Commas mean "and" unless the list ends in "or"; clauses without courses are dropped
+    assert stored("CS124, CS100") == ["CS124", "CS100"]
+    assert stored("CS 225, MATH 225, or MATH 257") == {"or": ["CS225", "MATH225", "MATH257"]}
+    assert stored("CS 225 or consent of instructor") == ["CS225"]
+    assert parse_expression("Consent of instructor.") is None
+
+
+def test_dangling_connectives_and_comma_connectives_keep_requirements():
+    # A connective with no course after it is dropped; the separator still separates
+    assert stored("MATH 241 or equivalent; PHYS 211.") == ["MATH241", "PHYS211"]
+    assert stored("CS 225 or consent of instructor; MATH 241.") == ["CS225", "MATH241"]
+    # ", and" / ", or" after a finished group applies to the whole group
+    assert stored("STAT 400 or STAT 410, and MATH 415.") == {"and": [{"or": ["STAT400", "STAT410"]}, "MATH415"]}
+    assert stored("CS 374 or ECE 374, and CS 421.") == {"and": [{"or": ["CS374", "ECE374"]}, "CS421"]}
+    assert stored("CS 225 and CS 233, or CS 340.") == {"or": [["CS225", "CS233"], "CS340"]}
+    assert stored("One of MATH 220, MATH 221, or MATH 231, and CS 124.") == {
+        "and": [{"or": ["MATH220", "MATH221", "MATH231"]}, "CS124"]
+    }
+
+
+def test_flat_lists_still_mean_all_of():
+    assert compile_prerequisites('["CS124", "CS128"]') == ((("CS124",), ()), (("CS128",), ()))
+    assert compile_prerequisites("CS124, CS128") == compile_prerequisites('["CS124", "CS128"]')
+    assert compile_prerequisites(None) == ()
+    with pytest.raises(PrerequisiteSyntaxError):
+        load_prerequisites('{"xor": ["CS124"]}')
+
+
+def test_expressions_compile_to_simplified_clauses():
+    assert compile_prerequisites('{"or": [{"and": ["A100", "B100"]}, "C100"]}') == (
+        (("A100", "C100"), ()), (("B100", "C100"), ())
+    )
+    # (A or B) and A is just A; A or concurrent A is just concurrent A
+    assert compile_prerequisites('{"and": [{"or": ["A100", "B100"]}, "A100"]}') == ((("A100",), ()),)
+    assert compile_prerequisites('{"or": ["A100", {"concurrent": "A100"}]}') == (((), ("A100",)),)
+    assert describe_clause((("MATH225", "MATH257"), ("MATH241",))) == "MATH225 or MATH257 or MATH241 (concurrent)"
+
+
+def test_description_prerequisites():
+    assert json.loads(prerequisites_from_description(
+        "Data structures and algorithms. Prerequisite: CS 128; CS 173 or MATH 213."
+    )) == {"and": ["CS128", {"or": ["CS173", "MATH213"]}]}
+    assert prerequisites_from_description("No requirements.") is None
+
+
+def test_description_prerequisites_end_with_their_sentence():
+    def parsed(description):
+        return json.loads(prerequisites_from_description(description))
+
+    assert parsed("Prerequisite: CS 225. Credit is not given for both CS 374 and ECE 374.") == ["CS225"]
+    assert parsed("Prerequisite: MATH 220 or MATH 221. Restricted to students in 300-level courses.") == {
+        "or": ["MATH220", "MATH221"]
+    }
+    assert parsed("Prerequisite: CS 233 and CS 341. Same as ECE 391. 4 undergraduate hours.") == ["CS233", "CS341"]
+    # Requirement sentences that continue the prerequisite are kept
+    assert parsed("Prerequisite: CS 128. Credit or concurrent registration in CS 173. "
+                  "Credit is not given for CS 277.") == {"and": ["CS128", {"concurrent": "CS173"}]}
+    assert parsed("Prerequisite: One 300-level CS course or MATH 347.") == ["MATH347"]
+
+
+def test_graph_evaluates_clauses():
+    graph = PrerequisiteGraph.compile([
+        ("CS225", '{"and": ["CS128", {"or": ["CS173", "MATH213"]}]}'),
+        ("CS233", '{"and": ["CS225", {"concurrent": "CS210"}]}'),
+        ("CS128", None),
+        ("CS173", None),
+        ("CS210", None),
+    ])
+
+    assert graph.prerequisites_of("CS225") == ["CS128", "CS173", "MATH213"]
+    assert graph.unmet_clauses("CS225", {"CS128"}) == [(("CS173", "MATH213"), ())]
+    assert graph.unmet_clauses("CS225", {"CS128", "MATH213"}) == []
+    assert graph.unmet_clauses("CS233", {"CS225"}, current={"CS210"}) == []
+
+    assert graph.eligible_courses({"CS128", "MATH213"}) == ["CS225", "CS173", "CS210"]
+    assert graph.eligible_courses({"CS128", "MATH213", "CS225"}, current={"CS210"}) == ["CS233", "CS173"]
@@ -0,0 +1,56 @@
+"""
+N+1 detection: statement fingerprints, repeated-shape reports and query budgets.
+"""
+
+import pytest
+from sqlalchemy import select, text
+from starlette.requests import Request
+from starlette.responses import Response
+
+import metrics
+import query_audit
+from models import Course
+from query_audit import QueryBudgetExceeded, fingerprint, query_budget, repeated_shapes
+
+
+def test_fingerprint_ignores_literals_and_list_lengths():
+    assert fingerprint("SELECT * FROM courses WHERE course_id = 'CS124' AND level >= 200") == \
+        fingerprint("SELECT  *  FROM courses\nWHERE course_id = 'MATH220' AND level >= 400")
+    assert fingerprint("SELECT * FROM courses WHERE course_id IN (?, ?, ?)") == \
+        fingerprint("SELECT * FROM courses WHERE course_id IN (?)")
+    assert fingerprint("INSERT INTO t (a, b) VALUES (?, ?), (?, ?)") == fingerprint("INSERT INTO t (a, b) VALUES (?, ?)")
+    # identifiers with digits are part of the shape
+    assert fingerprint("SELECT majors_1.id FROM majors AS majors_1") == "SELECT majors_1.id FROM majors AS majors_1"
+
+
+def test_repeated_shapes_are_counted_above_the_threshold():
+    statements = [f"SELECT * FROM courses WHERE course_id = 'CS{n}'" for n in range(6)] + ["SELECT 1"]
+    assert repeated_shapes(statements, threshold=5) == [("SELECT * FROM courses WHERE course_id = ?", 6)]
+    assert repeated_shapes(statements, threshold=6) == []
+
+
+def test_query_budget_fails_on_a_query_per_row(db, engine, cs_major):
+    course_ids = ["CS124", "CS128", "CS173", "CS225"]
+
+    with query_budget(engine, max_queries=1):
+        db.scalars(select(Course).where(Course.course_id.in_(course_ids))).all()
+
+    with pytest.raises(QueryBudgetExceeded, match="repeated 4x"):
+        with query_budget(engine, max_queries=10, max_repeats=1):
+            for course_id in course_ids:
+                db.scalars(select(Course).where(Course.course_id == course_id)).first()
+
+
+async def test_requests_with_repeated_queries_are_reported(monkeypatch, capsys, engine):
+    monkeypatch.setattr(metrics, "registry", metrics.MetricsRegistry())
+    monkeypatch.setattr(query_audit, "QUERY_AUDIT", True)
+    metrics.instrument_engine(engine)
+
+    async def call_next(request):
+        with engine.connect() as conn:
+            for n in range(query_audit.N_PLUS_ONE_THRESHOLD + 1):
+                conn.execute(text(f"SELECT {n}"))
+        return Response(status_code=200)
+
+    await metrics.metrics_middleware(Request({"type": "http", "method": "GET", "path": "/x", "headers": []}), call_next)
+    assert f"N+1 WARNING GET unmatched: {query_audit.N_PLUS_ONE_THRESHOLD + 1}x SELECT ?" in capsys.readouterr().out
@@ -0,0 +1,103 @@
+"""
+Nested list endpoints must run a constant number of queries, however many rows they return.
+
+Handlers are called directly on an AsyncSession and their results are
+serialized with the endpoint's response model. A lazy load during
+serialization can't run on an AsyncSession at all, so it fails the test.
+"""
+
+from typing import List
+
+import pytest
+from pydantic import TypeAdapter
+from sqlalchemy import insert
+
+import fastjson
+from catalog_snapshot import get_catalog_snapshot
+from models import (
+    APCredit, DegreePlanSchema, GenerateDegreePlanRequest, Minor, SemesterSchema, StudentProfile,
+    StudentProfileCreate, StudentProfileSchema, student_completed_courses, student_minors
+)
+from query_audit import capture_queries
+from routers.degree_planning import (
+    create_student_profile, generate_degree_plan, get_all_student_profiles, get_degree_plan
+)
+from routers.semesters import get_all_semesters
+
+
+async def serialize(adb, async_engine, handler, response_model, *args):
+    """Run a handler plus response serialization on a clean session and count queries"""
+    adb.expunge_all()
+    with capture_queries(async_engine.sync_engine) as statements:
+        TypeAdapter(response_model).validate_python(await handler(*args, adb), from_attributes=True)
+    return len(statements)
+
+
+def seed_students(db, major, course_ids, count):
+    minor = Minor(name=f"Minor {db.query(Minor).count()}", department="MATH", total_credits_required=21)
+    db.add(minor)
+    db.flush()
+    for i in range(count):
+        student = StudentProfile(name=f"Student {i}", major_id=major.id)
+        db.add(student)
+        db.flush()
+        db.execute(insert(student_minors), [{"student_id": student.id, "minor_id": minor.id}])
+        db.execute(insert(student_completed_courses), [
+            {"student_id": student.id, "course_id": course_id} for course_id in course_ids
+        ])
+    db.commit()
+
+
+async def test_semester_list_query_count_is_constant(adb, async_engine, cs_major, seed_semesters, monkeypatch):
+    monkeypatch.setattr(fastjson, "FAST_SERIALIZATION", False)
+    course_ids = ["CS124", "CS128", "MATH220"]
+
+    seed_semesters(course_ids, 1)
+    few = await serialize(adb, async_engine, get_all_semesters, List[SemesterSchema])
+    seed_semesters(course_ids, 20)
+    many = await serialize(adb, async_engine, get_all_semesters, List[SemesterSchema])
+
+    assert few == many == 2
+
+
+async def test_student_profile_list_query_count_is_constant(db, adb, async_engine, cs_major):
+    course_ids = ["CS124", "CS128", "MATH220"]
+
+    seed_students(db, cs_major, course_ids, 1)
+    few = await serialize(adb, async_engine, get_all_student_profiles, List[StudentProfileSchema])
+    seed_students(db, cs_major, course_ids, 20)
+    many = await serialize(adb, async_engine, get_all_student_profiles, List[StudentProfileSchema])
+
+    # profiles + major (joined), minors, completed courses
+    assert few == many == 3
+
+
+@pytest.mark.parametrize("courses_per_semester", [6, 1])
+async def test_degree_plan_query_count_is_constant(db, adb, async_engine, cs_major, courses_per_semester):
+    student = StudentProfile(name="Planner", major_id=cs_major.id)
+    db.add(student)
+    db.commit()
+    await generate_degree_plan(GenerateDegreePlanRequest(
+        student_id=student.id, start_semester="Fall", start_year=2026,
+        courses_per_semester=courses_per_semester
+    ), adb)
+
+    # student check, plan, planned semesters, semester courses
+    assert await serialize(adb, async_engine, get_degree_plan, DegreePlanSchema, student.id) == 4
+
+
+async def test_student_profile_creation_stays_within_budget(db, adb, cs_major, query_budget, seed_semesters):
+    minors = [Minor(name=f"Minor {i}", department="MATH", total_credits_required=21) for i in range(10)]
+    db.add_all(minors)
+    db.commit()
+    seed_semesters(["CS124", "CS128", "MATH220"], 10)
+    get_catalog_snapshot(db)
+
+    profile = StudentProfileCreate(
+        name="Budget", major_id=cs_major.id, minor_ids=[minor.id for minor in minors] + [999],
+        ap_credits=[APCredit(exam_name="AP Calculus BC", score=5, course_equivalents=["MATH220", "MATH231"])],
+    )
+    # major, insert student, minors lookup + insert, dashboard courses, snapshot version
+    # check, completed insert, then the reload of the new profile with its relationships
+    with query_budget(max_queries=10, max_repeats=2):
+        await create_student_profile(profile, adb)
@@ -0,0 +1,64 @@
+"""
+Tests for the FTS5 course search index.
+"""
+
+from sqlalchemy import text
+
+from search import build_match_query, ensure_search_index, search_courses
+from sync_catalog import sync_catalog
+
+
+def make_course(course_id, department, title, description=None):
+    return {
+        "course_id": course_id,
+        "title": title,
+        "credits": 3,
+        "department": department,
+        "level": int(course_id[len(department)]) * 100,
+        "description": description,
+        "prerequisites": None,
+    }
+
+
+CATALOG = [
+    make_course("CS225", "CS", "Data Structures", "Data abstractions: elementary data structures."),
+    make_course("CS374", "CS", "Introduction to Algorithms & Models of Computation", "Analysis of algorithms."),
+    make_course("STAT400", "STAT", "Statistics and Probability I", "Introduction to mathematical statistics."),
+]
+
+
+def test_build_match_query_quotes_terms():
+    assert build_match_query("CS 225") == '"cs"* AND "225"*'
+    assert build_match_query("cs225") == '"cs"* AND "225"*'
+    assert build_match_query('data" OR *') == '"data"* AND "or"*'
+    assert build_match_query("  ") is None
+
+
+def test_search_ranks_and_tracks_catalog_changes(db, engine):
+    ensure_search_index(engine)
+    sync_catalog(CATALOG, bind=engine)
+
+    results = search_courses(db, "cs 225")
+    assert [r["course_id"] for r in results] == ["CS225"]
+
+    results = search_courses(db, "data struct")
+    assert results[0]["course_id"] == "CS225"
+    assert results[0]["title_highlight"] == "<mark>Data</mark> <mark>Structures</mark>"
+
+    assert [r["course_id"] for r in search_courses(db, "introduction", departments=["STAT"])] == ["STAT400"]
+
+    # Updates and tombstones flow through the triggers / is_active filter
+    sync_catalog([make_course("CS225", "CS", "Data Structures and Algorithms"), CATALOG[2]], bind=engine)
+    assert search_courses(db, "algorithms")[0]["course_id"] == "CS225"
+    assert search_courses(db, "computation") == []
+
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM courses WHERE course_id = 'CS374'"))
+        assert conn.execute(text("SELECT count(*) FROM courses_fts")).scalar() == 2
+
+
+def test_ensure_search_index_backfills_existing_rows(db, engine):
+    sync_catalog(CATALOG, bind=engine)
+    ensure_search_index(engine)
+
+    assert [r["course_id"] for r in search_courses(db, "probability")] == ["STAT400"]
@@ -0,0 +1,104 @@
+"""
+Tests for incremental catalog sync.
+"""
+
+import pytest
+from sqlalchemy import create_engine, select, text
+
+import migrations
+from database import get_catalog_version
+from models import Course
+from sync_catalog import sync_catalog
+
+
+def make_course(course_id, department="CS", **overrides):
+    course = {
+        "course_id": course_id,
+        "title": f"{course_id} title",
+        "credits": 3,
+        "department": department,
+        "level": 100,
+        "description": None,
+        "prerequisites": None,
+    }
+    course.update(overrides)
+    return course
+
+
+def test_sync_upserts_changes_and_tombstones_removed_courses():
+    engine = create_engine("sqlite://")
+    catalog = [make_course("CS124"), make_course("CS225"), make_course("MATH231", "MATH")]
+
+    assert sync_catalog(catalog, bind=engine) == {"inserted": 3, "updated": 0, "unchanged": 0, "removed": 0}
+    assert sync_catalog(catalog, bind=engine) == {"inserted": 0, "updated": 0, "unchanged": 3, "removed": 0}
+
+    # Locally maintained prerequisites must survive an upstream update
+    with engine.begin() as conn:
+        conn.execute(Course.__table__.update().where(Course.course_id == "CS225").values(prerequisites='["CS124"]'))
+
+    changed = [make_course("CS225", title="Data Structures"), make_course("MATH231", "MATH")]
+    report = sync_catalog(changed, bind=engine)
+    assert report == {"inserted": 0, "updated": 1, "unchanged": 1, "removed": 1}
+
+    with engine.connect() as conn:
+        rows = {row.course_id: row for row in conn.execute(select(Course.__table__))}
+    assert rows["CS225"].title == "Data Structures"
+    assert rows["CS225"].prerequisites == '["CS124"]'
+    assert not rows["CS124"].is_active
+
+    # A tombstoned course that reappears is reactivated
+    report = sync_catalog(changed + [make_course("CS124")], bind=engine)
+    assert report == {"inserted": 0, "updated": 1, "unchanged": 2, "removed": 0}
+
+
+def test_sync_backfills_missing_prerequisites_only():
+    engine = create_engine("sqlite://")
+    sync_catalog([make_course("CS225"), make_course("CS374")], bind=engine)
+    with engine.begin() as conn:
+        conn.execute(Course.__table__.update().where(Course.course_id == "CS374").values(prerequisites='["CS173"]'))
+
+    crawled = [make_course("CS225", prerequisites='["CS128"]'), make_course("CS374", prerequisites='["CS225"]')]
+    assert sync_catalog(crawled, bind=engine) == {"inserted": 0, "updated": 1, "unchanged": 1, "removed": 0}
+    assert sync_catalog(crawled, bind=engine)["updated"] == 0
+
+    with engine.connect() as conn:
+        prerequisites = dict(conn.execute(select(Course.course_id, Course.prerequisites)).all())
+    assert prerequisites == {"CS225": '["CS128"]', "CS374": '["CS173"]'}
+
+
+def test_sync_commits_each_chunk(tmp_path):
+    # timeout=0: a writer blocked by the sync fails immediately instead of waiting
+    engine = create_engine(f"sqlite:///{tmp_path / 'catalog.db'}", connect_args={"timeout": 0})
+
+    def crawl():
+        yield make_course("CS124")
+        yield make_course("CS128")
+        # The first chunk is committed, so other writers aren't locked out mid-crawl
+        with engine.begin() as conn:
+            conn.execute(Course.__table__.update().where(Course.course_id == "CS124").values(title="Edited"))
+        raise RuntimeError("connection reset")
+
+    with pytest.raises(RuntimeError):
+        sync_catalog(crawl(), bind=engine, chunk_size=2)
+
+    with engine.connect() as conn:
+        assert conn.execute(select(Course.title).order_by(Course.course_id)).scalars().all() == ["Edited", "CS128 title"]
+        # The committed chunk was published under a new catalog version, even though the crawl failed
+        assert get_catalog_version(conn) == 1
+
+
+def test_upgrade_adds_sync_columns_to_old_database():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE courses (course_id VARCHAR PRIMARY KEY, title VARCHAR NOT NULL, "
+            "credits INTEGER NOT NULL, department VARCHAR NOT NULL, level INTEGER NOT NULL, "
+            "description VARCHAR, prerequisites VARCHAR)"
+        ))
+        conn.execute(text("INSERT INTO courses VALUES ('CS124', 'Intro', 3, 'CS', 100, NULL, NULL)"))
+
+    migrations.upgrade(engine)
+
+    with engine.connect() as conn:
+        row = conn.execute(text("SELECT content_hash, is_active FROM courses")).one()
+    assert row == (None, 1)
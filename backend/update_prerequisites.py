@@ -4,7 +4,10 @@ Update course prerequisites from the cs_degree_requirements.json file.
 
 import json
 import os
-from database import SessionLocal
+import sys
+from database import SessionLocal, bump_catalog_version, engine
+from prereq_expr import dump_prerequisites, from_json, parse_expression
+from query_audit import audit_run
 from models import Course
 
 
@@ -28,20 +31,27 @@ def update_prerequisites():
         print(f"Updating prerequisites for {len(course_meta)} courses...")
         updated_count = 0
 
+        # One query for all the courses, not one per course
+        courses = {
+            course.course_id: course
+            for course in db.query(Course).filter(Course.course_id.in_(list(course_meta)))
+        }
+
         for course_id, meta in course_meta.items():
             prereqs = meta.get('prerequisites', [])
-
-            # Get course from database
-            course = db.query(Course).filter(Course.course_id == course_id).first()
+            course = courses.get(course_id)
 
             if course:
-                # Store prerequisites as JSON array
-                course.prerequisites = json.dumps(prereqs) if prereqs else None
+                # Lists are stored as-is (all of); expressions in their structured JSON form
+                node = parse_expression(prereqs) if isinstance(prereqs, str) else from_json(prereqs)
+                course.prerequisites = dump_prerequisites(node)
                 updated_count += 1
                 print(f"  {course_id}: {prereqs if prereqs else 'no prerequisites'}")
             else:
                 print(f"  WARNING: {course_id} not found in database")
 
+        # Invalidate cached prerequisite graphs in running servers
+        bump_catalog_version(db)
         db.commit()
         print(f"\n✓ Successfully updated {updated_count} courses with prerequisite information!")
         return 0
@@ -57,4 +67,6 @@ def update_prerequisites():
 
 
 if __name__ == "__main__":
-    exit(update_prerequisites())
+    with audit_run("update_prerequisites", engine):
+        status = update_prerequisites()
+    sys.exit(status)
@@ -1,5 +1,5 @@
 import type {
-  Course, Semester, SemesterCreate, CourseAdd,
+  Course, CourseSearchResult, Semester, SemesterCreate, CourseAdd,
   Major, Minor, StudentProfile, StudentProfileCreate,
   DegreePlan, GenerateDegreePlanRequest
 } from './types';
@@ -18,6 +18,15 @@ export const api = {
     return response.json();
   },
 
+  async searchCourses(query: string, department?: string, limit = 50): Promise<CourseSearchResult[]> {
+    const params = new URLSearchParams({ q: query, limit: limit.toString() });
+    if (department) params.append('department', department);
+
+    const response = await fetch(`${API_BASE_URL}/courses/search?${params.toString()}`);
+    if (!response.ok) throw new Error('Failed to search courses');
+    return response.json();
+  },
+
   async getCourse(courseId: string): Promise<Course> {
     const response = await fetch(`${API_BASE_URL}/courses/${courseId}/`);
     if (!response.ok) throw new Error('Failed to fetch course');
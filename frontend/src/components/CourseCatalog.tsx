@@ -1,5 +1,6 @@
-import { useState } from 'react';
+import { useEffect, useState } from 'react';
 import type { Course, Semester } from '../types';
+import { api } from '../api';
 import './CourseCatalog.css';
 
 interface CourseCatalogProps {
@@ -15,22 +16,35 @@ function CourseCatalog({ courses, departments, semesters, onAddCourse }: CourseC
   const [searchTerm, setSearchTerm] = useState('');
   const [addingCourse, setAddingCourse] = useState<string | null>(null);
   const [selectedSemester, setSelectedSemester] = useState<number | ''>('');
+  const [searchResults, setSearchResults] = useState<Course[]>([]);
+
+  // Keyword search runs server-side (full-text index), debounced while typing
+  useEffect(() => {
+    if (!searchTerm.trim()) {
+      setSearchResults([]);
+      return;
+    }
+
+    let cancelled = false;
+    const timer = setTimeout(() => {
+      api.searchCourses(searchTerm, selectedDept || undefined)
+        .then((results) => { if (!cancelled) setSearchResults(results); })
+        .catch(() => { if (!cancelled) setSearchResults([]); });
+    }, 200);
+
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [searchTerm, selectedDept]);
 
   // Show courses if department is selected OR if user is searching
-  const filteredCourses = (selectedDept || searchTerm) ? courses.filter((course) => {
+  const sourceCourses = searchTerm.trim() ? searchResults : courses;
+  const filteredCourses = (selectedDept || searchTerm) ? sourceCourses.filter((course) => {
     const matchesDept = !selectedDept || course.department === selectedDept;
     const matchesLevel = !selectedLevel || course.level === selectedLevel;
 
-    // Remove spaces from both search term and course data for matching
-    const normalizedSearch = searchTerm.toLowerCase().replace(/\s+/g, '');
-    const normalizedCourseId = course.course_id.toLowerCase().replace(/\s+/g, '');
-    const normalizedTitle = course.title.toLowerCase();
-
-    const matchesSearch = !searchTerm ||
-      normalizedCourseId.includes(normalizedSearch) ||
-      normalizedTitle.includes(searchTerm.toLowerCase());
-
-    return matchesDept && matchesLevel && matchesSearch;
+    return matchesDept && matchesLevel;
   }) : [];
 
   const handleAddCourse = (courseId: string) => {
@@ -8,6 +8,12 @@ export interface Course {
   prerequisites?: string;
 }
 
+export interface CourseSearchResult extends Course {
+  title_highlight: string;
+  description_snippet?: string;
+  score: number;
+}
+
 export interface Semester {
   id: number;
   name: string;
@@ -61,6 +67,8 @@ export interface StudentProfile {
   completed_courses: Course[];
   ap_credits?: string;
   dual_enrollment_credits?: string;
+  unknown_minor_ids?: number[];  // Only returned when a profile is created
+  unknown_course_ids?: string[];
 }
 
 export interface StudentProfileCreate {